@@ -4,66 +4,234 @@ Handles manufacturer/model matching and domestic content identification
 """
 
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+import hashlib
 import os
+import pickle
+import time
+
+from manufacturer_matcher import ManufacturerMatcher
 
 
 class AVLHandler:
     """Handles matching against multiple AVL files"""
 
-    def __init__(self, thrive_file: Optional[str] = None, goodleap_file: Optional[str] = None):
+    DOMESTIC_VALUES = ['YES', 'Y', 'TRUE', '1']
+    INDEX_VERSION = 2
+
+    def __init__(self, thrive_file: Optional[str] = None, goodleap_file: Optional[str] = None,
+                 index_cache: Optional[str] = None):
         """
         Initialize AVL handler with AVL file paths
 
         Args:
             thrive_file: Path to THRIVE AVL Excel file
             goodleap_file: Path to GOODLEAP AVL Excel file
+            index_cache: Path of the serialized lookup index
+                         (defaults to avl_index.pkl in the scraper state directory)
         """
-        self.thrive_df = None
-        self.goodleap_df = None
-
-        # Load THRIVE AVL
-        if thrive_file and os.path.exists(thrive_file):
-            try:
-                self.thrive_df = pd.read_excel(thrive_file)
-                # Normalize manufacturer names for matching
-                if 'Manufacturer' in self.thrive_df.columns:
-                    self.thrive_df['manufacturer_normalized'] = (
-                        self.thrive_df['Manufacturer'].str.upper().str.strip()
-                    )
-                    # Handle Model column - might be missing
-                    if 'Model' in self.thrive_df.columns:
-                        self.thrive_df['model_normalized'] = (
-                            self.thrive_df['Model'].astype(str).str.upper().str.strip()
-                        )
-                    print(f"✅ Loaded THRIVE AVL: {len(self.thrive_df)} entries")
-                else:
-                    print(f"⚠️  THRIVE AVL file missing 'Manufacturer' column")
-                    self.thrive_df = None
-            except Exception as e:
-                print(f"⚠️  Error loading THRIVE AVL: {e}")
-                self.thrive_df = None
-        else:
-            print("⚠️  THRIVE AVL file not found")
-
-        # Load GOODLEAP AVL
-        if goodleap_file and os.path.exists(goodleap_file):
-            try:
-                self.goodleap_df = pd.read_excel(goodleap_file)
-                # Normalize manufacturer names for matching
-                if 'Manufacturer' in self.goodleap_df.columns:
-                    self.goodleap_df['manufacturer_normalized'] = (
-                        self.goodleap_df['Manufacturer'].str.upper().str.strip()
-                    )
-                    print(f"✅ Loaded GOODLEAP AVL: {len(self.goodleap_df)} entries")
-                else:
-                    print(f"⚠️  GOODLEAP AVL file missing 'Manufacturer' column")
-                    self.goodleap_df = None
-            except Exception as e:
-                print(f"⚠️  Error loading GOODLEAP AVL: {e}")
-                self.goodleap_df = None
-        else:
-            print("⚠️  GOODLEAP AVL file not found")
+        self.state_dir = os.environ.get('SCRAPER_STATE_DIR', '.scraper_state')
+        self.index_cache = index_cache or os.path.join(self.state_dir, 'avl_index.pkl')
+        self.snapshot_dir = os.path.join(self.state_dir, 'avl_snapshots')
+
+        self.thrive_df = self._load_avl(thrive_file, 'THRIVE', with_models=True)
+        self.goodleap_df = self._load_avl(goodleap_file, 'GOODLEAP')
+
+        self.index = self._load_or_build_index([thrive_file, goodleap_file])
+        self.manufacturer_matcher = ManufacturerMatcher(self.index['manufacturers'])
+
+    def _load_avl(self, path: Optional[str], name: str, with_models: bool = False) -> Optional[pd.DataFrame]:
+        """
+        Load an AVL table, from its compiled snapshot when the spreadsheet is unchanged
+
+        Args:
+            path: Path to the AVL Excel file
+            name: AVL name used in log messages
+            with_models: Also normalize the 'Model' column
+
+        Returns:
+            AVL DataFrame with normalized columns, or None if unavailable
+        """
+        if not (path and os.path.exists(path)):
+            print(f"⚠️  {name} AVL file not found")
+            return None
+
+        start = time.perf_counter()
+        try:
+            df = self._load_snapshot(path)
+            source = 'snapshot'
+            if df is None:
+                df = self._parse_avl(path, with_models)
+                source = 'Excel'
+                if df is not None:
+                    self._save_snapshot(path, df)
+        except Exception as e:
+            print(f"⚠️  Error loading {name} AVL: {e}")
+            return None
+
+        if df is None:
+            print(f"⚠️  {name} AVL file missing 'Manufacturer' column")
+            return None
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"✅ Loaded {name} AVL: {len(df)} entries ({source}, {elapsed_ms:.0f}ms)")
+        return df
+
+    @staticmethod
+    def _parse_avl(path: str, with_models: bool = False) -> Optional[pd.DataFrame]:
+        """Parse an AVL spreadsheet and add normalized matching columns"""
+        df = pd.read_excel(path)
+        if 'Manufacturer' not in df.columns:
+            return None
+
+        # Normalize manufacturer names for matching
+        df['manufacturer_normalized'] = df['Manufacturer'].str.upper().str.strip()
+        # Handle Model column - might be missing
+        if with_models and 'Model' in df.columns:
+            df['model_normalized'] = df['Model'].astype(str).str.upper().str.strip()
+        return df
+
+    def _snapshot_path(self, path: str) -> str:
+        path_hash = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.snapshot_dir, f"{os.path.basename(path)}.{path_hash}.pkl")
+
+    @staticmethod
+    def _file_sha256(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _load_snapshot(self, path: str) -> Optional[pd.DataFrame]:
+        """
+        Return the snapshot DataFrame if it was compiled from the current spreadsheet
+
+        A matching mtime/size is trusted as-is; otherwise the file is hashed, so a
+        touched-but-identical spreadsheet still reuses its snapshot.
+        """
+        snapshot_path = self._snapshot_path(path)
+        try:
+            with open(snapshot_path, 'rb') as f:
+                snapshot = pickle.load(f)
+        except Exception:
+            return None
+
+        if snapshot.get('version') != self.INDEX_VERSION:
+            return None
+
+        stat = os.stat(path)
+        if (snapshot.get('mtime_ns'), snapshot.get('size')) == (stat.st_mtime_ns, stat.st_size):
+            return snapshot['df']
+
+        if snapshot.get('sha256') != self._file_sha256(path):
+            return None
+
+        # Same content, new mtime: refresh the stored mtime to skip hashing next time
+        self._save_snapshot(path, snapshot['df'], snapshot['sha256'])
+        return snapshot['df']
+
+    def _save_snapshot(self, path: str, df: pd.DataFrame, sha256: Optional[str] = None):
+        """Store the parsed AVL table with the spreadsheet's mtime, size and hash"""
+        stat = os.stat(path)
+        snapshot = {
+            'version': self.INDEX_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': sha256 or self._file_sha256(path),
+            'df': df
+        }
+        self._write_pickle(self._snapshot_path(path), snapshot, 'AVL snapshot')
+
+    @staticmethod
+    def _write_pickle(path: str, data, label: str):
+        """Atomically write a pickle file, warning (not failing) on errors"""
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(data, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Error writing {label}: {e}")
+
+    def _build_index(self) -> Dict:
+        """
+        Precompute lookup results from the loaded AVL tables
+
+        Manufacturers are keyed by ManufacturerMatcher canonical keys, so aliases
+        and spelling variants in the AVL files collapse onto one entry.
+
+        Returns:
+            Dictionary with
+            {
+                'manufacturers': AVL manufacturer names, in file order,
+                'thrive_manufacturers': set of manufacturer keys,
+                'thrive_models': {(manufacturer key, model): domestic},
+                'goodleap': {manufacturer key: {'program': ..., 'domestic': bool}}
+            }
+            The first AVL row wins for duplicate keys.
+        """
+        matcher = ManufacturerMatcher()
+        index = {'manufacturers': [], 'thrive_manufacturers': set(), 'thrive_models': {}, 'goodleap': {}}
+
+        if self.thrive_df is not None and not self.thrive_df.empty:
+            has_models = 'model_normalized' in self.thrive_df.columns
+            domestic = self._domestic_flags(self.thrive_df)
+            for i, manufacturer in enumerate(self.thrive_df['Manufacturer']):
+                if not isinstance(manufacturer, str):
+                    continue
+                key = matcher.canonical_key(manufacturer)
+                index['manufacturers'].append(manufacturer)
+                index['thrive_manufacturers'].add(key)
+                if has_models:
+                    model_key = (key, self.thrive_df['model_normalized'].iat[i])
+                    index['thrive_models'].setdefault(model_key, bool(domestic.iat[i]))
+
+        if self.goodleap_df is not None and not self.goodleap_df.empty:
+            has_program = 'Program Type' in self.goodleap_df.columns
+            domestic = self._domestic_flags(self.goodleap_df)
+            for i, manufacturer in enumerate(self.goodleap_df['Manufacturer']):
+                if not isinstance(manufacturer, str):
+                    continue
+                key = matcher.canonical_key(manufacturer)
+                index['manufacturers'].append(manufacturer)
+                if key in index['goodleap']:
+                    continue
+                index['goodleap'][key] = {
+                    'program': self.goodleap_df['Program Type'].iat[i] if has_program else 'Unknown',
+                    'domestic': bool(domestic.iat[i])
+                }
+
+        return index
+
+    @staticmethod
+    def _source_signature(files: List[Optional[str]]) -> List:
+        """Identify the AVL source files (path, mtime, size) so stale indexes are detected"""
+        signature = []
+        for path in files:
+            if path and os.path.exists(path):
+                stat = os.stat(path)
+                signature.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+            else:
+                signature.append((path, None, None))
+        return signature
+
+    def _load_or_build_index(self, files: List[Optional[str]]) -> Dict:
+        """Load the lookup index from the cache file, rebuilding it if the AVL files changed"""
+        signature = [self.INDEX_VERSION, ManufacturerMatcher().signature()] + self._source_signature(files)
+
+        try:
+            with open(self.index_cache, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('signature') == signature:
+                return cached['index']
+        except Exception:
+            pass
+
+        index = self._build_index()
+        self._write_pickle(self.index_cache, {'signature': signature, 'index': index}, 'AVL index cache')
+        return index
 
     def check_thrive_approval(self, manufacturer: str, model: str = '') -> Dict:
         """
@@ -84,30 +252,16 @@ class AVLHandler:
         if self.thrive_df is None or self.thrive_df.empty:
             return {'approved': False, 'domestic': False, 'match_type': 'no_avl'}
 
-        manufacturer_norm = manufacturer.upper().strip()
+        manufacturer_key, _ = self.manufacturer_matcher.resolve(manufacturer)
         model_norm = model.upper().strip() if model else ''
 
-        # Find matching manufacturer
-        manufacturer_matches = self.thrive_df[
-            self.thrive_df['manufacturer_normalized'] == manufacturer_norm
-        ]
-
-        if manufacturer_matches.empty:
+        if manufacturer_key not in self.index['thrive_manufacturers']:
             return {'approved': False, 'domestic': False, 'match_type': 'not_found'}
 
-        # Check for model-specific match if model is provided and column exists
-        if model_norm and 'model_normalized' in self.thrive_df.columns:
-            model_matches = manufacturer_matches[
-                manufacturer_matches['model_normalized'] == model_norm
-            ]
-
-            if not model_matches.empty:
-                # Exact model match found
-                row = model_matches.iloc[0]
-                domestic = False
-                if 'Domestic Content' in row:
-                    domestic = str(row['Domestic Content']).upper() in ['YES', 'Y', 'TRUE', '1']
-
+        # Check for model-specific match if model is provided
+        if model_norm:
+            domestic = self.index['thrive_models'].get((manufacturer_key, model_norm))
+            if domestic is not None:
                 return {
                     'approved': True,
                     'domestic': domestic,
@@ -140,70 +294,176 @@ class AVLHandler:
         if self.goodleap_df is None or self.goodleap_df.empty:
             return {'approved': False, 'program': None, 'domestic': False}
 
-        manufacturer_norm = manufacturer.upper().strip()
+        manufacturer_key, _ = self.manufacturer_matcher.resolve(manufacturer)
+        match = self.index['goodleap'].get(manufacturer_key)
+        if match is None:
+            return {'approved': False, 'program': None, 'domestic': False}
 
-        matches = self.goodleap_df[
-            self.goodleap_df['manufacturer_normalized'] == manufacturer_norm
-        ]
+        return {
+            'approved': True,
+            'program': match['program'],
+            'domestic': match['domestic']
+        }
 
-        if matches.empty:
-            return {'approved': False, 'program': None, 'domestic': False}
+    @staticmethod
+    def _normalize(values: pd.Series) -> pd.Series:
+        """Normalize manufacturer/model values for matching (upper-case, stripped)"""
+        return values.fillna('').astype(str).str.upper().str.strip()
 
-        # Get first match (there should typically only be one per manufacturer)
-        row = matches.iloc[0]
+    @staticmethod
+    def _has_key(values: pd.Series) -> pd.Series:
+        """True where a join key is set: None, NaN and '' never match anything"""
+        return values.notna() & (values.astype(str) != '')
 
-        # Get program type
-        program = row.get('Program Type', 'Unknown')
+    def _domestic_flags(self, avl_df: pd.DataFrame) -> pd.Series:
+        """Domestic content flag per AVL row"""
+        if 'Domestic Content' not in avl_df.columns:
+            return pd.Series(False, index=avl_df.index)
+        return avl_df['Domestic Content'].astype(str).str.upper().isin(self.DOMESTIC_VALUES)
 
-        # Get domestic content
-        domestic = False
-        if 'Domestic Content' in row:
-            domestic_val = str(row['Domestic Content']).upper()
-            domestic = domestic_val in ['YES', 'Y', 'TRUE', '1']
+    def _resolve_brands(self, brands: pd.Series) -> pd.DataFrame:
+        """
+        Resolve each distinct brand once through the manufacturer matcher
 
-        return {
-            'approved': True,
-            'program': program,
-            'domestic': domestic
-        }
+        Returns:
+            DataFrame with 'key' (manufacturer key or None), 'manufacturer'
+            (AVL spelling or None) and 'confidence' columns, one row per product
+        """
+        codes, uniques = pd.factorize(brands.fillna(''))
+        resolved = []
+        for brand in uniques:
+            key, confidence = self.manufacturer_matcher.resolve(brand)
+            resolved.append((key, self.manufacturer_matcher.names.get(key), confidence))
+
+        return pd.DataFrame(
+            [resolved[code] for code in codes],
+            columns=['key', 'manufacturer', 'confidence']
+        )
+
+    @staticmethod
+    def _merge_keyed(products: pd.DataFrame, keyed: pd.Series, avl: pd.DataFrame, on: list) -> pd.DataFrame:
+        """
+        Left-join the keyed products against unique AVL keys, keeping one row per product
 
-    def add_avl_columns(self, df: pd.DataFrame) -> pd.DataFrame:
+        Products without a key are left out of the join (pandas would match a
+        missing key against a missing AVL key) and come back unmatched.
+        """
+        merged = products[keyed].merge(avl, on=on, how='left')
+        merged.index = products.index[keyed]
+        return merged.reindex(products.index)
+
+    def _match_thrive(self, brand_keys: pd.Series, model_norm: pd.Series) -> pd.DataFrame:
+        """
+        Vectorized equivalent of check_thrive_approval for a whole column of products
+
+        Joins (manufacturer key, model) pairs against the precomputed index instead of
+        looking products up one at a time.
+
+        Returns:
+            DataFrame with 'approved', 'domestic' and 'match_type' columns, one row per product
+        """
+        products = pd.DataFrame({'mfr': brand_keys.values, 'model': model_norm.values})
+
+        if self.thrive_df is None or self.thrive_df.empty:
+            return pd.DataFrame({
+                'approved': False,
+                'domestic': False,
+                'match_type': 'no_avl'
+            }, index=products.index)
+
+        keyed = self._has_key(products['mfr'])
+        manufacturer_approved = keyed & products['mfr'].isin(self.index['thrive_manufacturers'])
+
+        models = pd.DataFrame(
+            [(mfr, model, domestic) for (mfr, model), domestic in self.index['thrive_models'].items()],
+            columns=['mfr', 'model', 'avl_domestic']
+        )
+        models = models[self._has_key(models['mfr']) & self._has_key(models['model'])]
+        keyed &= self._has_key(products['model'])
+        merged = self._merge_keyed(products, keyed, models, ['mfr', 'model'])
+        exact = merged['avl_domestic'].notna()
+        domestic = exact & merged['avl_domestic'].fillna(False).astype(bool)
+
+        match_type = pd.Series('not_found', index=products.index, dtype=object)
+        match_type[manufacturer_approved] = 'manufacturer_only'
+        match_type[exact] = 'exact'
+
+        return pd.DataFrame({
+            'approved': manufacturer_approved,
+            'domestic': domestic,
+            'match_type': match_type
+        })
+
+    def _match_goodleap(self, brand_keys: pd.Series) -> pd.DataFrame:
+        """
+        Vectorized equivalent of check_goodleap_approval for a whole column of products
+
+        Returns:
+            DataFrame with 'approved', 'program' and 'domestic' columns, one row per product
+        """
+        products = pd.DataFrame({'mfr': brand_keys.values})
+
+        if self.goodleap_df is None or self.goodleap_df.empty:
+            return pd.DataFrame({
+                'approved': False,
+                'program': None,
+                'domestic': False
+            }, index=products.index)
+
+        manufacturers = pd.DataFrame(
+            [(mfr, entry['program'], entry['domestic'], True)
+             for mfr, entry in self.index['goodleap'].items()],
+            columns=['mfr', 'program', 'avl_domestic', 'matched']
+        )
+        manufacturers = manufacturers[self._has_key(manufacturers['mfr'])]
+        merged = self._merge_keyed(products, self._has_key(products['mfr']), manufacturers, ['mfr'])
+        approved = merged['matched'].notna()
+        program = merged['program'].astype(object)
+
+        return pd.DataFrame({
+            'approved': approved,
+            'program': program.where(approved & program.notna(), None),
+            'domestic': approved & merged['avl_domestic'].fillna(False).astype(bool)
+        })
+
+    def add_avl_columns(self, df: pd.DataFrame, verbose: bool = True) -> pd.DataFrame:
         """
         Add AVL check columns to product dataframe
 
         Args:
             df: Product dataframe with 'brand' and 'sku' columns
+            verbose: Print progress and summary counts (off when matching in batches)
 
         Returns:
             DataFrame with additional AVL columns
         """
-        print("\n📋 Adding AVL approval columns...")
+        log = print if verbose else (lambda *args, **kwargs: None)
+
+        log("\n📋 Adding AVL approval columns...")
 
         # Ensure required columns exist
         if 'brand' not in df.columns:
             print("⚠️  'brand' column not found in dataframe")
             return df
 
-        # Use 'sku' as model if available, otherwise empty string
-        model_col = 'sku' if 'sku' in df.columns else None
+        # Resolve manufacturers and normalize join keys once for the whole frame ('sku' is used as the model)
+        brands = self._resolve_brands(df['brand'])
+        model_norm = self._normalize(df['sku']) if 'sku' in df.columns else pd.Series('', index=df.index)
+
+        df['avl_manufacturer'] = brands['manufacturer'].values
+        df['manufacturer_match_confidence'] = brands['confidence'].values
 
         # THRIVE columns
         if self.thrive_df is not None:
-            print("  Checking THRIVE AVL...")
-            thrive_results = df.apply(
-                lambda row: self.check_thrive_approval(
-                    row['brand'],
-                    row.get(model_col, '') if model_col else ''
-                ),
-                axis=1
-            )
+            log("  Checking THRIVE AVL...")
+            thrive_results = self._match_thrive(brands['key'], model_norm)
 
-            df['thrive_approved'] = thrive_results.apply(lambda x: x['approved'])
-            df['thrive_domestic'] = thrive_results.apply(lambda x: x['domestic'])
-            df['thrive_match_type'] = thrive_results.apply(lambda x: x['match_type'])
+            df['thrive_approved'] = thrive_results['approved'].values
+            df['thrive_domestic'] = thrive_results['domestic'].values
+            df['thrive_match_type'] = thrive_results['match_type'].values
 
-            print(f"    ✅ {df['thrive_approved'].sum()} products approved on THRIVE AVL")
-            print(f"    ✅ {df['thrive_domestic'].sum()} products with THRIVE domestic content")
+            log(f"    ✅ {df['thrive_approved'].sum()} products approved on THRIVE AVL")
+            log(f"    ✅ {df['thrive_domestic'].sum()} products with THRIVE domestic content")
         else:
             df['thrive_approved'] = False
             df['thrive_domestic'] = False
@@ -211,18 +471,15 @@ class AVLHandler:
 
         # GOODLEAP columns
         if self.goodleap_df is not None:
-            print("  Checking GOODLEAP AVL...")
-            goodleap_results = df.apply(
-                lambda row: self.check_goodleap_approval(row['brand']),
-                axis=1
-            )
+            log("  Checking GOODLEAP AVL...")
+            goodleap_results = self._match_goodleap(brands['key'])
 
-            df['goodleap_approved'] = goodleap_results.apply(lambda x: x['approved'])
-            df['goodleap_program'] = goodleap_results.apply(lambda x: x['program'])
-            df['goodleap_domestic'] = goodleap_results.apply(lambda x: x['domestic'])
+            df['goodleap_approved'] = goodleap_results['approved'].values
+            df['goodleap_program'] = goodleap_results['program'].values
+            df['goodleap_domestic'] = goodleap_results['domestic'].values
 
-            print(f"    ✅ {df['goodleap_approved'].sum()} products approved on GOODLEAP AVL")
-            print(f"    ✅ {df['goodleap_domestic'].sum()} products with GOODLEAP domestic content")
+            log(f"    ✅ {df['goodleap_approved'].sum()} products approved on GOODLEAP AVL")
+            log(f"    ✅ {df['goodleap_domestic'].sum()} products with GOODLEAP domestic content")
         else:
             df['goodleap_approved'] = False
             df['goodleap_program'] = None
@@ -241,10 +498,10 @@ class AVLHandler:
             )
         )
 
-        print(f"\n  📊 Summary:")
-        print(f"    • On any AVL: {df['on_any_avl'].sum()} products")
-        print(f"    • On all AVLs: {df['on_all_avls'].sum()} products")
-        print(f"    • Domestic content qualified: {df['domestic_content_qualified'].sum()} products")
+        log(f"\n  📊 Summary:")
+        log(f"    • On any AVL: {df['on_any_avl'].sum()} products")
+        log(f"    • On all AVLs: {df['on_all_avls'].sum()} products")
+        log(f"    • Domestic content qualified: {df['domestic_content_qualified'].sum()} products")
 
         return df
 
@@ -279,7 +536,7 @@ class AVLHandler:
         specs = product.get('specs', {})
         if isinstance(specs, dict):
             domestic_field = specs.get('domestic_content', 'No')
-            if str(domestic_field).upper() in ['YES', 'Y', 'TRUE', '1']:
+            if str(domestic_field).upper() in self.DOMESTIC_VALUES:
                 return True
 
         return False
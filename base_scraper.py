@@ -4,21 +4,134 @@ All distributor scrapers inherit from this base class
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import json
+import os
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import time
 
+from field_extractor import extract_fields
+from http_cache import HTTPCache
+from rate_limiter import host_rate_limiter
+
 
 class BaseScraper(ABC):
     """Abstract base class for all distributor scrapers"""
 
+    # Keep-alive connections (and parallel requests) allowed per host
+    max_connections_per_host = 4
+
+    # Politeness: average seconds between requests to a host, and allowed burst.
+    # With a burst of 1, parallel paging is opt-in: raise it per distributor.
+    request_delay = 1.0
+    request_burst = 1
+
+    # Directory for state persisted between runs (caches, fingerprints)
+    state_dir = os.environ.get('SCRAPER_STATE_DIR', '.scraper_state')
+
+    # Conditional (ETag / Last-Modified) response cache
+    http_cache_enabled = os.environ.get('HTTP_CACHE_ENABLED', 'true').lower() == 'true'
+    http_cache_max_mb = float(os.environ.get('HTTP_CACHE_MAX_MB', '256'))
+
+    # HTML scrapers: parse only the section of a page they read (see html_parsing.parse_html_section)
+    partial_html_parsing = os.environ.get('PARTIAL_HTML_PARSING', 'true').lower() == 'true'
+
+    # Shopify stores: shipping text shown for every variant, and number of
+    # products whose title-derived fields are remembered across collections
+    shopify_shipping_cost = 'Calculated at Checkout'
+    shopify_fields_cache_size = 4096
+
     def __init__(self, distributor_name: str):
         self.distributor_name = distributor_name
         self.products = []
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
+        self.session = self._build_session()
+        self.http_cache = self._build_http_cache()
+        self.shopify_fields_cache: OrderedDict = OrderedDict()
+
+    def _build_http_cache(self) -> Optional[HTTPCache]:
+        """Build the on-disk HTTP cache (None when disabled)"""
+        if not self.http_cache_enabled:
+            return None
+        return HTTPCache(os.path.join(self.state_dir, 'http_cache'), self.http_cache_max_mb)
+
+    def _build_session(self) -> requests.Session:
+        """
+        Build a requests session with a keep-alive connection pool per host
+        Reusing connections avoids a fresh TCP+TLS handshake for every page
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.max_connections_per_host,
+            pool_maxsize=self.max_connections_per_host
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def configure(self, settings: Dict):
+        """
+        Apply performance settings (from scraper_config.yaml 'performance' section,
+        merged with any per-distributor overrides)
+        """
+        if settings.get('request_delay') is not None:
+            self.request_delay = float(settings['request_delay'])
+        if settings.get('request_burst'):
+            self.request_burst = int(settings['request_burst'])
+
+        if settings.get('http_cache') is not None or settings.get('http_cache_max_mb'):
+            self.http_cache_enabled = bool(settings.get('http_cache', self.http_cache_enabled))
+            self.http_cache_max_mb = float(settings.get('http_cache_max_mb', self.http_cache_max_mb))
+            self.http_cache = self._build_http_cache()
+
+        if settings.get('partial_html_parsing') is not None:
+            self.partial_html_parsing = bool(settings['partial_html_parsing'])
+
+        max_connections = settings.get('max_connections_per_host')
+        if max_connections and max_connections != self.max_connections_per_host:
+            self.max_connections_per_host = int(max_connections)
+            self.session = self._build_session()
+
+    def throttle(self, url: str, delay: Optional[float] = None):
+        """
+        Wait until the shared per-host token bucket allows a request to this URL
+        Politeness is enforced as a request rate, so a slow response already counts
+        towards the delay instead of being followed by a fixed sleep
+        """
+        if delay is None:
+            delay = self.request_delay
+        host_rate_limiter.acquire(url, delay, self.request_burst)
+
+    def load_state(self, name: str) -> Dict:
+        """Load a JSON state file persisted by a previous run (empty dict if missing)"""
+        path = os.path.join(self.state_dir, name)
+        if not os.path.exists(path):
+            return {}
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading state {path}: {e}")
+            return {}
+
+    def save_state(self, name: str, data: Dict):
+        """Persist a JSON state file for the next run"""
+        path = os.path.join(self.state_dir, name)
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ Error saving state {path}: {e}")
 
     @abstractmethod
     def scrape_products(self) -> List[Dict]:
@@ -29,6 +142,14 @@ class BaseScraper(ABC):
         """
         pass
 
+    def iter_products(self) -> Iterator[Dict]:
+        """
+        Yield standardized products as they are scraped
+        Scrapers that can produce products incrementally override this; the
+        default falls back to the full scrape_products() list
+        """
+        yield from self.scrape_products()
+
     def get_standardized_product(self, **kwargs) -> Dict:
         """
         Standardize product data across all distributors
@@ -38,14 +159,15 @@ class BaseScraper(ABC):
         specs = kwargs.get('specs', {})
         price = kwargs.get('price', 0.0)
         
-        # Extract quantity from title (e.g., "Pallet of 30", "(7) panels")
-        quantity = self.extract_quantity(title)
+        # Extract quantity from title (e.g., "Pallet of 30", "(7) panels"),
+        # unless the caller already derived it once for all variants
+        quantity = kwargs['quantity'] if 'quantity' in kwargs else self.extract_quantity(title)
         
         # Calculate price per unit
         price_per_unit = self.calculate_price_per_unit(price, quantity)
         
         # Determine product category
-        category = self.extract_product_category(title, specs)
+        category = kwargs['category'] if 'category' in kwargs else self.extract_product_category(title, specs)
         
         return {
             'distributor': self.distributor_name,
@@ -69,13 +191,117 @@ class BaseScraper(ABC):
             'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }
 
+    def shopify_product_fields(self, product: Dict) -> Dict:
+        """
+        Title-derived fields of a Shopify product, computed once per product
+
+        Kept in an LRU cache on the scraper, so a product listed in several
+        collections is only parsed the first time it is seen.
+        """
+        key = (product.get('id'), product.get('title'), product.get('handle'))
+        fields = self.shopify_fields_cache.get(key)
+        if fields is not None:
+            self.shopify_fields_cache.move_to_end(key)
+            return fields
+
+        title = product['title']
+        images = product.get('images')
+        fields = {
+            'product_id': str(product['id']),
+            'title': title,
+            'brand': product.get('vendor', 'N/A'),
+            'wattage': self.extract_wattage(title),
+            'efficiency': self.extract_efficiency(title, {}),
+            'quantity': self.extract_quantity(title),
+            'product_url': f"{self.base_url}/products/{product['handle']}",
+            'image_url': images[0].get('src', 'N/A') if images else 'N/A'
+        }
+
+        self.shopify_fields_cache[key] = fields
+        if len(self.shopify_fields_cache) > self.shopify_fields_cache_size:
+            self.shopify_fields_cache.popitem(last=False)
+        return fields
+
+    def shopify_product_specs(self, product: Dict, collection_name: str) -> Dict:
+        """Product-level specs shared by all variants (stores add fields like tags)"""
+        return {
+            'product_type': product.get('product_type', 'N/A'),
+            'collection': collection_name
+        }
+
+    def shopify_variant_specs(self, variant: Dict) -> Dict:
+        """Variant-level specs appended to the product specs (stores add fields like weight)"""
+        return {}
+
+    def parse_shopify_product(self, product: Dict, collection_name: str) -> Iterator[Dict]:
+        """
+        Standardize every variant of a Shopify products.json product
+
+        Title-derived fields and the category are computed once per product and
+        fanned out to the variants; only price/stock/sku differ per variant.
+
+        Args:
+            product: Product object from a Shopify products.json response
+            collection_name: Collection the product was listed in
+
+        Yields:
+            Standardized product dictionaries, one per variant
+        """
+        variants = product.get('variants', [])
+        if not variants:
+            return
+
+        fields = self.shopify_product_fields(product)
+        product_specs = self.shopify_product_specs(product, collection_name)
+        category = self.extract_product_category(fields['title'], product_specs)
+
+        for variant in variants:
+            yield self.get_standardized_product(
+                **fields,
+                category=category,
+                sku=variant.get('sku', 'N/A'),
+                price=float(variant.get('price', 0)),
+                compare_price=float(variant.get('compare_at_price', 0)) if variant.get('compare_at_price') else 0,
+                stock_status='In Stock' if variant.get('available') else 'Out of Stock',
+                inventory_qty=variant.get('inventory_quantity', 'N/A'),
+                shipping_cost=self.shopify_shipping_cost,
+                specs={**product_specs, **self.shopify_variant_specs(variant)}
+            )
+
+    def http_get(self, url: str, params: Optional[Dict] = None, timeout: int = 10,
+                 delay: Optional[float] = None, headers: Optional[Dict] = None) -> requests.Response:
+        """
+        Send a single throttled GET over the pooled session
+        When the HTTP cache is enabled the request is made conditional, and a
+        304 Not Modified comes back as the cached 200 response
+        """
+        self.throttle(url, delay)
+
+        if self.http_cache is None:
+            return self.session.get(url, params=params, headers=headers, timeout=timeout)
+
+        key = self.http_cache.cache_key(url, params)
+        request_headers = dict(headers or {})
+        request_headers.update(self.http_cache.conditional_headers(key))
+
+        response = self.session.get(url, params=params, headers=request_headers, timeout=timeout)
+        response = self.http_cache.handle_response(key, response)
+
+        if response.status_code == 304:
+            # Cached body disappeared (e.g. evicted) - fetch it unconditionally
+            self.throttle(url, delay)
+            response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            response = self.http_cache.handle_response(key, response)
+
+        return response
+
     def make_request(self, url: str, timeout: int = 10, retries: int = 3) -> Optional[requests.Response]:
         """
         Make HTTP request with retry logic
         """
         for attempt in range(retries):
             try:
-                response = requests.get(url, headers=self.headers, timeout=timeout)
+                response = self.http_get(url, timeout=timeout, headers=self.headers)
                 response.raise_for_status()
                 return response
             except requests.exceptions.RequestException as e:
@@ -86,43 +312,88 @@ class BaseScraper(ABC):
                 time.sleep(2 ** attempt)  # Exponential backoff
         return None
 
+    def iter_paginated_json(
+        self,
+        url_for_page: Callable[[int], str],
+        items_key: str,
+        max_pages: Optional[int] = None,
+        page_size: Optional[int] = None
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        """
+        Yield (page, items) for a page-numbered JSON endpoint, in page order
+
+        Up to max_connections_per_host pages are in flight at a time; a new page is
+        only requested once an earlier one has arrived, and none are requested past
+        the first page that is empty, failed, or shorter than page_size (the last
+        page). At most max_connections_per_host - 1 requests are wasted past the end.
+
+        Parallel paging is opt-in. The requests still go through the per-host
+        token bucket, so with the default request_delay of 1s and request_burst of
+        1 the pages are sent one per second whatever the window, which then only
+        overlaps response latency. Set request_burst to max_connections_per_host
+        (or lower request_delay) for a distributor that tolerates truly parallel
+        requests.
+
+        Args:
+            url_for_page: Builds the URL of a 1-based page number
+            items_key: Key of the item list in the JSON response
+            max_pages: Last page to request (None = until the end)
+            page_size: Items on a full page (e.g. the limit parameter); a shorter
+                       page is taken as the last one
+
+        Iteration stops at the first failed request, unparseable, empty or short
+        page, or after max_pages.
+        """
+        def fetch(page_num: int) -> Optional[List[Dict]]:
+            response = self.make_request(url_for_page(page_num))
+            if not response:
+                return None
+            try:
+                return response.json().get(items_key, [])
+            except ValueError as e:
+                print(f"    ⚠️ Error on page {page_num}: {e}")
+                return None
+
+        workers = max(self.max_connections_per_host, 1)
+        last_page = max_pages if max_pages is not None else float('inf')
+        next_page = 1
+        pending = deque()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            try:
+                while True:
+                    while next_page <= last_page and len(pending) < workers:
+                        pending.append((next_page, executor.submit(fetch, next_page)))
+                        next_page += 1
+                    if not pending:
+                        return
+
+                    page_num, future = pending.popleft()
+                    items = future.result()
+                    if not items:
+                        return
+                    yield page_num, items
+                    if page_size and len(items) < page_size:
+                        return
+            finally:
+                # Past the end: drop requests that have not started yet
+                for _, future in pending:
+                    future.cancel()
+
     def extract_wattage(self, title: str) -> str:
         """Extract wattage from product title"""
-        import re
-        match = re.search(r'(\d+)\s*[Ww](?:att)?', title)
-        return f"{match.group(1)}W" if match else 'N/A'
-    
+        return extract_fields(title).wattage
+
     def extract_kva(self, title: str, specs: dict) -> str:
         """
         Extract KVA rating from title or specs (for transformers)
         Examples: "1500 KVA", "1500kva", "1500 kva"
         """
-        import re
-        
-        # Check specs first if available
-        if specs.get('kva'):
-            return str(specs['kva'])
-        
-        # Try to find KVA in title
-        match = re.search(r'(\d+)\s*[Kk][Vv][Aa]', title)
-        if match:
-            return f"{match.group(1)} KVA"
-        
-        return 'N/A'
+        return extract_fields(title, specs).kva
 
     def extract_efficiency(self, title: str, specs: dict) -> str:
         """Extract efficiency from title or specs"""
-        import re
-        # Try to find efficiency in title (e.g., "22.5%" or "22.5 efficiency")
-        match = re.search(r'(\d+\.?\d*)\s*%?\s*[Ee]ff', title)
-        if match:
-            return f"{match.group(1)}%"
-
-        # Try specs dictionary
-        if 'efficiency' in specs:
-            return specs['efficiency']
-
-        return 'N/A'
+        return extract_fields(title, specs).efficiency
 
     def extract_quantity(self, title: str) -> int:
         """
@@ -138,38 +409,7 @@ class BaseScraper(ABC):
         - "(30A)" -> 1 (amperage spec)
         - "400W Panel" -> 1 (single unit with wattage)
         """
-        import re
-        
-        # Pattern 1: "pallet of X" or "case of X" or "pack of X" (most reliable)
-        match = re.search(r'(?:pallet|case|pack|box|bundle|lot|set)\s+of\s+(\d+)', title, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-        
-        # Pattern 2: "X pack" or "X-pack" (e.g., "10 pack", "5-pack")
-        match = re.search(r'\b(\d+)[-\s]?pack\b', title, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-        
-        # Pattern 3: "quantity: X" or "qty: X"
-        match = re.search(r'(?:quantity|qty)[:\s]+(\d+)', title, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-        
-        # Pattern 4: "X units" or "X pieces" or "X pcs"
-        match = re.search(r'\b(\d+)\s+(?:units|pcs|pieces)\b', title, re.IGNORECASE)
-        if match:
-            return int(match.group(1))
-        
-        # Pattern 5: "(X) panels/inverters/batteries" - only if followed by product type
-        match = re.search(r'\((\d+)\)\s+(?:solar\s+)?(?:panels?|inverters?|batteries|modules?|controllers?)', title, re.IGNORECASE)
-        if match:
-            qty = int(match.group(1))
-            # Sanity check: reasonable bulk quantities are typically 2-100
-            if 2 <= qty <= 100:
-                return qty
-        
-        # Default: single unit
-        return 1
+        return extract_fields(title).quantity
 
     def calculate_price_per_unit(self, price: float, quantity: int) -> float:
         """Calculate price per unit for bulk items"""
@@ -182,65 +422,7 @@ class BaseScraper(ABC):
         Determine product category from title and specs
         Categories: Solar Panel, Inverter, Battery, Charge Controller, Racking, BOS, Transformer, Switch, Other
         """
-        import re
-        
-        title_lower = title.lower()
-        
-        # Check specs first if available
-        if specs.get('product_type'):
-            product_type = specs['product_type'].lower()
-            if 'transformer' in product_type:
-                return 'Transformer'
-            elif 'switch' in product_type:
-                return 'Switch'
-            elif 'panel' in product_type or 'module' in product_type:
-                return 'Solar Panel'
-            elif 'inverter' in product_type:
-                return 'Inverter'
-            elif 'battery' in product_type or 'storage' in product_type:
-                return 'Battery/Storage'
-            elif 'charge' in product_type or 'controller' in product_type:
-                return 'Charge Controller'
-            elif 'rack' in product_type or 'mount' in product_type:
-                return 'Racking/Mounting'
-        
-        # Check collection if available
-        if specs.get('collection'):
-            collection = specs['collection'].lower()
-            if 'transformer' in collection:
-                return 'Transformer'
-            elif 'switch' in collection:
-                return 'Switch'
-            elif 'panel' in collection:
-                return 'Solar Panel'
-            elif 'inverter' in collection:
-                return 'Inverter'
-            elif 'batter' in collection or 'storage' in collection:
-                return 'Battery/Storage'
-            elif 'charge' in collection or 'controller' in collection:
-                return 'Charge Controller'
-            elif 'rack' in collection or 'mount' in collection:
-                return 'Racking/Mounting'
-        
-        # Fallback to title analysis
-        if re.search(r'\btransformer|padmount|pad-mount|kva\b', title_lower):
-            return 'Transformer'
-        elif re.search(r'\bswitch(?:es)?|disconnect|circuit\s+breaker|switchgear\b', title_lower):
-            return 'Switch'
-        elif re.search(r'\b(?:solar\s+)?panel|module|pv\s+panel\b', title_lower):
-            return 'Solar Panel'
-        elif re.search(r'\binverter|micro[-\s]?inverter|grid[-\s]?tie|off[-\s]?grid\b', title_lower):
-            return 'Inverter'
-        elif re.search(r'\bbattery|batteries|storage|energy\s+storage|lithium|lifepo4\b', title_lower):
-            return 'Battery/Storage'
-        elif re.search(r'\bcharge\s+controller|mppt|pwm\s+controller\b', title_lower):
-            return 'Charge Controller'
-        elif re.search(r'\bracking|mounting|rail|bracket|clamp|flashings?\b', title_lower):
-            return 'Racking/Mounting'
-        elif re.search(r'\bcombiner|fuse|wire|cable|conduit\b', title_lower):
-            return 'BOS/Electrical'
-        
-        return 'Other'
+        return extract_fields(title, specs).category
 
     def calculate_discount(self, price: float, compare_price: float) -> float:
         """Calculate discount percentage"""
@@ -248,17 +430,39 @@ class BaseScraper(ABC):
             return round(((compare_price - price) / compare_price) * 100, 2)
         return 0.0
 
-    def run(self) -> List[Dict]:
+    def stream(self) -> Iterator[Dict]:
         """
-        Main execution method
-        Returns list of scraped products
+        Streaming execution method
+        Yields scraped products one at a time without keeping them on the scraper
         """
         print(f"\n{'='*60}")
         print(f"🔍 Scraping {self.distributor_name}...")
         print(f"{'='*60}")
 
-        self.products = self.scrape_products()
+        count = 0
+        for product in self.iter_products():
+            count += 1
+            yield product
 
-        print(f"✅ Scraped {len(self.products)} products from {self.distributor_name}")
+        print(f"✅ Scraped {count} products from {self.distributor_name}")
+        self.report_http_cache()
 
+    def run(self) -> List[Dict]:
+        """
+        Main execution method
+        Returns list of scraped products
+        """
+        self.products = list(self.stream())
         return self.products
+
+    def report_http_cache(self):
+        """Print HTTP cache hit/miss counters and evict entries beyond the size limit"""
+        if self.http_cache is None:
+            return
+
+        stats = self.http_cache.stats()
+        total = stats['hits'] + stats['misses']
+        if total:
+            print(f"💾 HTTP cache ({self.distributor_name}): {stats['hits']} hits / "
+                  f"{stats['misses']} misses ({stats['hits'] / total:.0%} hit rate)")
+        self.http_cache.prune()
@@ -0,0 +1,176 @@
+"""
+AVL Matching Benchmark
+Compares the vectorized AVLHandler.add_avl_columns against the original
+row-by-row df.apply implementation (one DataFrame scan of the AVL tables per
+product and list) on synthetic catalogs
+
+Usage: python benchmark_avl.py [sizes...]   (default: 10000 100000)
+"""
+
+import random
+import sys
+import time
+from typing import Dict
+
+import pandas as pd
+
+from avl_handler import AVLHandler
+
+
+AVL_COLUMNS = [
+    'thrive_approved', 'thrive_domestic', 'thrive_match_type',
+    'goodleap_approved', 'goodleap_program', 'goodleap_domestic',
+    'on_any_avl', 'on_all_avls', 'domestic_content_qualified'
+]
+
+
+def build_products(avl: AVLHandler, size: int, seed: int = 42) -> pd.DataFrame:
+    """Build a synthetic catalog mixing exact AVL models, AVL brands and unknown brands"""
+    rng = random.Random(seed)
+    avl_pairs = list(zip(avl.thrive_df['Manufacturer'], avl.thrive_df['Model']))
+    goodleap_brands = list(avl.goodleap_df['Manufacturer'])
+    other_brands = ['Generic', 'EG4', 'Victron', 'Enphase', 'SolarEdge', 'Renogy', 'N/A']
+
+    rows = []
+    for i in range(size):
+        roll = rng.random()
+        if roll < 0.3:
+            brand, sku = rng.choice(avl_pairs)
+        elif roll < 0.6:
+            brand, sku = rng.choice(goodleap_brands), f"MODEL-{i}"
+        else:
+            brand, sku = rng.choice(other_brands), 'N/A'
+
+        # Vary case/whitespace like real distributor data
+        if rng.random() < 0.2:
+            brand = f" {brand.upper()} "
+
+        rows.append({
+            'brand': brand,
+            'sku': sku,
+            'title': f"{brand} {sku} {rng.randint(100, 600)}W",
+            'specs': {'domestic_content': rng.choice(['Yes', 'No', 'No', 'No'])}
+        })
+
+    return pd.DataFrame(rows)
+
+
+def legacy_check_thrive_approval(avl: AVLHandler, manufacturer: str, model: str = '') -> Dict:
+    """Original check_thrive_approval: boolean-mask scan of the THRIVE table"""
+    if avl.thrive_df is None or avl.thrive_df.empty:
+        return {'approved': False, 'domestic': False, 'match_type': 'no_avl'}
+
+    manufacturer_norm = manufacturer.upper().strip()
+    model_norm = model.upper().strip() if model else ''
+
+    manufacturer_matches = avl.thrive_df[
+        avl.thrive_df['manufacturer_normalized'] == manufacturer_norm
+    ]
+
+    if manufacturer_matches.empty:
+        return {'approved': False, 'domestic': False, 'match_type': 'not_found'}
+
+    if model_norm and 'model_normalized' in avl.thrive_df.columns:
+        model_matches = manufacturer_matches[
+            manufacturer_matches['model_normalized'] == model_norm
+        ]
+
+        if not model_matches.empty:
+            row = model_matches.iloc[0]
+            domestic = False
+            if 'Domestic Content' in row:
+                domestic = str(row['Domestic Content']).upper() in ['YES', 'Y', 'TRUE', '1']
+
+            return {'approved': True, 'domestic': domestic, 'match_type': 'exact'}
+
+    return {'approved': True, 'domestic': False, 'match_type': 'manufacturer_only'}
+
+
+def legacy_check_goodleap_approval(avl: AVLHandler, manufacturer: str) -> Dict:
+    """Original check_goodleap_approval: boolean-mask scan of the GOODLEAP table"""
+    if avl.goodleap_df is None or avl.goodleap_df.empty:
+        return {'approved': False, 'program': None, 'domestic': False}
+
+    manufacturer_norm = manufacturer.upper().strip()
+
+    matches = avl.goodleap_df[
+        avl.goodleap_df['manufacturer_normalized'] == manufacturer_norm
+    ]
+
+    if matches.empty:
+        return {'approved': False, 'program': None, 'domestic': False}
+
+    row = matches.iloc[0]
+    program = row.get('Program Type', 'Unknown')
+
+    domestic = False
+    if 'Domestic Content' in row:
+        domestic_val = str(row['Domestic Content']).upper()
+        domestic = domestic_val in ['YES', 'Y', 'TRUE', '1']
+
+    return {'approved': True, 'program': program, 'domestic': domestic}
+
+
+def legacy_add_avl_columns(avl: AVLHandler, df: pd.DataFrame) -> pd.DataFrame:
+    """Original implementation: one scan-based check per product row via df.apply"""
+    thrive_results = df.apply(
+        lambda row: legacy_check_thrive_approval(avl, row['brand'], row.get('sku', '')), axis=1
+    )
+    df['thrive_approved'] = thrive_results.apply(lambda x: x['approved'])
+    df['thrive_domestic'] = thrive_results.apply(lambda x: x['domestic'])
+    df['thrive_match_type'] = thrive_results.apply(lambda x: x['match_type'])
+
+    goodleap_results = df.apply(lambda row: legacy_check_goodleap_approval(avl, row['brand']), axis=1)
+    df['goodleap_approved'] = goodleap_results.apply(lambda x: x['approved'])
+    df['goodleap_program'] = goodleap_results.apply(lambda x: x['program'])
+    df['goodleap_domestic'] = goodleap_results.apply(lambda x: x['domestic'])
+
+    df['on_any_avl'] = df['thrive_approved'] | df['goodleap_approved']
+    df['on_all_avls'] = df['thrive_approved'] & df['goodleap_approved']
+    df['domestic_content_qualified'] = (
+        df['thrive_domestic'] |
+        df['goodleap_domestic'] |
+        df['specs'].apply(lambda x: isinstance(x, dict) and x.get('domestic_content', 'No').upper() == 'YES')
+    )
+    return df
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    avl = AVLHandler('THRIVE_AVL.xlsx', 'GOODLEAP_AVL.xlsx')
+
+    print("\n" + "="*60)
+    print("⏱️  AVL MATCHING BENCHMARK")
+    print("="*60)
+
+    for size in sizes:
+        products = build_products(avl, size)
+
+        start = time.perf_counter()
+        legacy = legacy_add_avl_columns(avl, products.copy())
+        legacy_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        vectorized = avl.add_avl_columns(products.copy(), verbose=False)
+        vectorized_time = time.perf_counter() - start
+
+        # The original matched exact upper-cased names only; the current handler also
+        # resolves manufacturer aliases, so rows of aliased brands may differ
+        differs = pd.Series(False, index=products.index)
+        for column in AVL_COLUMNS:
+            both_missing = legacy[column].isna() & vectorized[column].isna()
+            differs |= ~both_missing & (legacy[column] != vectorized[column])
+        differing_brands = sorted(products.loc[differs, 'brand'].str.strip().str.upper().unique())
+
+        print(f"\n📦 {size:,} products")
+        print(f"  • Row-by-row apply: {legacy_time:.3f}s")
+        print(f"  • Vectorized merge: {vectorized_time:.3f}s")
+        print(f"  • Speedup: {legacy_time / vectorized_time:.1f}x")
+        print(f"  • Identical results: {'✅' if not differs.any() else '❌'} "
+              f"({differs.sum():,} rows differ: {', '.join(differing_brands) or 'none'})")
+
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Field Extraction Benchmark
+Compares the memoized field_extractor engine against the previous per-call
+BaseScraper extract_* implementations on a corpus of distributor titles
+
+Usage: python benchmark_extraction.py [titles.txt]   (one title per line; defaults to the built-in corpus)
+"""
+
+import sys
+import time
+
+from field_extractor import clear_extraction_cache, extract_fields, extraction_cache_info
+
+
+# Titles as listed by the distributors (panels, inverters, batteries, transformers, BOS)
+TITLES = [
+    "Canadian Solar CS6R-410MS 410W 108 Cell Mono Black Frame Solar Panel",
+    "Canadian Solar 410W Mono Black Frame - Pallet of 36",
+    "REC Alpha Pure-R 430W Black Frame Solar Panel (REC430AA PURE-R)",
+    "Q CELLS Q.PEAK DUO BLK ML-G10+ 400W Solar Module",
+    "Q.TRON BLK M-G2+ 425W 22.0% Eff Solar Panel - Pallet of 30",
+    "Silfab SIL-400 HC+ 400 Watt Domestic Content Solar Panel",
+    "Jinko Solar Tiger Neo 420W N-Type Bifacial Module JKM420N-54HL4-B",
+    "JA Solar JAM72S30-540/MR 540W Mono PERC Half Cell Module, Case of 31",
+    "Mission Solar MSE390SQ8T 390W Perc Mono Solar Panel (4) Panels",
+    "Trina Solar Vertex S+ TSM-NEG9R.28 430W Dual Glass",
+    "Longi Hi-MO 6 LR5-54HTH-430M 430W 21.5% efficiency",
+    "Hyundai 400W HiE-S400VG Mono Black 10 pack",
+    "Enphase IQ8PLUS-72-2-US IQ8+ Microinverter",
+    "Enphase IQ8M-72-2-US Micro-Inverter, 10-pack",
+    "SolarEdge SE7600H-US Energy Hub Inverter 7600W",
+    "SolarEdge SE10000H-US HD-Wave Grid-Tie Inverter (10000W)",
+    "SMA Sunny Boy SB7.7-1SP-US-41 7.7kW Inverter",
+    "Fronius Primo 8.2-1 208-240V Grid Tie Inverter",
+    "Sol-Ark 15K-2P-N 15kW Hybrid Off-Grid Inverter",
+    "EG4 18kPV Hybrid Inverter 12000W PV Input 18000W",
+    "Tesla Powerwall 3 13.5kWh Home Battery Storage",
+    "Enphase IQ Battery 5P 5kWh Lithium Storage System",
+    "EG4 LifePower4 48V 100Ah LiFePO4 Server Rack Battery",
+    "Fortress Power eVault Max 18.5kWh Energy Storage",
+    "Victron SmartSolar MPPT 150/35 Charge Controller",
+    "Morningstar TriStar TS-60 PWM Controller",
+    "IronRidge XR100 Rail 168in Mill Finish",
+    "IronRidge UFO Universal Fastening Object Mid Clamp - Box of 50",
+    "Unirac SolarMount Flashkit Pro Flashings, qty: 20",
+    "SnapNrack Ultra Rail Bracket Kit 25 pcs",
+    "1500 KVA Padmount Transformer 480Y/277V - 12470GrdY/7200V",
+    "750kva pad-mount transformer three phase",
+    "Eaton DG222URB 60A Fused Disconnect Switch",
+    "Square D 200A Circuit Breaker Switchgear",
+    "MidNite Solar MNPV6 Combiner Box 6 String",
+    "10 AWG PV Wire 500ft Spool Black Cable",
+    "MC4 Connector Pair (Male/Female) 100 units",
+    "Soladeck 0786-41 Rooftop Conduit Pass-Through",
+    "APsystems DS3-S Dual Microinverter 640W",
+    "Heliene 405W Domestic Content Black Module, Pallet of 32",
+    "Generator Transfer Switch 200 Amp",
+    "Panasonic EverVolt 17.1 kWh Battery",
+    "Solar Panel Cleaning Kit",
+    "Aptos DNA-120-MF10-370W Black Solar Panel",
+    "HT-SAAE HT54-18X 410W Bifacial Module (2) modules",
+    "Maxeon 6 AC 420W Solar Panel with Integrated Microinverter",
+    "Qcells Q.HOME Core H5 Battery System",
+    "Generac PWRcell 9kWh Battery Cabinet",
+    "Tigo TS4-A-O Optimizer 700W",
+    "Chint CPS SCA60KTL-DO/US-480 60kW String Inverter",
+]
+
+# Spec dictionaries scrapers pass alongside titles
+SPECS = [{}, {}, {'collection': 'solar-panels'}, {'product_type': 'Inverter'}, {'kva': '1500'}, {'efficiency': '21.3%'}]
+
+# Each product title is looked up once per variant (and again per collection it appears in)
+VARIANTS_PER_TITLE = 4
+
+
+class LegacyExtractor:
+    """Previous BaseScraper implementations (re imported and patterns compiled/cached per call)"""
+
+    def extract_wattage(self, title: str) -> str:
+        """Extract wattage from product title"""
+        import re
+        match = re.search(r'(\d+)\s*[Ww](?:att)?', title)
+        return f"{match.group(1)}W" if match else 'N/A'
+    
+    def extract_kva(self, title: str, specs: dict) -> str:
+        """
+        Extract KVA rating from title or specs (for transformers)
+        Examples: "1500 KVA", "1500kva", "1500 kva"
+        """
+        import re
+        
+        # Check specs first if available
+        if specs.get('kva'):
+            return str(specs['kva'])
+        
+        # Try to find KVA in title
+        match = re.search(r'(\d+)\s*[Kk][Vv][Aa]', title)
+        if match:
+            return f"{match.group(1)} KVA"
+        
+        return 'N/A'
+
+    def extract_efficiency(self, title: str, specs: dict) -> str:
+        """Extract efficiency from title or specs"""
+        import re
+        # Try to find efficiency in title (e.g., "22.5%" or "22.5 efficiency")
+        match = re.search(r'(\d+\.?\d*)\s*%?\s*[Ee]ff', title)
+        if match:
+            return f"{match.group(1)}%"
+
+        # Try specs dictionary
+        if 'efficiency' in specs:
+            return specs['efficiency']
+
+        return 'N/A'
+
+    def extract_quantity(self, title: str) -> int:
+        """
+        Extract quantity from product title for bulk items
+        Examples: 
+        - "Pallet of 30 Solar Panels" -> 30
+        - "Solar Panel - 10 Pack" -> 10
+        - "Case of 12 Inverters" -> 12
+        - "(7) Solar Panels Pack" -> 7 (only if followed by pack/bundle indicator)
+        
+        Does NOT match specifications like:
+        - "(7600W)" -> 1 (wattage spec)
+        - "(30A)" -> 1 (amperage spec)
+        - "400W Panel" -> 1 (single unit with wattage)
+        """
+        import re
+        
+        # Pattern 1: "pallet of X" or "case of X" or "pack of X" (most reliable)
+        match = re.search(r'(?:pallet|case|pack|box|bundle|lot|set)\s+of\s+(\d+)', title, re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+        
+        # Pattern 2: "X pack" or "X-pack" (e.g., "10 pack", "5-pack")
+        match = re.search(r'\b(\d+)[-\s]?pack\b', title, re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+        
+        # Pattern 3: "quantity: X" or "qty: X"
+        match = re.search(r'(?:quantity|qty)[:\s]+(\d+)', title, re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+        
+        # Pattern 4: "X units" or "X pieces" or "X pcs"
+        match = re.search(r'\b(\d+)\s+(?:units|pcs|pieces)\b', title, re.IGNORECASE)
+        if match:
+            return int(match.group(1))
+        
+        # Pattern 5: "(X) panels/inverters/batteries" - only if followed by product type
+        match = re.search(r'\((\d+)\)\s+(?:solar\s+)?(?:panels?|inverters?|batteries|modules?|controllers?)', title, re.IGNORECASE)
+        if match:
+            qty = int(match.group(1))
+            # Sanity check: reasonable bulk quantities are typically 2-100
+            if 2 <= qty <= 100:
+                return qty
+        
+        # Default: single unit
+        return 1
+
+    def extract_product_category(self, title: str, specs: dict) -> str:
+        """
+        Determine product category from title and specs
+        Categories: Solar Panel, Inverter, Battery, Charge Controller, Racking, BOS, Transformer, Switch, Other
+        """
+        import re
+        
+        title_lower = title.lower()
+        
+        # Check specs first if available
+        if specs.get('product_type'):
+            product_type = specs['product_type'].lower()
+            if 'transformer' in product_type:
+                return 'Transformer'
+            elif 'switch' in product_type:
+                return 'Switch'
+            elif 'panel' in product_type or 'module' in product_type:
+                return 'Solar Panel'
+            elif 'inverter' in product_type:
+                return 'Inverter'
+            elif 'battery' in product_type or 'storage' in product_type:
+                return 'Battery/Storage'
+            elif 'charge' in product_type or 'controller' in product_type:
+                return 'Charge Controller'
+            elif 'rack' in product_type or 'mount' in product_type:
+                return 'Racking/Mounting'
+        
+        # Check collection if available
+        if specs.get('collection'):
+            collection = specs['collection'].lower()
+            if 'transformer' in collection:
+                return 'Transformer'
+            elif 'switch' in collection:
+                return 'Switch'
+            elif 'panel' in collection:
+                return 'Solar Panel'
+            elif 'inverter' in collection:
+                return 'Inverter'
+            elif 'batter' in collection or 'storage' in collection:
+                return 'Battery/Storage'
+            elif 'charge' in collection or 'controller' in collection:
+                return 'Charge Controller'
+            elif 'rack' in collection or 'mount' in collection:
+                return 'Racking/Mounting'
+        
+        # Fallback to title analysis
+        if re.search(r'\btransformer|padmount|pad-mount|kva\b', title_lower):
+            return 'Transformer'
+        elif re.search(r'\bswitch(?:es)?|disconnect|circuit\s+breaker|switchgear\b', title_lower):
+            return 'Switch'
+        elif re.search(r'\b(?:solar\s+)?panel|module|pv\s+panel\b', title_lower):
+            return 'Solar Panel'
+        elif re.search(r'\binverter|micro[-\s]?inverter|grid[-\s]?tie|off[-\s]?grid\b', title_lower):
+            return 'Inverter'
+        elif re.search(r'\bbattery|batteries|storage|energy\s+storage|lithium|lifepo4\b', title_lower):
+            return 'Battery/Storage'
+        elif re.search(r'\bcharge\s+controller|mppt|pwm\s+controller\b', title_lower):
+            return 'Charge Controller'
+        elif re.search(r'\bracking|mounting|rail|bracket|clamp|flashings?\b', title_lower):
+            return 'Racking/Mounting'
+        elif re.search(r'\bcombiner|fuse|wire|cable|conduit\b', title_lower):
+            return 'BOS/Electrical'
+        
+        return 'Other'
+
+
+def legacy_fields(extractor: LegacyExtractor, title: str, specs: dict):
+    return (
+        extractor.extract_wattage(title),
+        extractor.extract_kva(title, specs),
+        extractor.extract_efficiency(title, specs),
+        extractor.extract_quantity(title),
+        extractor.extract_product_category(title, specs),
+    )
+
+
+def engine_fields(title: str, specs: dict):
+    # Same calls BaseScraper makes: each field is requested separately
+    return (
+        extract_fields(title).wattage,
+        extract_fields(title, specs).kva,
+        extract_fields(title, specs).efficiency,
+        extract_fields(title).quantity,
+        extract_fields(title, specs).category,
+    )
+
+
+def main():
+    titles = TITLES
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], 'r') as f:
+            titles = [line.strip() for line in f if line.strip()]
+
+    calls = [
+        (title, SPECS[i % len(SPECS)])
+        for i, title in enumerate(titles)
+        for _ in range(VARIANTS_PER_TITLE)
+    ]
+    rounds = max(1, 20000 // len(calls))
+
+    legacy = LegacyExtractor()
+    legacy_results = [legacy_fields(legacy, title, specs) for title, specs in calls]
+    clear_extraction_cache()
+    engine_results = [engine_fields(title, specs) for title, specs in calls]
+    mismatches = sum(1 for a, b in zip(legacy_results, engine_results) if a != b)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for title, specs in calls:
+            legacy_fields(legacy, title, specs)
+    legacy_time = time.perf_counter() - start
+
+    # Cold: every round starts with an empty cache, so only variant repeats hit
+    start = time.perf_counter()
+    for _ in range(rounds):
+        clear_extraction_cache()
+        for title, specs in calls:
+            engine_fields(title, specs)
+    cold_time = time.perf_counter() - start
+
+    # Warm: titles already seen (e.g. product in several collections, later runs in-process)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for title, specs in calls:
+            engine_fields(title, specs)
+    warm_time = time.perf_counter() - start
+
+    total = rounds * len(calls)
+    print("\n" + "="*60)
+    print("⏱️  FIELD EXTRACTION BENCHMARK")
+    print("="*60)
+    print(f"  • {len(titles)} titles x {VARIANTS_PER_TITLE} variants, {rounds} rounds ({total:,} products)")
+    print(f"  • Legacy extract_*: {legacy_time:.3f}s ({legacy_time / total * 1e6:.1f}µs/product)")
+    print(f"  • Engine (cold cache): {cold_time:.3f}s ({cold_time / total * 1e6:.1f}µs/product, "
+          f"{legacy_time / cold_time:.1f}x)")
+    print(f"  • Engine (warm cache): {warm_time:.3f}s ({warm_time / total * 1e6:.1f}µs/product, "
+          f"{legacy_time / warm_time:.1f}x)")
+    print(f"  • Cache: {extraction_cache_info()}")
+    print(f"  • Identical results: {'✅' if mismatches == 0 else f'❌ ({mismatches} mismatches)'}")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
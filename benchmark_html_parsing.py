@@ -0,0 +1,523 @@
+"""
+HTML Parsing Benchmark
+Compares the lxml parsing layer (html_parsing) against the previous
+BeautifulSoup 'html.parser' implementations on saved page fixtures, and
+partial (section) parsing against whole-page parsing in CPU time and peak memory
+
+Usage: python benchmark_html_parsing.py [fixture_dir]
+       (pages are read from fixture_dir when present; otherwise representative pages
+        are generated and saved there, defaults to .scraper_state/html_fixtures)
+"""
+
+import ctypes
+import os
+import re
+import resource
+import subprocess
+import sys
+import time
+from typing import Optional
+from urllib.parse import urljoin
+
+from bs4 import BeautifulSoup
+
+from scrapers.essential_parts_scraper import EssentialPartsScraper
+from scrapers.giga_energy_scraper import GigaEnergyScraper
+from scrapers.ressupply_scraper import RessupplyScraper
+from spec_sheet_downloader import SpecSheetDownloader
+
+
+FIXTURES = [
+    'ressupply_category.html',
+    'giga_listing.html',
+    'giga_product.html',
+    'essential_parts_collection.html',
+    'spec_sheet_product.html',
+]
+
+
+# ---------------------------------------------------------------------------
+# Fixture pages (theme boilerplate around the parts the scrapers read)
+# ---------------------------------------------------------------------------
+
+def page_shell(body: str, title: str = 'Solar Equipment Store') -> str:
+    head = ''.join(
+        f'<link rel="stylesheet" href="/assets/theme-{i}.css"><script src="/assets/app-{i}.js"></script>'
+        for i in range(20)
+    )
+    inline_script = '<script>window.dataLayer = [' + ','.join(f'{{"event": "e{i}"}}' for i in range(300)) + '];</script>'
+    nav = '<nav class="main-menu"><ul>' + ''.join(
+        f'<li class="menu-item"><a href="/category-{i}" class="menu-link">Category {i}</a>'
+        f'<ul class="submenu">' + ''.join(f'<li><a href="/category-{i}/sub-{j}">Sub {j}</a></li>' for j in range(8)) + '</ul></li>'
+        for i in range(25)
+    ) + '</ul></nav>'
+    footer = '<footer class="site-footer">' + ''.join(
+        f'<div class="footer-col"><h4>Links {i}</h4><p>Copyright text &amp; policies {i}</p>'
+        f'<a href="/pages/info-{i}">Info {i}</a></div>'
+        for i in range(30)
+    ) + '</footer>'
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title>{head}{inline_script}</head>'
+        f'<body><header class="site-header">{nav}</header><main>{body}</main>{footer}</body></html>'
+    )
+
+
+def ressupply_category_page() -> str:
+    brands = ['Canadian Solar', 'Q CELLS', 'REC', 'Silfab', 'Jinko Solar', 'Hanwha Q CELLS']
+    cards = []
+    for i in range(48):
+        watts = 380 + (i % 12) * 5
+        cards.append(
+            f'<div class="product-layout product-grid col-lg-3"><div class="product-thumb">'
+            f'<div class="image"><a href="https://ressupply.com/panel-{i}">'
+            f'<img src="image/cache/catalog/panel-{i}-228x228.jpg" class="img-responsive"></a></div>'
+            f'<div class="caption"><div class="name"><a href="https://ressupply.com/panel-{i}">'
+            f'{brands[i % len(brands)]} {watts}W Mono Black Frame Solar Panel</a></div>'
+            f'<div class="description">132 Half Cell Mono PERC 30mm Black Frame 1500VDC MC4 {watts - 25}.8W PTC'
+            f'{" Bifacial" if i % 3 == 0 else ""}</div>'
+            f'<div class="price-row"><span class="price-new">${watts * 0.31:,.2f}</span>'
+            f'<span class="price-tax">Ex Tax: ${watts * 0.31:,.2f}</span></div>'
+            f'<div class="cart-group"><input type="text" name="quantity" class="quantity" data-min="{1 + i % 4}" value="1">'
+            f'<button type="button" class="btn-cart">Add to Cart</button></div></div></div></div>'
+        )
+    pagination = '<ul class="pagination">' + ''.join(
+        f'<li><a href="/solar-panels?page={i}">{i}</a></li>' for i in range(1, 6)
+    ) + '<li><a href="/solar-panels?page=2">&gt;</a></li><li><a href="/solar-panels?page=5">&gt;|</a></li></ul>'
+    return page_shell(f'<div class="row">{"".join(cards)}</div>{pagination}')
+
+
+def giga_listing_page() -> str:
+    cards = []
+    for i in range(60):
+        kva = [75, 150, 300, 500, 750, 1000, 1500, 2000, 2500, 3000][i % 10]
+        cards.append(
+            f'<div role="listitem" class="shop_item w-dyn-item"><a href="/shop/{kva}-kva-padmount-{i}" class="shop_card w-inline-block">'
+            f'<img src="https://cdn.prod.website-files.com/site/{i}.webp" class="shop_image">'
+            f'<div class="shop_title">{kva} kVA 3-Phase Padmount Transformer</div>'
+            f'<div class="shop_price">$<span class="shop_price-number">{kva * 41:,}</span></div></a></div>'
+        )
+    return page_shell(f'<div class="w-dyn-list"><div role="list" class="shop_list w-dyn-items">{"".join(cards)}</div></div>'
+                      f'<a href="?1cec0fbe_page=2" class="w-pagination-next">Next</a>')
+
+
+def giga_product_page() -> str:
+    title = '1500 kVA 3-Phase Padmount Transformer: 20780 D to 480 Y/ 277'
+    specs = ''.join(f'<div class="spec_row"><div class="spec_label">Spec {i}</div><div class="spec_value">{i * 7}</div></div>'
+                    for i in range(80))
+    body = (
+        f'<section class="product_hero"><img src="/images/placeholder.svg" class="logo">'
+        f'<img src="//cdn.prod.website-files.com/site/1500kva.webp" class="product_image">'
+        f'<h1 class="product_title">{title}</h1>'
+        f'<div class="shop_price">$<span class="shop_price-number">61,500.00</span></div>'
+        f'<form class="quote_form"><input type="hidden" name="product" value="{title}">'
+        f'<input type="hidden" name="kva_rating" value="1500"></form></section>'
+        f'<section class="specs">{specs}</section>'
+    )
+    return page_shell(body, title=f'{title}・Giga Energy')
+
+
+def essential_parts_collection_page() -> str:
+    cards = []
+    for i in range(40):
+        kind = 'Transformer' if i % 2 == 0 else 'Disconnect Switch'
+        stock = ['In stock', 'Sold out', 'Only 3 left'][i % 3]
+        cards.append(
+            f'<div class="grid__item"><div class="card-wrapper product-card-wrapper">'
+            f'<a href="/products/item-{i}" class="full-unstyled-link">'
+            f'<img src="//essentialparts.com/cdn/shop/products/item-{i}.jpg" alt=""></a>'
+            f'<h3 class="card__heading card-title"><a href="/products/item-{i}">{150 + i * 25} KVA {kind} EP-{i:04d}</a></h3>'
+            f'<div class="card-vendor">Eaton</div>'
+            f'<div class="price"><span class="price-item price-item--regular">${1200 + i * 95:,}.00</span></div>'
+            f'<span class="badge">{stock}</span></div></div>'
+        )
+    return page_shell(f'<div class="collection"><ul id="product-grid" class="grid">{"".join(cards)}</ul></div>')
+
+
+def spec_sheet_product_page() -> str:
+    links = []
+    for i in range(40):
+        links.append(f'<a href="/files/manual-{i}.pdf" title="Installation Manual {i}">Manual {i}</a>')
+        links.append(f'<a href="/cdn/docs/{i}.pdf?v=3">Datasheet {i}</a>')
+        links.append(f'<a href="/products/related-{i}" class="product-link">Related product {i}</a>')
+        links.append(f'<button class="btn download-spec" data-url="/assets/spec-{i}.PDF">Download</button>')
+    viewer = '<iframe src="https://docs.example.com/viewer?file=/sheets/main.pdf"></iframe>'
+    return page_shell(f'<div class="product-documents">{"".join(links)}{viewer}</div>')
+
+
+GENERATORS = {
+    'ressupply_category.html': ressupply_category_page,
+    'giga_listing.html': giga_listing_page,
+    'giga_product.html': giga_product_page,
+    'essential_parts_collection.html': essential_parts_collection_page,
+    'spec_sheet_product.html': spec_sheet_product_page,
+}
+
+
+def load_fixtures(fixture_dir: str) -> dict:
+    """Read fixture pages, generating and saving any that are missing"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    pages = {}
+    for name in FIXTURES:
+        path = os.path.join(fixture_dir, name)
+        if not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(GENERATORS[name]())
+        with open(path, 'rb') as f:
+            pages[name] = f.read()
+    return pages
+
+
+# ---------------------------------------------------------------------------
+# Previous BeautifulSoup implementations
+# ---------------------------------------------------------------------------
+
+class LegacyRessupplyScraper(RessupplyScraper):
+    """RessupplyScraper page parsing with BeautifulSoup 'html.parser'"""
+
+    def parse_category_page(self, content):
+        soup = BeautifulSoup(content, 'html.parser')
+        product_containers = soup.find_all('div', class_='product-layout')
+        if not product_containers:
+            return None, False
+        products = []
+        for container in product_containers:
+            product = self.extract_product_data(container)
+            if product:
+                products.append(product)
+        return products, bool(soup.find('a', string='>'))
+
+    def extract_product_data(self, container):
+        name_element = container.find('div', class_='name')
+        if not name_element or not name_element.find('a'):
+            return None
+        link = name_element.find('a')
+        title = link.get_text(strip=True)
+        product_url = link.get('href', '')
+        price_container = container.find('div', class_='price-row')
+        price = 0.0
+        if price_container:
+            price_match = re.search(r'\$?([\d,]+\.?\d*)', price_container.get_text(strip=True))
+            if price_match:
+                price = float(price_match.group(1).replace(',', ''))
+        description_element = container.find('div', class_='description')
+        description = description_element.get_text(strip=True) if description_element else ''
+        image_element = container.find('div', class_='image')
+        image_url = 'N/A'
+        if image_element and image_element.find('img'):
+            image_url = image_element.find('img').get('src', 'N/A')
+            if image_url and not image_url.startswith('http'):
+                image_url = f"{self.base_url}/{image_url}"
+        qty_input = container.find('input', class_='quantity')
+        min_qty = qty_input.get('data-min', '1') if qty_input else '1'
+        product_id = product_url.split('/')[-1] if product_url else 'N/A'
+        return self.get_standardized_product(
+            product_id=product_id, sku=product_id, title=title, brand=self.extract_brand(title),
+            wattage=self.extract_wattage(f"{title} {description}"),
+            efficiency=self.extract_efficiency(f"{title} {description}", {}),
+            price=price, compare_price=0.0,
+            stock_status='In Stock' if int(min_qty) > 0 else 'Unknown',
+            inventory_qty=f"Min Order: {min_qty}", shipping_cost='Calculated at Checkout',
+            product_url=product_url, image_url=image_url, specs=self.parse_specs(description)
+        )
+
+
+class LegacyGigaEnergyScraper(GigaEnergyScraper):
+    """GigaEnergyScraper page parsing with BeautifulSoup 'html.parser'"""
+
+    def parse_listing_page(self, content):
+        soup = BeautifulSoup(content, 'html.parser')
+        product_items = soup.find_all('a', href=lambda x: x and '/shop/' in x if x else False)
+        return [(item.get('href', ''), item.get_text(' ', strip=True)) for item in product_items]
+
+    def parse_product_page(self, content):
+        soup = BeautifulSoup(content, 'html.parser')
+        title_elem = soup.find('title')
+        title = title_elem.text.split('・')[0].strip() if title_elem else 'N/A'
+        price_elem = soup.find('span', class_='shop_price-number')
+        price = 0.0
+        if price_elem:
+            try:
+                price = float(price_elem.get_text(strip=True).replace(',', ''))
+            except ValueError:
+                price = 0.0
+        kva_input = soup.find('input', {'name': 'kva_rating'})
+        kva = 'N/A'
+        if kva_input and kva_input.get('value'):
+            kva = f"{kva_input.get('value')} KVA"
+        else:
+            kva_match = re.search(r'(\d+)\s*kVA', title, re.IGNORECASE)
+            if kva_match:
+                kva = f"{kva_match.group(1)} KVA"
+        primary_voltage, secondary_voltage = self.parse_voltages_from_title(title)
+        img_elem = soup.find('img', src=lambda x: x and 'cdn.prod.website-files.com' in x if x else False)
+        image_url = 'N/A'
+        if img_elem:
+            image_url = img_elem.get('src', 'N/A')
+            if image_url and not image_url.startswith('http'):
+                image_url = f"https:{image_url}" if image_url.startswith('//') else f"{self.base_url}{image_url}"
+        return {
+            'title': title, 'price': price, 'kva': kva,
+            'primary_voltage': primary_voltage, 'secondary_voltage': secondary_voltage,
+            'description': title, 'image_url': image_url
+        }
+
+
+class LegacyEssentialPartsScraper(EssentialPartsScraper):
+    """EssentialPartsScraper page parsing with BeautifulSoup 'html.parser'"""
+
+    def parse_collection_page(self, content, collection_name):
+        soup = BeautifulSoup(content, 'html.parser')
+        product_items = soup.find_all('div', class_=lambda x: x and 'product' in x.lower() if x else False)
+        if not product_items:
+            product_items = soup.find_all('a', href=lambda x: x and '/products/' in x if x else False)
+        if not product_items:
+            return None
+        products = []
+        for item in product_items:
+            product_link = item.find('a', href=lambda x: x and '/products/' in x if x else False)
+            if not product_link and item.name == 'a':
+                product_link = item
+            if not product_link:
+                continue
+            product_url = product_link.get('href', '')
+            if not product_url.startswith('http'):
+                product_url = f"{self.base_url}{product_url}"
+            title_elem = item.find(['h3', 'h2', 'h4'], class_=lambda x: 'title' in x.lower() if x else False)
+            if not title_elem:
+                title_elem = product_link.find(['span', 'div'], class_=lambda x: 'title' in x.lower() if x else False)
+            title = title_elem.get_text(strip=True) if title_elem else product_link.get('title', 'N/A')
+            if title == 'N/A':
+                continue
+            price_elem = item.find(['span', 'div'], class_=lambda x: x and 'price' in x.lower() if x else False)
+            price_text = price_elem.get_text(strip=True) if price_elem else '$0'
+            price_match = re.search(r'\$?([\d,]+\.?\d*)', price_text)
+            price = float(price_match.group(1).replace(',', '')) if price_match else 0.0
+            img_elem = item.find('img')
+            image_url = img_elem.get('src', 'N/A') if img_elem else 'N/A'
+            if image_url and image_url.startswith('//'):
+                image_url = f"https:{image_url}"
+            brand_elem = item.find(['span', 'div'], class_=lambda x: x and ('vendor' in x.lower() or 'brand' in x.lower()) if x else False)
+            brand = brand_elem.get_text(strip=True) if brand_elem else 'N/A'
+            kva = self.extract_kva(title, {'collection': collection_name})
+            wattage = kva if kva != 'N/A' else self.extract_wattage(title)
+            stock_status = 'Unknown'
+            if 'sold' in item.get_text().lower() or 'out of stock' in item.get_text().lower():
+                stock_status = 'Out of Stock'
+            elif 'in stock' in item.get_text().lower():
+                stock_status = 'In Stock'
+            products.append(self.get_standardized_product(
+                product_id='N/A', sku='N/A', title=title, brand=brand, wattage=wattage, efficiency='N/A',
+                price=price, compare_price=0, stock_status=stock_status, inventory_qty='N/A',
+                shipping_cost='Varies', product_url=product_url, image_url=image_url,
+                specs={'product_type': collection_name.rstrip('s').capitalize(), 'collection': collection_name}
+            ))
+        return products
+
+
+class LegacySpecSheetDownloader(SpecSheetDownloader):
+    """find_spec_sheet_links with four BeautifulSoup find_all passes"""
+
+    def find_spec_sheet_links(self, product_url, html_content=None):
+        pdf_links = []
+        soup = BeautifulSoup(html_content, 'html.parser')
+
+        def add(href):
+            full_url = urljoin(product_url, href)
+            if full_url not in pdf_links:
+                pdf_links.append(full_url)
+
+        for link in soup.find_all('a', href=True):
+            if link['href'].lower().endswith('.pdf'):
+                add(link['href'])
+        for link in soup.find_all('a', href=True):
+            if any(keyword in link.get_text().lower() for keyword in self.SPEC_KEYWORDS) and '.pdf' in link['href'].lower():
+                add(link['href'])
+            title = link.get('title', '').lower()
+            if title and any(keyword in title for keyword in self.SPEC_KEYWORDS) and '.pdf' in link['href'].lower():
+                add(link['href'])
+        for iframe in soup.find_all('iframe'):
+            if '.pdf' in iframe.get('src', '').lower():
+                add(iframe.get('src', ''))
+        for element in soup.find_all(['button', 'a'], class_=re.compile(r'download|spec|pdf', re.I)):
+            href = element.get('href') or element.get('data-url') or element.get('data-href')
+            if href and '.pdf' in href.lower():
+                add(href)
+        return pdf_links
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+def without_timestamps(result):
+    """Drop per-call timestamps so results from both implementations compare equal"""
+    if isinstance(result, tuple):
+        return tuple(without_timestamps(item) for item in result)
+    if isinstance(result, list):
+        return [without_timestamps(item) for item in result]
+    if isinstance(result, dict):
+        return {key: value for key, value in result.items() if key != 'last_updated'}
+    return result
+
+
+def parse_cases(pages: dict):
+    """(fixture, legacy parse, lxml parse) for every page type"""
+    ressupply, legacy_ressupply = RessupplyScraper(), LegacyRessupplyScraper()
+    giga, legacy_giga = GigaEnergyScraper(), LegacyGigaEnergyScraper()
+    # Whole-page parsing on both sides; partial parsing is compared separately
+    ressupply.partial_html_parsing = giga.partial_html_parsing = False
+    essential, legacy_essential = EssentialPartsScraper(), LegacyEssentialPartsScraper()
+    specs_dir = os.path.join(os.environ.get('SCRAPER_STATE_DIR', '.scraper_state'), 'benchmark_spec_sheets')
+    downloader, legacy_downloader = SpecSheetDownloader(specs_dir), LegacySpecSheetDownloader(specs_dir)
+    product_url = 'https://shop.example.com/products/panel'
+
+    return [
+        ('ressupply_category.html', legacy_ressupply.parse_category_page, ressupply.parse_category_page),
+        ('giga_listing.html', legacy_giga.parse_listing_page, giga.parse_listing_page),
+        ('giga_product.html', legacy_giga.parse_product_page, giga.parse_product_page),
+        ('essential_parts_collection.html',
+         lambda content: legacy_essential.parse_collection_page(content, 'transformers'),
+         lambda content: essential.parse_collection_page(content, 'transformers')),
+        ('spec_sheet_product.html',
+         lambda content: legacy_downloader.find_spec_sheet_links(product_url, content),
+         lambda content: downloader.find_spec_sheet_links(product_url, content)),
+    ]
+
+
+def partial_cases():
+    """(fixture, {mode: parse}) for the pages with a partial parsing mode"""
+    modes = {}
+    for mode in ('full', 'partial'):
+        ressupply, giga = RessupplyScraper(), GigaEnergyScraper()
+        ressupply.partial_html_parsing = giga.partial_html_parsing = (mode == 'partial')
+        modes[mode] = (ressupply.parse_category_page, giga.parse_product_page)
+    legacy = (LegacyRessupplyScraper().parse_category_page, LegacyGigaEnergyScraper().parse_product_page)
+
+    return [
+        (name, {'html.parser': legacy[i], 'lxml full': modes['full'][i], 'lxml partial': modes['partial'][i]})
+        for i, name in enumerate(['ressupply_category.html', 'giga_product.html'])
+    ]
+
+
+def time_per_page(parse, content, rounds: int, repeats: int = 5) -> float:
+    """Best-of-repeats CPU seconds per parse"""
+    best = None
+    for _ in range(repeats):
+        start = time.process_time()
+        for _ in range(rounds):
+            parse(content)
+        elapsed = (time.process_time() - start) / rounds
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def peak_memory_kb(fixture_dir: str, name: str, mode: str) -> int:
+    """Peak RSS added by parsing one page, measured in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--peak-memory', fixture_dir, name, mode],
+        capture_output=True, text=True, check=True
+    )
+    return int(result.stdout.strip().splitlines()[-1])
+
+
+def _proc_status_kb(field: str) -> Optional[int]:
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(f'{field}:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> int:
+    """Restart peak RSS tracking from the current RSS (Linux); returns the current RSS in KB"""
+    # Hand free heap pages back to the OS, so the page's allocations show up in RSS
+    try:
+        ctypes.CDLL('libc.so.6').malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+    return _proc_status_kb('VmRSS') or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KB"""
+    # VmHWM belongs to the current address space; ru_maxrss also keeps the
+    # high-water mark of the parent process this interpreter was exec'd from
+    return _proc_status_kb('VmHWM') or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def measure_peak_memory(fixture_dir: str, name: str, mode: str):
+    """Child process side of peak_memory_kb"""
+    parse = dict(partial_cases())[name][mode]
+    with open(os.path.join(fixture_dir, name), 'rb') as f:
+        content = f.read()
+
+    # Warm up imports and parser state on a tiny page, so only the page itself is measured
+    parse(b'<html><head><title>x</title></head><body><div class="product-layout"></div></body></html>')
+    baseline = reset_peak_rss()
+    result = parse(content)
+    print(peak_rss_kb() - baseline)
+    return result
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--peak-memory':
+        measure_peak_memory(*sys.argv[2:5])
+        return
+
+    fixture_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        os.environ.get('SCRAPER_STATE_DIR', '.scraper_state'), 'html_fixtures'
+    )
+    pages = load_fixtures(fixture_dir)
+    rounds = 20
+
+    print("\n" + "="*60)
+    print("⏱️  HTML PARSING BENCHMARK (CPU per page)")
+    print("="*60)
+    print(f"  • Fixtures: {fixture_dir}")
+
+    total_legacy = total_lxml = 0.0
+    for name, legacy_parse, lxml_parse in parse_cases(pages):
+        content = pages[name]
+        identical = without_timestamps(legacy_parse(content)) == without_timestamps(lxml_parse(content))
+        legacy_time = time_per_page(legacy_parse, content, rounds)
+        lxml_time = time_per_page(lxml_parse, content, rounds)
+        total_legacy += legacy_time
+        total_lxml += lxml_time
+        print(f"  • {name} ({len(content) / 1024:.0f} KB): html.parser {legacy_time * 1000:.1f}ms, "
+              f"lxml {lxml_time * 1000:.1f}ms ({legacy_time / lxml_time:.1f}x) "
+              f"{'✅ identical' if identical else '❌ results differ'}")
+
+    print(f"  • All pages: html.parser {total_legacy * 1000:.1f}ms, lxml {total_lxml * 1000:.1f}ms "
+          f"({total_legacy / total_lxml:.1f}x)")
+
+    print("\n  Partial parsing (CPU / peak memory per page):")
+    for name, modes in partial_cases():
+        content = pages[name]
+        results = {mode: without_timestamps(parse(content)) for mode, parse in modes.items()}
+        identical = all(result == results['html.parser'] for result in results.values())
+
+        # Modes are timed in alternation, so drift in machine load affects them alike
+        cpu = {mode: None for mode in modes}
+        for _ in range(5):
+            for mode, parse in modes.items():
+                elapsed = time_per_page(parse, content, rounds, repeats=1)
+                cpu[mode] = elapsed if cpu[mode] is None else min(cpu[mode], elapsed)
+
+        stats = [
+            f"{mode} {cpu[mode] * 1000:.2f}ms/{peak_memory_kb(fixture_dir, name, mode)}KB"
+            for mode in modes
+        ]
+        print(f"  • {name}: {', '.join(stats)} {'✅ identical' if identical else '❌ results differ'}")
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
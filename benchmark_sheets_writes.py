@@ -0,0 +1,178 @@
+"""
+Google Sheets Write Benchmark
+Compares the previous per-tab gspread calls against SheetsBatch (batched, then
+batched with parallel values calls) on a local fake Sheets backend that adds
+network latency per call and per cell and enforces a per-minute write quota
+
+Usage: python benchmark_sheets_writes.py [distributors] [products_per_distributor]
+       (default: 10 2000)
+"""
+
+import json
+import sys
+import threading
+import time
+from collections import deque
+
+import requests
+from gspread.exceptions import APIError
+
+from rate_limiter import TokenBucket
+from sheets_batch import SheetsBatch, quota_bucket
+
+
+# Simulated API behaviour (one "minute" is shortened so the quota is reached quickly)
+ROUND_TRIP = 0.05
+SECONDS_PER_CELL = 1e-6
+QUOTA_WINDOW = 3.0
+WRITE_QUOTA = 60
+
+COLUMNS = 24
+
+
+class FakeSpreadsheet:
+    """Local stand-in for the gspread Spreadsheet methods used by SheetsBatch"""
+
+    def __init__(self, titles):
+        self.sheets = {
+            title: {'sheetId': index, 'title': title, 'gridProperties': {'rowCount': 1000, 'columnCount': 26}}
+            for index, title in enumerate(titles)
+        }
+        self.writes = deque()
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.rejected = 0
+
+    def respond(self, cells: int = 0, write: bool = True):
+        """Simulate one request: enforce the write quota, then wait out the latency"""
+        with self.lock:
+            self.calls += 1
+            if write:
+                now = time.monotonic()
+                while self.writes and now - self.writes[0] > QUOTA_WINDOW:
+                    self.writes.popleft()
+                if len(self.writes) >= WRITE_QUOTA:
+                    self.rejected += 1
+                    raise APIError(quota_exceeded_response())
+                self.writes.append(now)
+        time.sleep(ROUND_TRIP + cells * SECONDS_PER_CELL)
+
+    def fetch_sheet_metadata(self, params=None):
+        self.respond(write=False)
+        return {'sheets': [{'properties': properties} for properties in self.sheets.values()]}
+
+    def values_batch_update(self, body):
+        self.respond(sum(len(row) for value_range in body['data'] for row in value_range['values']))
+        return {}
+
+    def batch_update(self, body):
+        self.respond()
+        return {'replies': []}
+
+
+def quota_exceeded_response() -> requests.Response:
+    """HTTP 429 response as returned by the Sheets API"""
+    response = requests.Response()
+    response.status_code = 429
+    response._content = json.dumps({
+        'error': {'code': 429, 'message': 'Quota exceeded for quota metric Write requests',
+                  'status': 'RESOURCE_EXHAUSTED'}
+    }).encode('utf-8')
+    return response
+
+
+def build_tabs(distributors: int, products: int):
+    """Tab title -> rows (header plus one row per product)"""
+    tabs = {}
+    for distributor in range(distributors):
+        rows = [[f"Column {column}" for column in range(COLUMNS)]]
+        for product in range(products):
+            rows.append([f"D{distributor} P{product} C{column}" for column in range(COLUMNS)])
+        tabs[f"Distributor {distributor}"] = rows
+    tabs["🏆 Best Prices"] = [row[:14] for row in tabs["Distributor 0"]]
+    tabs["📈 Summary"] = [['Distributor', 'Total']] + [[title, products] for title in tabs]
+    return tabs
+
+
+def legacy_write(spreadsheet: FakeSpreadsheet, tabs) -> int:
+    """
+    Previous implementation: worksheet(), clear, update, format, freeze and
+    auto-resize per tab, one after another, without backoff
+
+    Returns:
+        Number of tabs that failed
+    """
+    failed = 0
+    for title, rows in tabs.items():
+        try:
+            spreadsheet.fetch_sheet_metadata()
+            spreadsheet.values_batch_update({'data': []})
+            spreadsheet.values_batch_update({'data': [{'values': rows}]})
+            spreadsheet.batch_update({})
+            spreadsheet.batch_update({})
+            spreadsheet.batch_update({})
+        except APIError:
+            failed += 1
+    return failed
+
+
+def batched_write(spreadsheet: FakeSpreadsheet, tabs, workers: int, max_cells: int,
+                  paced: bool = True) -> int:
+    """
+    SheetsBatch with a quota-sized token bucket (or none when not paced)
+
+    Returns:
+        Number of tabs that failed
+    """
+    bucket = quota_bucket(WRITE_QUOTA, QUOTA_WINDOW) if paced else TokenBucket(0)
+    batch = SheetsBatch(spreadsheet, bucket=bucket)
+    batch.write_workers = workers
+    batch.max_cells_per_call = max_cells
+    for title, rows in tabs.items():
+        batch.write_tab(title, rows, formats={'A1:X1': {'textFormat': {'bold': True}}},
+                        frozen_rows=1, auto_resize=True)
+    batch.flush()
+    return 0
+
+
+def main():
+    distributors = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    products = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    tabs = build_tabs(distributors, products)
+    tab_cells = (products + 1) * COLUMNS
+
+    modes = [
+        ('Per-tab calls (previous)', lambda spreadsheet: legacy_write(spreadsheet, tabs)),
+        ('Batched, one values call', lambda spreadsheet: batched_write(spreadsheet, tabs, 1, 10 ** 9)),
+        ('Batched, parallel values calls',
+         lambda spreadsheet: batched_write(spreadsheet, tabs, 4, tab_cells)),
+        # Far more calls than the quota: paced by the token bucket vs left to 429 backoff
+        ('Parallel small calls, token bucket',
+         lambda spreadsheet: batched_write(spreadsheet, tabs, 8, tab_cells // 8)),
+        ('Parallel small calls, backoff only',
+         lambda spreadsheet: batched_write(spreadsheet, tabs, 8, tab_cells // 8, paced=False)),
+    ]
+
+    print("\n" + "="*60)
+    print("⏱️  GOOGLE SHEETS WRITE BENCHMARK")
+    print("="*60)
+    print(f"{len(tabs)} tabs, {products:,} products per distributor tab, "
+          f"quota {WRITE_QUOTA} writes per {QUOTA_WINDOW:.0f}s")
+
+    for name, write in modes:
+        spreadsheet = FakeSpreadsheet(tabs)
+        start = time.perf_counter()
+        failed = write(spreadsheet)
+        elapsed = time.perf_counter() - start
+
+        print(f"\n📊 {name}")
+        print(f"  • Time: {elapsed:.2f}s")
+        print(f"  • API calls: {spreadsheet.calls}")
+        print(f"  • 429 responses: {spreadsheet.rejected}")
+        print(f"  • Failed tabs: {failed}")
+
+    print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
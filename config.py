@@ -11,6 +11,8 @@ class Config:
 
     # Google Sheets
     GOOGLE_SHEET_NAME = os.environ.get('GOOGLE_SHEET_NAME', 'Solar Inventory Tracker')
+    # Send only the rows changed since the last run (snapshot kept in the scraper state directory)
+    SHEETS_DIFF_SYNC = os.environ.get('SHEETS_DIFF_SYNC', 'true').lower() == 'true'
 
     # Scraping Settings
     SCRAPE_INTERVAL_HOURS = int(os.environ.get('SCRAPE_INTERVAL_HOURS', '6'))
@@ -19,6 +21,10 @@ class Config:
         'DISTRIBUTORS_TO_SCRAPE',
         'solar_cellz,alte,ressupply,us_solar_supplier,solar_store,giga_energy,soligent'
     ).split(',')
+    # Number of distributors scraped at the same time (1 = sequential)
+    MAX_CONCURRENT_SCRAPERS = int(os.environ.get('MAX_CONCURRENT_SCRAPERS', '4'))
+    # Products processed per batch by downstream stages (price tracking, ...)
+    PIPELINE_BATCH_SIZE = int(os.environ.get('PIPELINE_BATCH_SIZE', '500'))
 
     # Alert Settings
     PRICE_DROP_THRESHOLD = float(os.environ.get('PRICE_DROP_THRESHOLD', '10.0'))  # Percent
@@ -35,6 +41,7 @@ class Config:
     ALERT_TO_EMAIL = os.environ.get('ALERT_TO_EMAIL', '')
 
     # Price History
+    # Use a .db/.sqlite path to store history in SQLite instead of a JSON file
     PRICE_HISTORY_FILE = os.environ.get('PRICE_HISTORY_FILE', 'price_history.json')
     KEEP_HISTORY_DAYS = int(os.environ.get('KEEP_HISTORY_DAYS', '90'))
 
@@ -65,6 +72,7 @@ class Config:
         print(f"Google Sheet: {cls.GOOGLE_SHEET_NAME}")
         print(f"Scrape Interval: Every {cls.SCRAPE_INTERVAL_HOURS} hours")
         print(f"Distributors: {', '.join(cls.DISTRIBUTORS_TO_SCRAPE)}")
+        print(f"Concurrent Scrapers: {cls.MAX_CONCURRENT_SCRAPERS}")
         print(f"\nAlerts:")
         print(f"  • Price Drop Threshold: {cls.PRICE_DROP_THRESHOLD}%")
         print(f"  • New Product Alerts: {'✅' if cls.SEND_NEW_PRODUCT_ALERTS else '❌'}")
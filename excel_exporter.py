@@ -4,7 +4,8 @@ Creates separate sheets for each equipment category with formatting
 """
 
 import pandas as pd
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from datetime import datetime
@@ -12,9 +13,27 @@ from typing import List, Dict, Optional
 import os
 
 
+# Sheet styles
+HEADER_FILL = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center', wrap_text=True)
+TOTAL_ROW_FILL = PatternFill(start_color="FFD966", end_color="FFD966", fill_type="solid")
+TOTAL_ROW_FONT = Font(bold=True, size=11)
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+
 class ExcelExporter:
     """Export data to organized Excel workbook with separate sheets by category"""
 
+    # Write each sheet once with openpyxl's write-only mode, styles and widths included,
+    # instead of writing with pandas and then reloading the workbook to format it
+    streaming = os.environ.get('EXCEL_STREAMING_EXPORT', 'true').lower() == 'true'
+
     # Define categories and their order
     CATEGORIES = [
         'Solar Panel',
@@ -28,19 +47,24 @@ class ExcelExporter:
         'Other'
     ]
 
-    def __init__(self, output_filename: Optional[str] = None):
+    def __init__(self, output_filename: Optional[str] = None, streaming: Optional[bool] = None):
         """
         Initialize Excel exporter
 
         Args:
             output_filename: Output filename (will be auto-generated if not provided)
+            streaming: Single-pass write-only export (defaults to the streaming class setting)
         """
+        if streaming is not None:
+            self.streaming = streaming
+
         if output_filename is None:
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             output_filename = f'solar_equipment_database_{timestamp}.xlsx'
 
         self.output_filename = output_filename
         self.writer = None
+        self.sheet_widths = {}
 
     def _sanitize_sheet_name(self, name: str) -> str:
         """
@@ -85,28 +109,35 @@ class ExcelExporter:
             return
 
         # Create Excel writer
-        self.writer = pd.ExcelWriter(self.output_filename, engine='openpyxl')
+        self._open_writer()
 
         # Track statistics for summary
         category_stats = {}
 
+        # Prepare all products once: the category and domestic sheets are row subsets
+        # of the same export rows, and every cell is measured once for column widths
+        export_df = self._blank_missing(self._prepare_export_dataframe(products_df))
+        lengths = self._value_lengths(export_df)
+        categories = products_df['category'].to_numpy()
+        category_lengths = lengths.groupby(categories).max()
+
         # Create sheet for each category
         for category in self.CATEGORIES:
-            category_df = products_df[products_df['category'] == category].copy()
+            in_category = categories == category
 
-            if category_df.empty:
+            if not in_category.any():
                 continue
 
-            print(f"  Creating sheet: {category} ({len(category_df)} products)")
+            category_df = products_df[in_category]
 
-            # Prepare dataframe for export
-            export_df = self._prepare_export_dataframe(category_df)
+            print(f"  Creating sheet: {category} ({len(category_df)} products)")
 
             # Create sheet name (sanitize and limit length)
             sheet_name = self._sanitize_sheet_name(category)
 
             # Write to sheet
-            export_df.to_excel(self.writer, sheet_name=sheet_name, index=False)
+            widths = self._column_widths(export_df.columns, category_lengths.loc[category])
+            self._write_sheet(export_df[in_category], sheet_name, widths)
 
             # Collect statistics
             category_stats[category] = self._calculate_category_stats(category_df)
@@ -118,25 +149,113 @@ class ExcelExporter:
 
         # Create domestic content only sheet
         if include_domestic_only and 'domestic_content_qualified' in products_df.columns:
-            domestic_df = products_df[products_df['domestic_content_qualified'] == True].copy()
-            if not domestic_df.empty:
-                print(f"  Creating sheet: Domestic Content ({len(domestic_df)} products)")
-                export_df = self._prepare_export_dataframe(domestic_df)
-                export_df.to_excel(self.writer, sheet_name='Domestic Content', index=False)
+            domestic = (products_df['domestic_content_qualified'] == True).to_numpy()
+            if domestic.any():
+                print(f"  Creating sheet: Domestic Content ({domestic.sum()} products)")
+                widths = self._column_widths(export_df.columns, lengths[domestic].max())
+                self._write_sheet(export_df[domestic], 'Domestic Content', widths)
 
         # Create "All Products" sheet
         print(f"  Creating sheet: All Products ({len(products_df)} products)")
-        export_df = self._prepare_export_dataframe(products_df)
-        export_df.to_excel(self.writer, sheet_name='All Products', index=False)
+        self._write_sheet(export_df, 'All Products', self._column_widths(export_df.columns, lengths.max()))
 
-        # Save workbook
-        self.writer.close()
-
-        # Apply formatting
-        self._apply_formatting()
+        # Save workbook (formatted)
+        self._close_writer()
 
         print(f"\n✅ Excel export complete: {self.output_filename}")
 
+    def _open_writer(self):
+        """Start a workbook: write-only openpyxl workbook when streaming, pandas writer otherwise"""
+        if self.streaming:
+            self.writer = Workbook(write_only=True)
+        else:
+            self.writer = pd.ExcelWriter(self.output_filename, engine='openpyxl')
+
+    def _write_sheet(self, values: pd.DataFrame, sheet_name: str, widths: Optional[List[int]] = None):
+        """
+        Write a dataframe to a new sheet of the open workbook
+
+        Args:
+            values: Export dataframe with blank cells as None (see _blank_missing)
+            sheet_name: Sheet name
+            widths: Column widths (measured from values when not given)
+        """
+        if widths is None:
+            widths = self._column_widths(values.columns, self._value_lengths(values).max())
+        self.sheet_widths[sheet_name] = widths
+
+        if self.streaming:
+            self._stream_sheet(values, sheet_name, widths)
+        else:
+            values.to_excel(self.writer, sheet_name=sheet_name, index=False)
+
+    def _close_writer(self):
+        """Save the workbook, formatting it afterwards unless it was streamed formatted"""
+        if self.streaming:
+            self.writer.save(self.output_filename)
+        else:
+            self.writer.close()
+            self._apply_formatting()
+        self.writer = None
+
+    def _stream_sheet(self, values: pd.DataFrame, sheet_name: str, widths: List[int]):
+        """
+        Write a formatted sheet in one pass (write-only mode)
+
+        Column widths and frozen panes are set before the rows, which are appended
+        one at a time and never kept by the workbook.
+        """
+        ws = self.writer.create_sheet(sheet_name)
+
+        for index, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+        ws.freeze_panes = 'A2'
+
+        ws.append([
+            self._styled_cell(ws, label, font=HEADER_FONT, fill=HEADER_FILL,
+                              alignment=HEADER_ALIGNMENT, border=THIN_BORDER)
+            for label in values.columns
+        ])
+
+        for row in values.itertuples(index=False, name=None):
+            if sheet_name == 'Summary' and row and row[0] == 'TOTAL':
+                row = [self._styled_cell(ws, value, font=TOTAL_ROW_FONT, fill=TOTAL_ROW_FILL) for value in row]
+            ws.append(row)
+
+    @staticmethod
+    def _styled_cell(ws, value, **styles) -> WriteOnlyCell:
+        """Cell carrying its own styles, for write-only sheets"""
+        cell = WriteOnlyCell(ws, value=value)
+        for name, style in styles.items():
+            setattr(cell, name, style)
+        return cell
+
+    @staticmethod
+    def _blank_missing(export_df: pd.DataFrame) -> pd.DataFrame:
+        """Export dataframe with missing values as None, written as empty cells like pandas does"""
+        return export_df.astype(object).where(export_df.notna(), None)
+
+    @staticmethod
+    def _value_lengths(values: pd.DataFrame) -> pd.DataFrame:
+        """Displayed length of every cell, column by column (0 for empty and false values)"""
+        return pd.DataFrame({
+            label: values[label].astype(str).str.len().where(values[label].astype(bool), 0)
+            for label in values.columns
+        }, index=values.index)
+
+    @staticmethod
+    def _column_widths(columns, longest: pd.Series) -> List[int]:
+        """
+        Width of each column: longest value or header plus padding, between 10 and 50
+
+        Args:
+            columns: Column labels
+            longest: Longest value length per column label (see _value_lengths)
+        """
+        header = pd.Series([len(str(label)) if label else 0 for label in columns], index=columns)
+        longest = longest.reindex(columns).fillna(0)
+        return (longest.where(longest > header, header) + 2).clip(10, 50).astype(int).tolist()
+
     def _prepare_export_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Prepare dataframe for export by reordering and formatting columns
@@ -161,6 +280,8 @@ class ExcelExporter:
             ('stock_status', 'Stock Status'),
             ('inventory_qty', 'Inventory Qty'),
             ('product_url', 'Product URL'),
+            ('avl_manufacturer', 'AVL Manufacturer'),
+            ('manufacturer_match_confidence', 'Manufacturer Match Confidence'),
             ('thrive_approved', 'THRIVE Approved'),
             ('thrive_domestic', 'THRIVE Domestic'),
             ('goodleap_approved', 'GOODLEAP Approved'),
@@ -287,7 +408,7 @@ class ExcelExporter:
         })
 
         summary_df = pd.DataFrame(summary_data)
-        summary_df.to_excel(self.writer, sheet_name='Summary', index=False)
+        self._write_sheet(self._blank_missing(summary_df), 'Summary')
 
     def _apply_formatting(self):
         """Apply formatting to all sheets in the workbook"""
@@ -296,55 +417,28 @@ class ExcelExporter:
         # Load workbook
         wb = load_workbook(self.output_filename)
 
-        # Define styles
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-
-        total_row_fill = PatternFill(start_color="FFD966", end_color="FFD966", fill_type="solid")
-        total_row_font = Font(bold=True, size=11)
-
-        border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
-
         # Format each sheet
         for sheet_name in wb.sheetnames:
             ws = wb[sheet_name]
 
             # Format header row
             for cell in ws[1]:
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = header_alignment
-                cell.border = border
-
-            # Auto-adjust column widths
-            for column in ws.columns:
-                max_length = 0
-                column_letter = get_column_letter(column[0].column)
-
-                for cell in column:
-                    try:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    except:
-                        pass
-
-                # Set width with min and max limits
-                adjusted_width = min(max(max_length + 2, 10), 50)
-                ws.column_dimensions[column_letter].width = adjusted_width
+                cell.fill = HEADER_FILL
+                cell.font = HEADER_FONT
+                cell.alignment = HEADER_ALIGNMENT
+                cell.border = THIN_BORDER
+
+            # Column widths measured from the dataframes when the sheets were written
+            for index, width in enumerate(self.sheet_widths.get(sheet_name, []), 1):
+                ws.column_dimensions[get_column_letter(index)].width = width
 
             # Format Summary sheet TOTAL row
             if sheet_name == 'Summary':
                 for row in ws.iter_rows(min_row=2):
                     if row[0].value == 'TOTAL':
                         for cell in row:
-                            cell.fill = total_row_fill
-                            cell.font = total_row_font
+                            cell.fill = TOTAL_ROW_FILL
+                            cell.font = TOTAL_ROW_FONT
 
             # Freeze header row
             ws.freeze_panes = 'A2'
@@ -363,14 +457,12 @@ class ExcelExporter:
         print(f"\n📊 Exporting to Excel: {self.output_filename}")
 
         # Prepare dataframe
-        export_df = self._prepare_export_dataframe(products_df)
-
-        # Create Excel writer and save
-        with pd.ExcelWriter(self.output_filename, engine='openpyxl') as writer:
-            export_df.to_excel(writer, sheet_name=sheet_name, index=False)
+        export_df = self._blank_missing(self._prepare_export_dataframe(products_df))
 
-        # Apply formatting
-        self._apply_formatting()
+        # Write and save (formatted)
+        self._open_writer()
+        self._write_sheet(export_df, sheet_name)
+        self._close_writer()
 
         print(f"✅ Excel export complete: {self.output_filename}")
 
@@ -0,0 +1,202 @@
+"""
+Field Extractor
+Precompiled, memoized extraction of wattage, KVA, efficiency, quantity and category
+from product titles (and the few spec fields that override them)
+"""
+
+import os
+import re
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+# Distinct (title, specs-signature) pairs remembered; variants and repeated
+# collections re-use the same titles, so hits are the common case
+EXTRACTION_CACHE_SIZE = int(os.environ.get('EXTRACTION_CACHE_SIZE', '16384'))
+
+_DIGIT = re.compile(r'\d')
+
+WATTAGE_PATTERN = re.compile(r'(\d+)\s*[Ww](?:att)?')
+KVA_PATTERN = re.compile(r'(\d+)\s*[Kk][Vv][Aa]')
+EFFICIENCY_PATTERN = re.compile(r'(\d+\.?\d*)\s*%?\s*[Ee]ff')
+
+# Quantity patterns, most reliable first
+QUANTITY_PATTERNS = [
+    # "pallet of X" or "case of X" or "pack of X"
+    re.compile(r'(?:pallet|case|pack|box|bundle|lot|set)\s+of\s+(\d+)', re.IGNORECASE),
+    # "X pack" or "X-pack" (e.g., "10 pack", "5-pack")
+    re.compile(r'\b(\d+)[-\s]?pack\b', re.IGNORECASE),
+    # "quantity: X" or "qty: X"
+    re.compile(r'(?:quantity|qty)[:\s]+(\d+)', re.IGNORECASE),
+    # "X units" or "X pieces" or "X pcs"
+    re.compile(r'\b(\d+)\s+(?:units|pcs|pieces)\b', re.IGNORECASE),
+]
+# "(X) panels/inverters/batteries" - only if followed by product type
+QUANTITY_PRODUCT_PATTERN = re.compile(
+    r'\((\d+)\)\s+(?:solar\s+)?(?:panels?|inverters?|batteries|modules?|controllers?)', re.IGNORECASE
+)
+
+# Category checks against a product_type / collection name, in priority order
+PRODUCT_TYPE_CATEGORIES = [
+    (('transformer',), 'Transformer'),
+    (('switch',), 'Switch'),
+    (('panel', 'module'), 'Solar Panel'),
+    (('inverter',), 'Inverter'),
+    (('battery', 'storage'), 'Battery/Storage'),
+    (('charge', 'controller'), 'Charge Controller'),
+    (('rack', 'mount'), 'Racking/Mounting'),
+]
+COLLECTION_CATEGORIES = [
+    (('transformer',), 'Transformer'),
+    (('switch',), 'Switch'),
+    (('panel',), 'Solar Panel'),
+    (('inverter',), 'Inverter'),
+    (('batter', 'storage'), 'Battery/Storage'),
+    (('charge', 'controller'), 'Charge Controller'),
+    (('rack', 'mount'), 'Racking/Mounting'),
+]
+
+# Category patterns for the lower-cased title, in priority order
+TITLE_CATEGORY_PATTERNS = [
+    (re.compile(r'\btransformer|padmount|pad-mount|kva\b'), 'Transformer'),
+    (re.compile(r'\bswitch(?:es)?|disconnect|circuit\s+breaker|switchgear\b'), 'Switch'),
+    (re.compile(r'\b(?:solar\s+)?panel|module|pv\s+panel\b'), 'Solar Panel'),
+    (re.compile(r'\binverter|micro[-\s]?inverter|grid[-\s]?tie|off[-\s]?grid\b'), 'Inverter'),
+    (re.compile(r'\bbattery|batteries|storage|energy\s+storage|lithium|lifepo4\b'), 'Battery/Storage'),
+    (re.compile(r'\bcharge\s+controller|mppt|pwm\s+controller\b'), 'Charge Controller'),
+    (re.compile(r'\bracking|mounting|rail|bracket|clamp|flashings?\b'), 'Racking/Mounting'),
+    (re.compile(r'\bcombiner|fuse|wire|cable|conduit\b'), 'BOS/Electrical'),
+]
+
+_MISSING = object()
+_NO_SPECS = (None, _MISSING, None, None)
+
+
+class ProductFields(NamedTuple):
+    """Fields derived from a product title and its specs"""
+    wattage: str
+    kva: str
+    efficiency: object
+    quantity: int
+    category: str
+
+
+def specs_signature(specs: Optional[Dict]) -> Tuple:
+    """The spec values that influence extraction, as a hashable cache key"""
+    if not specs:
+        return ()
+    signature = (
+        specs.get('kva'),
+        specs.get('efficiency', _MISSING),
+        specs.get('product_type'),
+        specs.get('collection'),
+    )
+    return () if signature == _NO_SPECS else signature
+
+
+def _match_keywords(text: str, rules) -> Optional[str]:
+    text = text.lower()
+    for keywords, category in rules:
+        if any(keyword in text for keyword in keywords):
+            return category
+    return None
+
+
+def _quantity(title: str) -> int:
+    for pattern in QUANTITY_PATTERNS:
+        match = pattern.search(title)
+        if match:
+            return int(match.group(1))
+
+    match = QUANTITY_PRODUCT_PATTERN.search(title)
+    if match:
+        qty = int(match.group(1))
+        # Sanity check: reasonable bulk quantities are typically 2-100
+        if 2 <= qty <= 100:
+            return qty
+
+    # Default: single unit
+    return 1
+
+
+def _category(title: str, product_type, collection) -> str:
+    # Check specs first if available
+    if product_type:
+        category = _match_keywords(product_type, PRODUCT_TYPE_CATEGORIES)
+        if category:
+            return category
+
+    # Check collection if available
+    if collection:
+        category = _match_keywords(collection, COLLECTION_CATEGORIES)
+        if category:
+            return category
+
+    # Fallback to title analysis
+    title_lower = title.lower()
+    for pattern, category in TITLE_CATEGORY_PATTERNS:
+        if pattern.search(title_lower):
+            return category
+
+    return 'Other'
+
+
+def _extract(title: str, signature: Tuple) -> ProductFields:
+    kva_spec, efficiency_spec, product_type, collection = signature or _NO_SPECS
+
+    # Every numeric field needs a digit; skip their patterns for titles without one
+    has_digit = _DIGIT.search(title) is not None
+
+    match = WATTAGE_PATTERN.search(title) if has_digit else None
+    wattage = f"{match.group(1)}W" if match else 'N/A'
+
+    if kva_spec:
+        kva = str(kva_spec)
+    else:
+        match = KVA_PATTERN.search(title) if has_digit else None
+        kva = f"{match.group(1)} KVA" if match else 'N/A'
+
+    match = EFFICIENCY_PATTERN.search(title) if has_digit else None
+    if match:
+        efficiency = f"{match.group(1)}%"
+    elif efficiency_spec is not _MISSING:
+        efficiency = efficiency_spec
+    else:
+        efficiency = 'N/A'
+
+    quantity = _quantity(title) if has_digit else 1
+
+    return ProductFields(wattage, kva, efficiency, quantity, _category(title, product_type, collection))
+
+
+_extract_cached = lru_cache(maxsize=EXTRACTION_CACHE_SIZE)(_extract)
+
+
+def extract_fields(title: str, specs: Optional[Dict] = None) -> ProductFields:
+    """
+    Extract all title-derived fields in one call, memoized on (title, specs signature)
+
+    Args:
+        title: Product title
+        specs: Product specs (only 'kva', 'efficiency', 'product_type' and
+               'collection' affect the result)
+
+    Returns:
+        ProductFields(wattage, kva, efficiency, quantity, category)
+    """
+    signature = specs_signature(specs)
+    try:
+        return _extract_cached(title, signature)
+    except TypeError:
+        # Unhashable spec values: extract without caching
+        return _extract(title, signature)
+
+
+def extraction_cache_info():
+    """Hit/miss statistics of the extraction cache"""
+    return _extract_cached.cache_info()
+
+
+def clear_extraction_cache():
+    """Drop all memoized extractions"""
+    _extract_cached.cache_clear()
@@ -0,0 +1,156 @@
+"""
+HTML Parsing
+Shared lxml parsing layer for the HTML scrapers: full and partial (section)
+document parsing, XPath class predicates and BeautifulSoup-compatible text helpers
+"""
+
+from typing import Iterable, Optional, Tuple, Union
+
+import lxml.html
+from lxml import etree
+
+
+_UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_LOWER = 'abcdefghijklmnopqrstuvwxyz'
+
+# Reused parsers (libxml2 parsers are cheap to reuse, not to build)
+_UTF8_PARSER = lxml.html.HTMLParser(encoding='utf-8')
+_DETECT_PARSER = lxml.html.HTMLParser()
+
+# Bytes kept past the last element of interest when parsing part of a page, so
+# that element (and its text) is complete
+SECTION_MARGIN = 2048
+
+# Elements whose content is not page text (BeautifulSoup get_text() leaves them out too)
+NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+
+
+def _page_bytes(content: Union[bytes, str]):
+    """Page content as bytes plus the encoding to parse it with (None = detect)"""
+    if isinstance(content, str):
+        return content.encode('utf-8'), 'utf-8'
+    # Like BeautifulSoup, prefer UTF-8; otherwise let libxml2 use the page's declared charset
+    try:
+        content.decode('utf-8')
+        return content, 'utf-8'
+    except UnicodeDecodeError:
+        return content, None
+
+
+def parse_html(content: Union[bytes, str]) -> lxml.html.HtmlElement:
+    """
+    Parse an HTML page with lxml
+
+    Args:
+        content: Page content (response.content bytes or decoded text)
+
+    Returns:
+        Root <html> element (an empty document if the content has no markup)
+    """
+    return _parse(*_page_bytes(content))
+
+
+def _parse(content: bytes, encoding: Optional[str]) -> lxml.html.HtmlElement:
+    parser = _UTF8_PARSER if encoding else _DETECT_PARSER
+    try:
+        return lxml.html.document_fromstring(content, parser=parser)
+    except etree.ParserError:
+        # Empty or whitespace-only document
+        return lxml.html.document_fromstring(b'<html></html>', parser=_UTF8_PARSER)
+
+
+def parse_html_section(content: Union[bytes, str], start_at: Optional[bytes] = None,
+                       until: Iterable[bytes] = ()) -> Tuple[Optional[lxml.html.HtmlElement], bool]:
+    """
+    Parse only the part of a page holding the elements a scraper reads
+
+    The section is located with byte searches before parsing, so the skipped head,
+    menus and footers are never tokenized or materialized.
+
+    Args:
+        content: Page content (bytes or text)
+        start_at: Bytes found in the first element of interest (e.g. b'product-layout');
+                  parsing starts at the tag holding their first occurrence
+        until: Bytes found in each of the last elements of interest; parsing stops
+               shortly after the first occurrence of all of them (the whole rest of
+               the page is parsed if any of them does not occur)
+
+    Returns:
+        (root element, whole page parsed); the root is None when start_at does not occur
+    """
+    content, encoding = _page_bytes(content)
+    start, end = 0, len(content)
+
+    # Seek only when the encoding is known: a skipped <meta charset> would otherwise be lost
+    if start_at and encoding:
+        position = content.find(start_at)
+        if position < 0:
+            return None, False
+        start = max(content.rfind(b'<', 0, position), 0)
+
+    positions = [content.find(marker, start) for marker in until]
+    if positions and min(positions) >= 0:
+        # Cut at a tag boundary, which is also a character boundary
+        cut = content.find(b'<', max(positions) + SECTION_MARGIN)
+        if cut >= 0:
+            end = cut
+
+    whole_page = start == 0 and end == len(content)
+    return _parse(content if whole_page else content[start:end], encoding), whole_page
+
+
+def has_class(name: str) -> str:
+    """XPath predicate: the element's class list contains exactly `name` (like soup.find(class_=name))"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def class_contains(*words: str) -> str:
+    """XPath predicate: the class attribute contains any of `words`, case-insensitively"""
+    lowered = f"translate(@class, '{_UPPER}', '{_LOWER}')"
+    return ' or '.join(f"contains({lowered}, '{word.lower()}')" for word in words)
+
+
+def xpath(expression: str) -> etree.XPath:
+    """Compile an XPath expression once for repeated evaluation"""
+    return etree.XPath(expression)
+
+
+def first(element, query: etree.XPath):
+    """First result of a compiled XPath query, or None"""
+    if element is None:
+        return None
+    results = query(element)
+    return results[0] if results else None
+
+
+def get_text(element, separator: str = '', strip: bool = False) -> str:
+    """
+    Text content of an element, with BeautifulSoup get_text() semantics
+
+    Script, style and template contents and comments are left out.
+
+    Args:
+        element: lxml element (None gives '')
+        separator: String placed between text fragments
+        strip: Strip each fragment and drop empty ones
+    """
+    if element is None:
+        return ''
+    fragments = _text_fragments(element)
+    if strip:
+        fragments = (fragment.strip() for fragment in fragments)
+        fragments = [fragment for fragment in fragments if fragment]
+    return separator.join(fragments)
+
+
+
+def _text_fragments(element) -> Iterable[str]:
+    """Text nodes under an element in document order, skipping non-text elements and comments"""
+    if element.text and isinstance(element.tag, str):
+        yield element.text
+    for child in element:
+        # Comments and processing instructions have a non-string tag
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            yield from _text_fragments(child)
+        if child.tail:
+            yield child.tail
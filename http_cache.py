@@ -0,0 +1,188 @@
+"""
+HTTP Cache
+On-disk conditional request cache (ETag / Last-Modified) shared by all scrapers
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class HTTPCache:
+    """
+    Stores response bodies with their validators and revalidates them with
+    If-None-Match / If-Modified-Since. A 304 response reuses the stored body.
+    """
+
+    def __init__(self, directory: str = '.scraper_state/http_cache', max_size_mb: float = 256):
+        """
+        Initialize HTTP cache
+
+        Args:
+            directory: Directory holding cached bodies and metadata
+            max_size_mb: Size limit; least recently used entries are evicted beyond it
+        """
+        self.directory = directory
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def cache_key(self, url: str, params: Optional[Dict] = None) -> str:
+        """Build a cache key from the full request URL (including query parameters)"""
+        full_url = requests.Request('GET', url, params=params).prepare().url
+        return hashlib.sha256(full_url.encode('utf-8')).hexdigest()
+
+    def _paths(self, key: str):
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.body"
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """Validator headers for a cached entry (empty if nothing is cached)"""
+        meta = self._load_meta(key)
+        if not meta:
+            return {}
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def handle_response(self, key: str, response: requests.Response) -> requests.Response:
+        """
+        Resolve a response against the cache
+
+        A 304 is replaced by the cached body; a 200 carrying validators is stored.
+
+        Returns:
+            The response to hand back to the caller
+        """
+        if response.status_code == 304:
+            cached = self._load_response(key, response)
+            if cached is not None:
+                with self.lock:
+                    self.hits += 1
+                return cached
+
+        with self.lock:
+            self.misses += 1
+
+        if response.status_code == 200:
+            self._store(key, response)
+        return response
+
+    def _load_meta(self, key: str) -> Optional[Dict]:
+        meta_path, body_path = self._paths(key)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _load_response(self, key: str, not_modified: requests.Response) -> Optional[requests.Response]:
+        """Rebuild a 200 response from the cached entry"""
+        meta = self._load_meta(key)
+        if not meta:
+            return None
+
+        meta_path, body_path = self._paths(key)
+        try:
+            with open(body_path, 'rb') as f:
+                body = f.read()
+            # Touch the entry so eviction treats it as recently used
+            os.utime(meta_path, None)
+        except OSError:
+            return None
+
+        cached = requests.Response()
+        cached.status_code = 200
+        cached._content = body
+        cached.headers = CaseInsensitiveDict(meta.get('headers', {}))
+        cached.encoding = meta.get('encoding')
+        cached.url = not_modified.url
+        cached.request = not_modified.request
+        cached.reason = 'OK (cached)'
+        return cached
+
+    def _store(self, key: str, response: requests.Response):
+        """Store a response body if it carries validators"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        meta_path, body_path = self._paths(key)
+        meta = {
+            'url': response.url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'encoding': response.encoding,
+            'headers': {
+                name: value for name, value in response.headers.items()
+                if name.lower() in ('content-type', 'etag', 'last-modified')
+            }
+        }
+
+        try:
+            os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+            # Write body first, then metadata: an entry only counts once both exist
+            for path, mode, data in ((body_path, 'wb', response.content),
+                                     (meta_path, 'w', json.dumps(meta))):
+                tmp_path = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, mode) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Error writing HTTP cache entry: {e}")
+
+    def prune(self) -> int:
+        """
+        Evict least recently used entries until the cache fits within its size limit
+
+        Returns:
+            Number of entries evicted
+        """
+        if not os.path.isdir(self.directory):
+            return 0
+
+        entries = []
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                meta_path = os.path.join(root, name)
+                body_path = meta_path[:-len('.json')] + '.body'
+                try:
+                    size = os.path.getsize(meta_path) + os.path.getsize(body_path)
+                    entries.append((os.path.getmtime(meta_path), size, meta_path, body_path))
+                    total += size
+                except OSError:
+                    continue
+
+        evicted = 0
+        for _, size, meta_path, body_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            for path in (meta_path, body_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+            evicted += 1
+
+        return evicted
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this cache instance"""
+        return {'hits': self.hits, 'misses': self.misses}
@@ -13,19 +13,29 @@ from scrapers import (
     EssentialPartsScraper,
     SoligentScraper
 )
-from sheets_manager import SheetsManager
-from price_tracker import PriceTracker
+from sheets_manager import BestDealGroups, SheetsClientPool, SheetsManager
+from price_tracker import create_price_tracker
 from alerting import AlertingSystem
 from config import Config
+from scraper_runner import stream_scrapers, print_timings
+from product_pipeline import DistributorStatsStage, PriceTrackingStage, ProductPipeline, SheetsTabsStage
 from datetime import datetime
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional
 
 
 class SolarInventorySystem:
     """Main system orchestrator"""
 
-    def __init__(self):
+    def __init__(self, sheets_client_pool: Optional[SheetsClientPool] = None):
+        """
+        Initialize the system
+
+        Args:
+            sheets_client_pool: Google Sheets client pool kept by a long-lived
+                                process (e.g. the scheduler) across runs
+        """
         self.config = Config()
+        self.sheets_client_pool = sheets_client_pool
         self.scrapers = self.initialize_scrapers()
         self.sheets_manager = None
         self.price_tracker = None
@@ -52,58 +62,72 @@ class SolarInventorySystem:
 
         return enabled_scrapers
 
-    def run_scraping(self) -> Dict[str, List[Dict]]:
-        """Run all enabled scrapers"""
+    def stream_products(self) -> Iterator[Dict]:
+        """Run all enabled scrapers, yielding products as they are scraped"""
         print("\n" + "="*60)
         print("🌞 SOLAR INVENTORY AUTOMATION SYSTEM")
         print("="*60)
         print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Scraping {len(self.scrapers)} distributor(s)")
+        print(f"Scraping {len(self.scrapers)} distributor(s) "
+              f"({self.config.MAX_CONCURRENT_SCRAPERS} at a time)")
         print("="*60)
 
-        all_products = {}
+        results = {}
+        yield from stream_scrapers(self.scrapers, max_workers=self.config.MAX_CONCURRENT_SCRAPERS,
+                                   results=results)
+        print_timings(self.scrapers, results)
+
+    def distributor_names(self) -> List[str]:
+        """Names of the enabled distributors, in configured order"""
+        return [scraper.distributor_name for scraper in self.scrapers.values()]
 
-        for key, scraper in self.scrapers.items():
-            try:
-                products = scraper.run()
-                all_products[scraper.distributor_name] = products
-            except Exception as e:
-                print(f"❌ Error scraping {scraper.distributor_name}: {e}")
-                all_products[scraper.distributor_name] = []
+    def create_price_tracking_stage(self) -> Optional[PriceTrackingStage]:
+        """Price tracking stage of the pipeline (None when disabled or unavailable)"""
+        if not self.config.ENABLE_PRICE_TRACKING:
+            return None
 
-        return all_products
+        try:
+            self.price_tracker = create_price_tracker(self.config.PRICE_HISTORY_FILE)
+        except Exception as e:
+            print(f"\n❌ Error in price tracking: {e}")
+            return None
+        return PriceTrackingStage(self.price_tracker)
 
-    def update_sheets(self, all_products: Dict[str, List[Dict]]):
+    def update_sheets(self, sheets_tabs: SheetsTabsStage, distributor_stats: Dict):
         """Update Google Sheets with all data"""
         print("\n" + "="*60)
         print("📊 UPDATING GOOGLE SHEETS")
         print("="*60)
 
         try:
-            self.sheets_manager = SheetsManager(self.config.GOOGLE_SHEET_NAME)
-
-            # Update individual distributor tabs
-            for distributor_name, products in all_products.items():
-                self.sheets_manager.update_distributor_tab(distributor_name, products)
-
-            # Create comparison tab
-            if self.config.CREATE_COMPARISON_TAB:
-                flat_products = [p for products in all_products.values() for p in products]
-                self.sheets_manager.create_comparison_tab(flat_products)
-
-            # Create summary tab
-            if self.config.CREATE_SUMMARY_TAB:
-                stats = self.calculate_statistics(all_products)
-                self.sheets_manager.create_summary_tab(stats)
+            self.sheets_manager = SheetsManager(self.config.GOOGLE_SHEET_NAME,
+                                               diff_sync=self.config.SHEETS_DIFF_SYNC,
+                                               client_pool=self.sheets_client_pool)
+
+            # Queue every tab and send them together in a few batched API calls
+            with self.sheets_manager.batch():
+                # Update individual distributor tabs
+                for distributor_name, rows in sheets_tabs.rows.items():
+                    self.sheets_manager.write_distributor_tab(distributor_name, rows,
+                                                              sheets_tabs.keys[distributor_name])
+
+                # Create comparison tab
+                if sheets_tabs.best_deals is not None:
+                    print(f"\n📊 Creating Master Comparison tab...")
+                    self.sheets_manager.write_comparison_tab(sheets_tabs.best_deals.best_deals())
+
+                # Create summary tab
+                if self.config.CREATE_SUMMARY_TAB:
+                    self.sheets_manager.create_summary_tab(distributor_stats)
 
             print("\n✅ All sheets updated successfully!")
 
         except Exception as e:
             print(f"\n❌ Error updating sheets: {e}")
 
-    def track_prices_and_alert(self, all_products: Dict[str, List[Dict]]):
-        """Track price changes and send alerts"""
-        if not self.config.ENABLE_PRICE_TRACKING:
+    def report_price_changes(self, tracking: Optional[PriceTrackingStage]):
+        """Print tracked price changes and send alerts"""
+        if tracking is None:
             return
 
         print("\n" + "="*60)
@@ -111,13 +135,7 @@ class SolarInventorySystem:
         print("="*60)
 
         try:
-            self.price_tracker = PriceTracker(self.config.PRICE_HISTORY_FILE)
-
-            # Flatten all products
-            flat_products = [p for products in all_products.values() for p in products]
-
-            # Track changes
-            changes = self.price_tracker.track_products(flat_products)
+            changes = tracking.changes
 
             print(f"\n📊 Changes Detected:")
             print(f"  • Price Drops: {len(changes['price_drops'])}")
@@ -144,69 +162,62 @@ class SolarInventorySystem:
         except Exception as e:
             print(f"\n❌ Error in price tracking: {e}")
 
-    def calculate_statistics(self, all_products: Dict[str, List[Dict]]) -> Dict:
-        """Calculate statistics for each distributor"""
-        stats = {}
-
-        for distributor_name, products in all_products.items():
-            if not products:
-                stats[distributor_name] = {
-                    'total': 0,
-                    'in_stock': 0,
-                    'out_of_stock': 0,
-                    'avg_price': 0,
-                    'min_price': 0,
-                    'max_price': 0
-                }
-                continue
-
-            prices = [p['price'] for p in products if p.get('price', 0) > 0]
-
-            stats[distributor_name] = {
-                'total': len(products),
-                'in_stock': sum(1 for p in products if p.get('stock_status') == 'In Stock'),
-                'out_of_stock': sum(1 for p in products if p.get('stock_status') != 'In Stock'),
-                'avg_price': sum(prices) / len(prices) if prices else 0,
-                'min_price': min(prices) if prices else 0,
-                'max_price': max(prices) if prices else 0
-            }
-
-        return stats
-
-    def print_summary(self, all_products: Dict[str, List[Dict]]):
+    def print_summary(self, distributor_stats: Dict):
         """Print execution summary"""
         print("\n" + "="*60)
         print("✨ EXECUTION SUMMARY")
         print("="*60)
 
-        total_products = sum(len(products) for products in all_products.values())
+        total_products = sum(stats['total'] for stats in distributor_stats.values())
 
         print(f"\n📦 Total Products Scraped: {total_products}")
         print(f"\nBreakdown by Distributor:")
 
-        for distributor_name, products in all_products.items():
-            in_stock = sum(1 for p in products if p.get('stock_status') == 'In Stock')
-            print(f"  • {distributor_name}: {len(products)} products ({in_stock} in stock)")
+        for distributor_name, stats in distributor_stats.items():
+            print(f"  • {distributor_name}: {stats['total']} products ({stats['in_stock']} in stock)")
 
         print(f"\n⏰ Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print("="*60 + "\n")
 
     def run(self):
-        """Main execution method"""
+        """
+        Main execution method
+
+        Scraped products stream through the pipeline in batches: statistics and
+        price tracking are updated per batch, and only the compact Sheets rows and
+        the best deal of each product group are kept until the sheets are written.
+        """
         # Print configuration
         self.config.print_config()
 
-        # Run scraping
-        all_products = self.run_scraping()
+        distributors = self.distributor_names()
+        stats = DistributorStatsStage(distributors)
+        sheets_tabs = SheetsTabsStage(
+            SheetsManager,
+            distributors,
+            best_deals=BestDealGroups() if self.config.CREATE_COMPARISON_TAB else None
+        )
+        stages = [stats, sheets_tabs]
+
+        tracking = self.create_price_tracking_stage()
+        if tracking is not None:
+            stages.append(tracking)
+
+        try:
+            # Run scraping, statistics and price tracking in one pass over the products
+            ProductPipeline(stages, batch_size=self.config.PIPELINE_BATCH_SIZE).run(self.stream_products())
 
-        # Update Google Sheets
-        self.update_sheets(all_products)
+            # Update Google Sheets
+            self.update_sheets(sheets_tabs, stats.stats)
 
-        # Track prices and send alerts
-        self.track_prices_and_alert(all_products)
+            # Report price changes and send alerts
+            self.report_price_changes(tracking)
+        finally:
+            if self.price_tracker is not None:
+                self.price_tracker.close()
 
         # Print summary
-        self.print_summary(all_products)
+        self.print_summary(stats.stats)
 
 
 def main():
@@ -0,0 +1,234 @@
+"""
+Manufacturer Matcher
+Canonicalizes manufacturer names and fuzzy-matches them against a set of known manufacturers
+"""
+
+import hashlib
+import re
+import threading
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+# Alternate spellings -> canonical manufacturer name
+MANUFACTURER_ALIASES = {
+    'Qcells': ['Q CELLS', 'Q-CELLS', 'Q.CELLS', 'Hanwha Q CELLS', 'Hanwha Qcells'],
+    'Jinko Solar': ['Jinko', 'JinkoSolar'],
+    'Trina Solar': ['Trina', 'Trinasolar'],
+    'Longi': ['LONGi Solar', 'LONGi Green Energy'],
+    'REC': ['REC Solar', 'REC Group'],
+    'HT-SAAE': ['HT SAAE', 'HTSAAE'],
+    'SolarEdge': ['Solar Edge'],
+    'LG Energy Solution': ['LG Energy', 'LG Chem', 'LG Electronics'],
+    'SunPower': ['Sun Power'],
+    'Tesla': ['Tesla Energy'],
+}
+
+# Manufacturers recognized in product titles when no AVL is involved
+KNOWN_MANUFACTURERS = [
+    'Jinko Solar', 'JA Solar', 'REC', 'HT-SAAE', 'Canadian Solar',
+    'Longi', 'Trina Solar', 'SunPower', 'Qcells', 'Panasonic',
+    'Silfab', 'Aptos', 'Maxeon', 'Mission Solar'
+]
+
+# Trailing words that do not distinguish one manufacturer from another
+LEGAL_SUFFIXES = {
+    'INC', 'INCORPORATED', 'LLC', 'LTD', 'LIMITED', 'CO', 'CORP', 'CORPORATION',
+    'COMPANY', 'GMBH', 'AG', 'PLC', 'SA', 'USA'
+}
+GENERIC_WORDS = {'SOLAR', 'ENERGY', 'PV', 'POWER', 'TECHNOLOGY', 'TECHNOLOGIES', 'GREEN', 'MODULES'}
+
+_NON_ALNUM = re.compile(r'[^A-Z0-9&]+')
+
+
+def normalize_tokens(name: str) -> List[str]:
+    """Upper-case a name, split it on punctuation/whitespace and drop legal suffixes"""
+    tokens = _NON_ALNUM.sub(' ', str(name).upper().replace('&', ' AND ')).split()
+    while tokens and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    return tokens
+
+
+def manufacturer_key(name: str) -> str:
+    """
+    Canonical matching key for a manufacturer name
+
+    Punctuation, spacing, legal suffixes and generic words are ignored, so
+    "Canadian Solar Inc." and "CANADIAN SOLAR", or "Q CELLS" and "Qcells", share a key.
+    """
+    tokens = normalize_tokens(name)
+    distinctive = [token for token in tokens if token not in GENERIC_WORDS]
+    return ''.join(distinctive or tokens)
+
+
+def spelling_key(name: str) -> str:
+    """Key of a whole spelling: like manufacturer_key, but generic words are kept"""
+    return ''.join(normalize_tokens(name))
+
+
+def is_generic(name: str) -> bool:
+    """True when a name is made only of generic words (e.g. "Solar Inc", "Solar Power")"""
+    return all(token in GENERIC_WORDS for token in normalize_tokens(name))
+
+
+def _ngrams(key: str, n: int = 3) -> Set[str]:
+    padded = f" {key} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class ManufacturerMatcher:
+    """
+    Matches free-form manufacturer names to known manufacturers
+
+    Lookups try, in order: the exact canonical key, the alias table, then a fuzzy
+    comparison restricted to candidates sharing character trigrams with the query
+    (a blocking index), so the number of comparisons does not grow with every
+    known manufacturer. Names made only of generic words are never fuzzy-matched.
+    Results are memoized per input name.
+    """
+
+    ALIAS_CONFIDENCE = 0.95
+    MIN_FUZZY_LENGTH = 4
+    MAX_CANDIDATES = 5
+
+    def __init__(self, manufacturers: Iterable[str] = (), aliases: Optional[Dict[str, List[str]]] = None,
+                 threshold: float = 0.9):
+        """
+        Initialize matcher
+
+        Args:
+            manufacturers: Known manufacturer names (the first spelling of each key is kept)
+            aliases: Canonical name -> alternate spellings (defaults to MANUFACTURER_ALIASES)
+            threshold: Minimum similarity (0-1) for a fuzzy match
+        """
+        self.aliases = MANUFACTURER_ALIASES if aliases is None else aliases
+        self.threshold = threshold
+        self.names: Dict[str, str] = {}
+        self.ngram_index: Dict[str, Set[str]] = {}
+        self.cache: Dict[str, Tuple[Optional[str], float]] = {}
+        self.lock = threading.Lock()
+
+        # Every spelling of a manufacturer collapses onto the key of its canonical name.
+        # Spellings are compared whole, so the alias "LG Energy" does not make "LG" an alias.
+        self.alias_keys: Dict[str, str] = {}
+        # Full spellings (all words, generic ones included) -> key, for find_in_text
+        self.phrases: Dict[str, Tuple[str, float]] = {}
+        for canonical, spellings in self.aliases.items():
+            for spelling in spellings:
+                self.alias_keys[spelling_key(spelling)] = manufacturer_key(canonical)
+                self._add_phrase(spelling, manufacturer_key(canonical), self.ALIAS_CONFIDENCE)
+
+        for name in manufacturers:
+            self.add(name)
+
+    def canonical_key(self, name: str) -> str:
+        """Matching key of a name with aliases applied"""
+        return self.alias_keys.get(spelling_key(name), manufacturer_key(name))
+
+    def add(self, name: str):
+        """Register a known manufacturer (the first spelling registered for a key is kept)"""
+        if not isinstance(name, str) or not name.strip():
+            return
+        key = self.canonical_key(name)
+        if not key or key in self.names:
+            return
+
+        with self.lock:
+            self.names[key] = name.strip()
+            self._add_phrase(name, key, 1.0)
+            for gram in _ngrams(key):
+                self.ngram_index.setdefault(gram, set()).add(key)
+            self.cache.clear()
+
+    def resolve(self, name: str) -> Tuple[Optional[str], float]:
+        """
+        Resolve a name to the key of a known manufacturer
+
+        Returns:
+            (key, confidence); key is None (confidence 0.0) when nothing matches
+        """
+        if not isinstance(name, str):
+            return None, 0.0
+
+        cached = self.cache.get(name)
+        if cached is not None:
+            return cached
+
+        result = self._resolve(manufacturer_key(name), self.alias_keys.get(spelling_key(name)),
+                               fuzzy=not is_generic(name))
+        with self.lock:
+            self.cache[name] = result
+        return result
+
+    def match(self, name: str) -> Tuple[Optional[str], float]:
+        """
+        Match a name to a known manufacturer
+
+        Returns:
+            (canonical manufacturer name, confidence); (None, 0.0) when nothing matches
+        """
+        key, confidence = self.resolve(name)
+        return (self.names[key] if key else None), confidence
+
+    def _resolve(self, key: str, alias_key: Optional[str] = None,
+                 fuzzy: bool = True) -> Tuple[Optional[str], float]:
+        if not key:
+            return None, 0.0
+        if key in self.names:
+            return key, 1.0
+        if alias_key in self.names:
+            return alias_key, self.ALIAS_CONFIDENCE
+        if not fuzzy or len(key) < self.MIN_FUZZY_LENGTH:
+            return None, 0.0
+
+        # Blocking: only compare against keys sharing the most trigrams with the query
+        shared: Dict[str, int] = {}
+        for gram in _ngrams(key):
+            for candidate in self.ngram_index.get(gram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        candidates = sorted(shared, key=shared.get, reverse=True)[:self.MAX_CANDIDATES]
+
+        best_key, best_score = None, 0.0
+        for candidate in candidates:
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score > best_score:
+                best_key, best_score = candidate, score
+
+        if best_score >= self.threshold:
+            return best_key, round(best_score, 3)
+        return None, 0.0
+
+    def find_in_text(self, text: str, max_words: int = 3) -> Tuple[Optional[str], float]:
+        """
+        Find the first known manufacturer (or alias) mentioned in free text, e.g. a product title
+
+        Only a manufacturer's whole spelling counts, generic words included, so
+        "REC" does not match inside "PRECISION", and neither "Mission critical"
+        nor "JA 400W" match Mission Solar or JA Solar.
+
+        Returns:
+            (canonical manufacturer name, confidence); (None, 0.0) when none is found
+        """
+        words = normalize_tokens(text) if text else []
+        for start in range(len(words)):
+            for length in range(min(max_words, len(words) - start), 0, -1):
+                match = self.phrases.get(' '.join(words[start:start + length]))
+                if match and match[0] in self.names:
+                    return self.names[match[0]], match[1]
+        return None, 0.0
+
+    def _add_phrase(self, spelling: str, key: str, confidence: float):
+        """Register a spelling for find_in_text (single generic words are never registered)"""
+        tokens = normalize_tokens(spelling)
+        if not tokens or (len(tokens) == 1 and tokens[0] in GENERIC_WORDS):
+            return
+        self.phrases.setdefault(' '.join(tokens), (key, confidence))
+
+    def signature(self) -> str:
+        """Fingerprint of the alias table and threshold, for invalidating cached results"""
+        payload = repr((sorted((k, sorted(v)) for k, v in self.aliases.items()), self.threshold))
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+# Shared matcher for scrapers that derive brands from titles
+default_matcher = ManufacturerMatcher(KNOWN_MANUFACTURERS)
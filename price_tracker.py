@@ -5,8 +5,10 @@ Tracks price changes over time and detects significant changes
 
 import json
 import os
+import sqlite3
+import sys
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 
 class PriceTracker:
@@ -35,13 +37,23 @@ class PriceTracker:
         except Exception as e:
             print(f"⚠️ Error saving price history: {e}")
 
+    def close(self):
+        """Release the history backend (nothing to do for the JSON file)"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
     def get_product_key(self, product: Dict) -> str:
         """Generate unique key for product"""
         return f"{product['distributor']}_{product['sku']}_{product['product_id']}"
 
-    def track_products(self, products: List[Dict]) -> Dict[str, List[Dict]]:
+    def track_products(self, products: Iterable[Dict], save: bool = True) -> Dict[str, List[Dict]]:
         """
         Track new products and detect changes
+        Pass save=False when tracking a catalog in batches and call save_history() once at the end
         Returns dict with: price_drops, price_increases, new_products, stock_changes
         """
         changes = {
@@ -59,38 +71,12 @@ class PriceTracker:
             if key in self.history:
                 # Existing product - check for changes
                 old_data = self.history[key]
-                old_price = old_data.get('price', 0)
-                old_stock = old_data.get('stock_status', 'Unknown')
-
-                # Check price changes
-                if old_price > 0 and current_price > 0:
-                    price_diff = old_price - current_price
-                    price_change_pct = (price_diff / old_price) * 100
-
-                    if price_change_pct > 10:  # Price dropped more than 10%
-                        changes['price_drops'].append({
-                            'product': product,
-                            'old_price': old_price,
-                            'new_price': current_price,
-                            'savings': price_diff,
-                            'percentage': price_change_pct
-                        })
-                    elif price_change_pct < -10:  # Price increased more than 10%
-                        changes['price_increases'].append({
-                            'product': product,
-                            'old_price': old_price,
-                            'new_price': current_price,
-                            'increase': abs(price_diff),
-                            'percentage': abs(price_change_pct)
-                        })
-
-                # Check stock changes
-                if old_stock != current_stock:
-                    changes['stock_changes'].append({
-                        'product': product,
-                        'old_stock': old_stock,
-                        'new_stock': current_stock
-                    })
+                self.detect_changes(
+                    product,
+                    old_data.get('price', 0),
+                    old_data.get('stock_status', 'Unknown'),
+                    changes
+                )
 
                 # Update history
                 self.history[key] = {
@@ -122,10 +108,46 @@ class PriceTracker:
                 }
 
         # Save updated history
-        self.save_history()
+        if save:
+            self.save_history()
 
         return changes
 
+    def detect_changes(self, product: Dict, old_price: float, old_stock: str, changes: Dict[str, List[Dict]]):
+        """Record price drops/increases and stock changes of a known product into changes"""
+        current_price = product.get('price', 0)
+        current_stock = product.get('stock_status', 'Unknown')
+
+        # Check price changes
+        if old_price > 0 and current_price > 0:
+            price_diff = old_price - current_price
+            price_change_pct = (price_diff / old_price) * 100
+
+            if price_change_pct > 10:  # Price dropped more than 10%
+                changes['price_drops'].append({
+                    'product': product,
+                    'old_price': old_price,
+                    'new_price': current_price,
+                    'savings': price_diff,
+                    'percentage': price_change_pct
+                })
+            elif price_change_pct < -10:  # Price increased more than 10%
+                changes['price_increases'].append({
+                    'product': product,
+                    'old_price': old_price,
+                    'new_price': current_price,
+                    'increase': abs(price_diff),
+                    'percentage': abs(price_change_pct)
+                })
+
+        # Check stock changes
+        if old_stock != current_stock:
+            changes['stock_changes'].append({
+                'product': product,
+                'old_stock': old_stock,
+                'new_stock': current_stock
+            })
+
     def get_price_trends(self) -> List[Dict]:
         """Analyze price trends across all tracked products"""
         trends = []
@@ -151,3 +173,306 @@ class PriceTracker:
                     })
 
         return sorted(trends, key=lambda x: x['change_pct'])
+
+
+class SQLitePriceTracker(PriceTracker):
+    """
+    Price tracker backed by SQLite instead of one JSON document
+
+    Keeps the latest state per product in a products table and an append-only
+    price_observations table indexed by product key and date. Each run only
+    reads the keys it sees, updates product rows whose price or stock status
+    changed, and appends one observation per product seen, like the JSON
+    tracker's price_history (which, unlike this table, keeps only the last 30).
+
+    The legacy JSON history next to the database is imported once; completion
+    is recorded in the meta table, so a failed import is retried on the next run.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            product_key TEXT PRIMARY KEY,
+            price REAL,
+            stock_status TEXT,
+            title TEXT,
+            distributor TEXT,
+            last_updated TEXT
+        );
+        CREATE TABLE IF NOT EXISTS price_observations (
+            product_key TEXT NOT NULL,
+            observed_at TEXT,
+            price REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_observations_key_date
+            ON price_observations (product_key, observed_at);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    # meta key recording that the legacy JSON history has been imported
+    JSON_MIGRATED = 'json_migrated'
+
+    # SQLite limits the number of bound parameters per statement
+    LOOKUP_CHUNK = 500
+
+    def __init__(self, history_file: str = 'price_history.db'):
+        self.history_file = history_file
+        self.history = {}
+
+        self.conn = sqlite3.connect(history_file)
+        self.conn.executescript(self.SCHEMA)
+        self.migrate_legacy_history(os.path.splitext(history_file)[0] + '.json')
+
+    def migrate_legacy_history(self, legacy_file: str):
+        """
+        Import the legacy JSON history unless a previous run already did
+
+        A database that already tracks products without the meta record (created
+        before it existed) is taken as migrated, so stale JSON never overwrites it.
+        """
+        if not os.path.exists(legacy_file) or is_migrated(self.conn):
+            return
+
+        if self.conn.execute("SELECT 1 FROM products LIMIT 1").fetchone():
+            mark_migrated(self.conn, legacy_file)
+            self.conn.commit()
+            return
+
+        print(f"📦 Migrating price history from {legacy_file}...")
+        try:
+            count = migrate_json_to_sqlite(legacy_file, self.history_file, conn=self.conn)
+            print(f"  ✅ Migrated {count} products")
+        except Exception as e:
+            print(f"⚠️ Error migrating price history (will retry next run): {e}")
+
+    def load_history(self) -> Dict:
+        """History lives in SQLite and is queried per batch, never loaded whole"""
+        return {}
+
+    def save_history(self):
+        """Commit pending changes"""
+        try:
+            self.conn.commit()
+        except Exception as e:
+            print(f"⚠️ Error saving price history: {e}")
+
+    def _load_known(self, keys: List[str]) -> Dict[str, Tuple[float, str]]:
+        """Fetch (price, stock_status) for the given product keys"""
+        known = {}
+        for i in range(0, len(keys), self.LOOKUP_CHUNK):
+            chunk = keys[i:i + self.LOOKUP_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT product_key, price, stock_status FROM products WHERE product_key IN ({placeholders})",
+                chunk
+            )
+            for key, price, stock_status in rows:
+                known[key] = (price or 0, stock_status or 'Unknown')
+        return known
+
+    def track_products(self, products: Iterable[Dict], save: bool = True) -> Dict[str, List[Dict]]:
+        """
+        Track new products and detect changes with a batched upsert
+        Returns dict with: price_drops, price_increases, new_products, stock_changes
+        """
+        changes = {
+            'price_drops': [],
+            'price_increases': [],
+            'new_products': [],
+            'stock_changes': []
+        }
+
+        products = list(products)
+        keyed = [(self.get_product_key(product), product) for product in products]
+        known = self._load_known(list({key for key, _ in keyed}))
+
+        upserts = []
+        observations = []
+
+        for key, product in keyed:
+            current_price = product.get('price', 0)
+            current_stock = product.get('stock_status', 'Unknown')
+
+            # Every run adds a price point, as in the JSON history
+            observations.append((key, product.get('last_updated'), current_price))
+
+            if key in known:
+                old_price, old_stock = known[key]
+                self.detect_changes(product, old_price, old_stock, changes)
+
+                if old_price == current_price and old_stock == current_stock:
+                    continue  # Unchanged - no product row to update
+            else:
+                changes['new_products'].append(product)
+
+            known[key] = (current_price, current_stock)
+            upserts.append((
+                key,
+                current_price,
+                current_stock,
+                product.get('title'),
+                product.get('distributor'),
+                product.get('last_updated')
+            ))
+
+        if upserts:
+            self.conn.executemany(
+                """
+                INSERT INTO products (product_key, price, stock_status, title, distributor, last_updated)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(product_key) DO UPDATE SET
+                    price = excluded.price,
+                    stock_status = excluded.stock_status,
+                    title = excluded.title,
+                    distributor = excluded.distributor,
+                    last_updated = excluded.last_updated
+                """,
+                upserts
+            )
+        if observations:
+            self.conn.executemany(
+                "INSERT INTO price_observations (product_key, observed_at, price) VALUES (?, ?, ?)",
+                observations
+            )
+
+        if save:
+            self.save_history()
+
+        return changes
+
+    def get_price_trends(self) -> List[Dict]:
+        """Analyze price trends across all tracked products"""
+        trends = []
+
+        rows = self.conn.execute("""
+            SELECT p.title, p.distributor, o.first_price, o.last_price, o.data_points
+            FROM products p
+            JOIN (
+                SELECT product_key,
+                       COUNT(*) AS data_points,
+                       (SELECT price FROM price_observations f
+                        WHERE f.product_key = o.product_key
+                        ORDER BY observed_at, rowid LIMIT 1) AS first_price,
+                       (SELECT price FROM price_observations l
+                        WHERE l.product_key = o.product_key
+                        ORDER BY observed_at DESC, rowid DESC LIMIT 1) AS last_price
+                FROM price_observations o
+                GROUP BY product_key
+                HAVING COUNT(*) >= 2
+            ) o ON o.product_key = p.product_key
+        """)
+
+        for title, distributor, first_price, last_price, data_points in rows:
+            if first_price and first_price > 0:
+                change_pct = ((last_price - first_price) / first_price) * 100
+
+                trends.append({
+                    'title': title,
+                    'distributor': distributor,
+                    'first_price': first_price,
+                    'current_price': last_price,
+                    'change_pct': change_pct,
+                    'trend': 'down' if change_pct < 0 else 'up' if change_pct > 0 else 'stable',
+                    'data_points': data_points
+                })
+
+        return sorted(trends, key=lambda x: x['change_pct'])
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+def is_migrated(conn: sqlite3.Connection) -> bool:
+    """Whether the legacy JSON history has been imported into this database"""
+    row = conn.execute(
+        "SELECT 1 FROM meta WHERE key = ?", (SQLitePriceTracker.JSON_MIGRATED,)
+    ).fetchone()
+    return row is not None
+
+
+def mark_migrated(conn: sqlite3.Connection, json_file: str):
+    """Record the JSON history import (committed by the caller)"""
+    conn.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+        (SQLitePriceTracker.JSON_MIGRATED, f"{json_file} at {datetime.now().isoformat()}")
+    )
+
+
+def create_price_tracker(history_file: str = 'price_history.json') -> PriceTracker:
+    """
+    Create the price tracker matching the history file type
+    A .db/.sqlite/.sqlite3 path selects the SQLite backend, anything else the JSON file
+    """
+    if history_file.lower().endswith(SQLITE_SUFFIXES):
+        return SQLitePriceTracker(history_file)
+    return PriceTracker(history_file)
+
+
+def migrate_json_to_sqlite(json_file: str, db_file: str, conn: Optional[sqlite3.Connection] = None) -> int:
+    """
+    One-shot migration of a price_history.json file into a SQLite database
+
+    The import is one transaction that also records completion in the meta
+    table: it either lands whole or not at all.
+
+    Args:
+        json_file: Existing JSON price history
+        db_file: SQLite database to create or extend
+        conn: Optional open connection to db_file
+
+    Returns:
+        Number of products migrated
+    """
+    with open(json_file, 'r') as f:
+        history = json.load(f)
+
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_file)
+    conn.executescript(SQLitePriceTracker.SCHEMA)
+
+    try:
+        conn.executemany(
+            """
+            INSERT OR REPLACE INTO products (product_key, price, stock_status, title, distributor, last_updated)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (key, data.get('price', 0), data.get('stock_status', 'Unknown'), data.get('title'),
+                 data.get('distributor'), data.get('last_updated'))
+                for key, data in history.items()
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO price_observations (product_key, observed_at, price) VALUES (?, ?, ?)",
+            [
+                (key, point.get('date'), point.get('price', 0))
+                for key, data in history.items()
+                for point in data.get('price_history', [])
+            ]
+        )
+        mark_migrated(conn, json_file)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        if own_conn:
+            conn.close()
+
+    return len(history)
+
+
+if __name__ == "__main__":
+    # Usage: python price_tracker.py migrate price_history.json price_history.db
+    if len(sys.argv) == 4 and sys.argv[1] == 'migrate':
+        count = migrate_json_to_sqlite(sys.argv[2], sys.argv[3])
+        print(f"✅ Migrated {count} products from {sys.argv[2]} to {sys.argv[3]}")
+    else:
+        print("Usage: python price_tracker.py migrate <price_history.json> <price_history.db>")
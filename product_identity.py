@@ -0,0 +1,279 @@
+"""
+Product Identity
+Derives cross-distributor product identities from part numbers, brands and titles
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from manufacturer_matcher import default_matcher
+
+
+# Alphanumeric runs that describe a rating or package, not a model
+_RATING_TOKEN = re.compile(
+    r'^\d+(?:\.\d+)?(?:W|KW|WATTS?|V|VDC|VAC|A|AH|KWH|MM|KVA|HZ|PCS|PK|PACK|FT|IN|AWG|CELLS?|YRS?|YEARS?)$'
+)
+# Title tokens naming a chemistry, product line, certification or standard, which
+# many unrelated products share (LiFePO4, UL1741SA, IEC61215, NEMA3R, IP65, ...)
+_NON_MODEL_TOKEN = re.compile(
+    r'^(?:(?:UL|IEC|IEEE|NEC|CSA|NFPA|CEC|NEMA|IP)\d[A-Z0-9]*'
+    r'|1741S[AB]|9540A'
+    r'|LIFEPO4?|LIFEPOWER\d*|LFP\d*|NMC\d*|LTO\d*|LIPO\d*|LIION\d*)$'
+)
+_MODEL_TOKEN = re.compile(r'[A-Z0-9]+(?:[-./+][A-Z0-9]+)*')
+_NON_ALNUM = re.compile(r'[^A-Z0-9]')
+
+MISSING_VALUES = {'', 'N/A', 'NA', 'NONE', 'NULL', 'UNKNOWN'}
+
+# part_numbers scope of manufacturer part numbers (title tokens are scoped by brand)
+MPN_SCOPE = ''
+
+
+def normalize_part_number(value) -> Optional[str]:
+    """
+    Normalize a manufacturer part number for comparison
+
+    Returns:
+        Upper-case alphanumeric part number, or None if the value cannot be a part number
+        (missing, too short, or without both letters and digits)
+    """
+    if value is None:
+        return None
+    text = str(value).strip().upper()
+    if text in MISSING_VALUES:
+        return None
+
+    part_number = _NON_ALNUM.sub('', text)
+    if len(part_number) < 5 or part_number.isdigit() or part_number.isalpha():
+        return None
+    if _RATING_TOKEN.match(part_number):
+        return None
+    return part_number
+
+
+def title_model_tokens(title: str) -> List[str]:
+    """Part-number-like tokens in a product title, in order of appearance"""
+    tokens = []
+    for token in _MODEL_TOKEN.findall(str(title).upper()):
+        if _RATING_TOKEN.match(token):
+            continue
+        part_number = normalize_part_number(token)
+        if part_number and part_number not in tokens and not _NON_MODEL_TOKEN.match(part_number):
+            tokens.append(part_number)
+    return tokens
+
+
+def _is_missing(value) -> bool:
+    return value is None or str(value).strip().upper() in MISSING_VALUES
+
+
+class ProductIdentityIndex:
+    """
+    Persistent mapping of distributor listings and part numbers to product identities
+
+    A product's identity is the first part number it is known by: its manufacturer
+    part number (sku) when it carries one, otherwise a model number found in its
+    title. Every part number seen on a listing is linked to that identity, so a
+    distributor exposing only titles still lands on the same identity as one
+    exposing the MPN. Products without any part number fall back to brand +
+    wattage + category.
+
+    A model number taken from a title only links to a real MPN, or to the same
+    token in the title of a product of the same brand, so a token two
+    manufacturers happen to share does not merge their products.
+
+    Listings whose title/sku/brand are unchanged since the last run reuse their
+    stored identity, so matching is incremental across runs. prune() drops the
+    listings and part numbers not seen in the current run.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize identity index
+
+        Args:
+            path: JSON file holding the index (defaults to product_identity.json
+                  in the scraper state directory)
+        """
+        self.path = path or os.path.join(
+            os.environ.get('SCRAPER_STATE_DIR', '.scraper_state'), 'product_identity.json'
+        )
+        self.listings: Dict[str, Dict] = {}
+        # Part number -> {scope: identity}; the scope is MPN_SCOPE or a brand key
+        self.part_numbers: Dict[str, Dict[str, str]] = {}
+        self.seen_listings: Set[str] = set()
+        self.reused = 0
+        self.derived = 0
+        self.load()
+
+    def load(self):
+        """Load the index from disk (starting empty if missing or unreadable)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading product identity index: {e}")
+            return
+        if data.get('version') != self.VERSION:
+            return
+        self.listings = data.get('listings', {})
+        self.part_numbers = data.get('part_numbers', {})
+
+    def save(self):
+        """Write the index to disk atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'version': self.VERSION,
+                    'listings': self.listings,
+                    'part_numbers': self.part_numbers
+                }, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Error saving product identity index: {e}")
+
+    @staticmethod
+    def listing_key(product: Dict) -> str:
+        product_id, sku = product.get('product_id', ''), product.get('sku', '')
+        if _is_missing(product_id) and _is_missing(sku):
+            # Listings without IDs (e.g. Giga Energy) are told apart by their URL
+            return f"{product.get('distributor', '')}|url:{product.get('product_url', '')}"
+        return f"{product.get('distributor', '')}|{product_id}|{sku}"
+
+    @staticmethod
+    def fingerprint(product: Dict) -> str:
+        payload = f"{product.get('title', '')}|{product.get('sku', '')}|{product.get('brand', '')}"
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def brand_key(product: Dict) -> Optional[str]:
+        """Canonical manufacturer key of a product's brand (None when unknown)"""
+        brand = product.get('brand', '')
+        if _is_missing(brand):
+            return None
+        return default_matcher.canonical_key(brand) or None
+
+    @staticmethod
+    def part_number_candidates(product: Dict) -> List[Tuple[str, bool]]:
+        """
+        Part numbers of a product: its MPN first, then model numbers from its title
+
+        Returns:
+            List of (part number, is a manufacturer part number)
+        """
+        candidates = []
+
+        # A sku equal to the listing ID is a distributor-internal identifier, not an MPN
+        sku = product.get('sku')
+        if sku is not None and str(sku) != str(product.get('product_id')):
+            mpn = normalize_part_number(sku)
+            if mpn:
+                candidates.append((mpn, True))
+
+        for token in title_model_tokens(product.get('title', '')):
+            if all(token != part_number for part_number, _ in candidates):
+                candidates.append((token, False))
+        return candidates
+
+    @staticmethod
+    def fallback_key(product: Dict) -> str:
+        """Coarse identity for products without any part number"""
+        brand = default_matcher.canonical_key(product.get('brand', '')) or 'UNKNOWN'
+        return f"group:{brand}|{product.get('wattage', 'N/A')}|{product.get('category', 'N/A')}"
+
+    def identify(self, product: Dict) -> str:
+        """
+        Get the identity key of a product, deriving and recording it if needed
+
+        Returns:
+            Identity key, e.g. 'pn:CS6R410MS' (MPN), 'pn:CANADIAN|CS6R410MS' (title
+            model number) or 'group:CANADIAN|410|Solar Panels'
+        """
+        listing_key = self.listing_key(product)
+        fingerprint = self.fingerprint(product)
+        self.seen_listings.add(listing_key)
+
+        listing = self.listings.get(listing_key)
+        if listing and listing.get('fingerprint') == fingerprint:
+            self.reused += 1
+            return listing['identity']
+
+        self.derived += 1
+        brand = self.brand_key(product)
+        candidates = self.part_number_candidates(product)
+
+        identity = next(filter(None, (
+            self.linked_identity(part_number, is_mpn, brand) for part_number, is_mpn in candidates
+        )), None)
+        if identity is None:
+            # Title tokens are only an identity within a brand
+            part_number, is_mpn = next(
+                (candidate for candidate in candidates if candidate[1] or brand is not None), (None, False)
+            )
+            if part_number is None:
+                identity = self.fallback_key(product)
+            else:
+                identity = f"pn:{part_number}" if is_mpn else f"pn:{brand}|{part_number}"
+
+        links = []
+        for part_number, is_mpn in candidates:
+            scope = MPN_SCOPE if is_mpn else brand
+            if scope is None:
+                continue
+            self.part_numbers.setdefault(part_number, {}).setdefault(scope, identity)
+            links.append([part_number, scope])
+
+        self.listings[listing_key] = {'fingerprint': fingerprint, 'identity': identity, 'links': links}
+        return identity
+
+    def linked_identity(self, part_number: str, is_mpn: bool, brand: Optional[str]) -> Optional[str]:
+        """
+        Identity already linked to a part number, if this product may share it
+
+        An MPN matches any product listing it; a title token matches an MPN, or the
+        same title token of a product of the same brand.
+        """
+        scopes = self.part_numbers.get(part_number)
+        if not scopes:
+            return None
+        if MPN_SCOPE in scopes:
+            return scopes[MPN_SCOPE]
+        if brand is not None and brand in scopes:
+            return scopes[brand]
+        if is_mpn:
+            return next(iter(scopes.values()))
+        return None
+
+    def prune(self):
+        """Drop the listings not seen since the index was loaded, and the part numbers only they linked"""
+        if not self.seen_listings:
+            return
+        self.listings = {
+            key: listing for key, listing in self.listings.items() if key in self.seen_listings
+        }
+
+        linked: Dict[str, Set[str]] = {}
+        for listing in self.listings.values():
+            for part_number, scope in listing.get('links', []):
+                linked.setdefault(part_number, set()).add(scope)
+
+        part_numbers = {}
+        for part_number, scopes in self.part_numbers.items():
+            kept = {scope: identity for scope, identity in scopes.items()
+                    if scope in linked.get(part_number, ())}
+            if kept:
+                part_numbers[part_number] = kept
+        self.part_numbers = part_numbers
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of identities reused from the index vs derived this run"""
+        return {'reused': self.reused, 'derived': self.derived, 'listings': len(self.listings)}
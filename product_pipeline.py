@@ -0,0 +1,240 @@
+"""
+Product Pipeline
+Streams scraped products through processing stages in fixed-size batches
+"""
+
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import pandas as pd
+
+
+def batched(products: Iterable[Dict], batch_size: int) -> Iterator[List[Dict]]:
+    """Split a product stream into lists of at most batch_size products"""
+    iterator = iter(products)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+class ProductPipeline:
+    """
+    Runs a product stream through a chain of stages, one batch at a time
+
+    Each stage implements process(batch) -> batch (it may annotate or replace the
+    products it receives) and finish(), called once the stream is exhausted.
+    Only one batch is alive at a time, so memory held by the pipeline itself is
+    bounded by batch_size rather than by catalog size.
+    """
+
+    def __init__(self, stages: List, batch_size: int = 500):
+        self.stages = stages
+        self.batch_size = batch_size
+        self.product_count = 0
+
+    def run(self, products: Iterable[Dict]) -> int:
+        """
+        Consume the product stream
+
+        Returns:
+            Number of products processed
+        """
+        for batch in batched(products, self.batch_size):
+            self.product_count += len(batch)
+            for stage in self.stages:
+                batch = stage.process(batch)
+
+        for stage in self.stages:
+            stage.finish()
+
+        return self.product_count
+
+
+class AVLMatchingStage:
+    """Adds AVL approval columns to each batch"""
+
+    SUMMARY_COLUMNS = [
+        'thrive_approved', 'thrive_domestic', 'goodleap_approved', 'goodleap_domestic',
+        'on_any_avl', 'on_all_avls', 'domestic_content_qualified'
+    ]
+
+    def __init__(self, avl_handler):
+        self.avl_handler = avl_handler
+        self.totals = {column: 0 for column in self.SUMMARY_COLUMNS}
+
+    def process(self, batch: List[Dict]) -> List[Dict]:
+        df = self.avl_handler.add_avl_columns(pd.DataFrame(batch), verbose=False)
+        for column in self.SUMMARY_COLUMNS:
+            if column in df.columns:
+                self.totals[column] += int(df[column].sum())
+        return df.to_dict('records')
+
+    def finish(self):
+        print(f"\n  📊 AVL Summary:")
+        print(f"    • THRIVE approved: {self.totals['thrive_approved']} products "
+              f"({self.totals['thrive_domestic']} domestic)")
+        print(f"    • GOODLEAP approved: {self.totals['goodleap_approved']} products "
+              f"({self.totals['goodleap_domestic']} domestic)")
+        print(f"    • On any AVL: {self.totals['on_any_avl']} products")
+        print(f"    • On all AVLs: {self.totals['on_all_avls']} products")
+        print(f"    • Domestic content qualified: {self.totals['domestic_content_qualified']} products")
+
+
+class PriceTrackingStage:
+    """Tracks price/stock changes batch by batch and saves history once at the end"""
+
+    def __init__(self, price_tracker):
+        self.price_tracker = price_tracker
+        self.changes = {
+            'price_drops': [],
+            'price_increases': [],
+            'new_products': [],
+            'stock_changes': []
+        }
+
+    def process(self, batch: List[Dict]) -> List[Dict]:
+        batch_changes = self.price_tracker.track_products(batch, save=False)
+        for change_type, items in batch_changes.items():
+            self.changes[change_type].extend(items)
+        return batch
+
+    def finish(self):
+        self.price_tracker.save_history()
+
+
+class DistributorStatsStage:
+    """Running per-distributor totals (products, stock, prices) for the summary"""
+
+    def __init__(self, distributors: Iterable[str] = ()):
+        """
+        Args:
+            distributors: Distributor names, listed in this order even without products
+        """
+        self.stats: Dict[str, Dict] = {}
+        self.price_totals: Dict[str, List[float]] = {}
+        for distributor in distributors:
+            self._stats_for(distributor)
+
+    def _stats_for(self, distributor: str) -> Dict:
+        if distributor not in self.stats:
+            self.stats[distributor] = {
+                'total': 0,
+                'in_stock': 0,
+                'out_of_stock': 0,
+                'avg_price': 0,
+                'min_price': 0,
+                'max_price': 0
+            }
+            self.price_totals[distributor] = [0.0, 0]
+        return self.stats[distributor]
+
+    def process(self, batch: List[Dict]) -> List[Dict]:
+        for product in batch:
+            distributor = product.get('distributor', 'N/A')
+            stats = self._stats_for(distributor)
+            stats['total'] += 1
+            if product.get('stock_status') == 'In Stock':
+                stats['in_stock'] += 1
+            else:
+                stats['out_of_stock'] += 1
+
+            price = product.get('price', 0)
+            if price > 0:
+                totals = self.price_totals[distributor]
+                stats['min_price'] = min(stats['min_price'], price) if totals[1] else price
+                stats['max_price'] = max(stats['max_price'], price)
+                totals[0] += price
+                totals[1] += 1
+        return batch
+
+    def finish(self):
+        for distributor, (price_sum, priced) in self.price_totals.items():
+            self.stats[distributor]['avg_price'] = price_sum / priced if priced else 0
+
+
+class SheetsTabsStage:
+    """
+    Collects the Google Sheets tab content of each batch
+
+    The distributor tabs need every row, so each product is reduced to its row
+    values (and diff sync key) as it passes; the comparison tab only keeps the
+    running best deal of each product group. Product dicts are not retained.
+    """
+
+    def __init__(self, sheets_manager, distributors: Iterable[str] = (), best_deals=None):
+        """
+        Args:
+            sheets_manager: SheetsManager (class or instance) building the rows
+            distributors: Distributor names, listed in this order even without products
+            best_deals: BestDealGroups fed every product (None = no comparison tab)
+        """
+        self.sheets_manager = sheets_manager
+        self.rows: Dict[str, List[List]] = {distributor: [] for distributor in distributors}
+        self.keys: Dict[str, List[str]] = {distributor: [] for distributor in distributors}
+        self.best_deals = best_deals
+
+    def process(self, batch: List[Dict]) -> List[Dict]:
+        for product in batch:
+            distributor = product.get('distributor', 'N/A')
+            self.rows.setdefault(distributor, []).append(self.sheets_manager.distributor_row(product))
+            self.keys.setdefault(distributor, []).append(self.sheets_manager.distributor_row_key(product))
+            if self.best_deals is not None:
+                self.best_deals.add(product)
+        return batch
+
+    def finish(self):
+        pass
+
+
+class SpecSheetStage:
+    """Downloads specification sheets for each batch"""
+
+    def __init__(self, spec_downloader, max_pdfs_per_product: int = 3, delay: float = 1.0):
+        self.spec_downloader = spec_downloader
+        self.max_pdfs_per_product = max_pdfs_per_product
+        self.delay = delay
+
+    def process(self, batch: List[Dict]) -> List[Dict]:
+        self.spec_downloader.download_for_products_batch(
+            batch,
+            max_pdfs_per_product=self.max_pdfs_per_product,
+            delay=self.delay,
+            verbose=False
+        )
+        return batch
+
+    def finish(self):
+        stats = self.spec_downloader.get_statistics()
+        print(f"\n  ✅ Spec sheets: {stats.get('downloaded', 0)} downloaded, "
+              f"{stats.get('skipped', 0)} skipped, {stats.get('failed', 0)} failed")
+
+
+class DataFrameCollector:
+    """
+    Final stage collecting processed batches into one DataFrame for export
+
+    Output formats like Excel need every row of a sheet, so this is the only place
+    the full catalog is held, as compact DataFrame blocks rather than product dicts.
+    """
+
+    def __init__(self, drop_columns: Optional[List[str]] = None):
+        self.drop_columns = drop_columns or []
+        self.frames: List[pd.DataFrame] = []
+
+    def process(self, batch: List[Dict]) -> List[Dict]:
+        df = pd.DataFrame(batch)
+        self.frames.append(df.drop(columns=[c for c in self.drop_columns if c in df.columns]))
+        return batch
+
+    def finish(self):
+        pass
+
+    def dataframe(self) -> pd.DataFrame:
+        """Concatenate all collected batches"""
+        if not self.frames:
+            return pd.DataFrame()
+        df = pd.concat(self.frames, ignore_index=True)
+        self.frames = [df]
+        return df
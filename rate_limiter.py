@@ -0,0 +1,105 @@
+"""
+Rate Limiter
+Token-bucket rate limiting shared by all scrapers, keyed by host
+"""
+
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize token bucket
+
+        Args:
+            rate: Tokens added per second (0 or less disables limiting)
+            capacity: Maximum number of tokens that can accumulate (burst size)
+        """
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def configure(self, rate: float, capacity: float = 1.0):
+        """Change rate and burst size, keeping the tokens already accumulated"""
+        with self.lock:
+            self._refill()
+            self.rate = rate
+            self.capacity = max(capacity, 1.0)
+            self.tokens = min(self.tokens, self.capacity)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, blocking until they are available
+
+        Time already spent since the previous acquisition (e.g. waiting on a slow
+        response) counts towards the refill, so no dead time is added on top of it.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self.lock:
+            self._refill()
+            # Reserve the tokens now (possibly going negative) so concurrent
+            # callers queue up behind each other instead of all waking at once
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def _refill(self):
+        """Add tokens for the time elapsed since the last update (caller holds the lock)"""
+        now = time.monotonic()
+        if self.rate > 0:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+
+class HostRateLimiter:
+    """Registry of token buckets, one per host"""
+
+    def __init__(self):
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.lock = threading.Lock()
+
+    def bucket_for(self, url: str, delay: float, burst: float = 1.0) -> TokenBucket:
+        """
+        Get the bucket for the URL's host, creating or re-tuning it as needed
+
+        Args:
+            url: Request URL
+            delay: Minimum average seconds between requests to the host
+            burst: Number of requests allowed back-to-back before limiting kicks in
+        """
+        host = urlparse(url).netloc.lower()
+        rate = 1.0 / delay if delay and delay > 0 else 0.0
+
+        with self.lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(rate, burst)
+                self.buckets[host] = bucket
+                return bucket
+
+        if bucket.rate != rate or bucket.capacity != max(burst, 1.0):
+            bucket.configure(rate, burst)
+        return bucket
+
+    def acquire(self, url: str, delay: float, burst: float = 1.0) -> float:
+        """Wait for permission to send a request to the URL's host"""
+        return self.bucket_for(url, delay, burst).acquire()
+
+
+# Process-wide limiter so every scraper (and thread) hitting a host shares one budget
+host_rate_limiter = HostRateLimiter()
@@ -8,6 +8,12 @@ import time
 from main import SolarInventorySystem
 from config import Config
 from datetime import datetime
+from sheets_manager import SheetsClientPool
+
+
+# Google Sheets client and spreadsheet IDs shared by all runs of this process,
+# so warm runs skip credential fetching, authorization and the Drive lookup
+sheets_client_pool = SheetsClientPool()
 
 
 def scheduled_job():
@@ -18,7 +24,7 @@ def scheduled_job():
     print(f"{'='*60}\n")
 
     try:
-        system = SolarInventorySystem()
+        system = SolarInventorySystem(sheets_client_pool=sheets_client_pool)
         system.run()
     except Exception as e:
         print(f"❌ Scheduled job failed: {e}")
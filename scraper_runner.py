@@ -0,0 +1,172 @@
+"""
+Scraper Runner
+Runs distributor scrapers concurrently with per-distributor failure isolation and timing
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, Optional
+
+
+def run_scraper(scraper) -> Dict:
+    """
+    Run a single scraper, isolating any failure
+
+    Args:
+        scraper: BaseScraper instance
+
+    Returns:
+        Dictionary with 'products', 'elapsed' (seconds) and 'error' (None on success)
+    """
+    start = time.perf_counter()
+    try:
+        products = scraper.run()
+        error = None
+    except Exception as e:
+        products = []
+        error = e
+    return {
+        'products': products,
+        'elapsed': time.perf_counter() - start,
+        'error': error
+    }
+
+
+def run_scrapers(scrapers: Dict, max_workers: int = 1) -> Dict[str, Dict]:
+    """
+    Run all scrapers, concurrently when max_workers > 1
+
+    Each distributor hits its own host, so running them in a thread pool turns total
+    wall time into roughly the slowest distributor instead of the sum of all of them.
+
+    Args:
+        scrapers: Dictionary of scraper key -> scraper instance
+        max_workers: Maximum number of scrapers running at the same time (1 = sequential)
+
+    Returns:
+        Dictionary of scraper key -> run result (see run_scraper), in the input order
+    """
+    results = {}
+
+    if max_workers <= 1 or len(scrapers) <= 1:
+        for key, scraper in scrapers.items():
+            results[key] = run_scraper(scraper)
+            _print_result(scraper, len(results[key]['products']), results[key])
+        return results
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(scrapers))) as executor:
+        futures = {
+            executor.submit(run_scraper, scraper): key
+            for key, scraper in scrapers.items()
+        }
+        for future in as_completed(futures):
+            key = futures[future]
+            results[key] = future.result()
+            _print_result(scrapers[key], len(results[key]['products']), results[key])
+
+    # Keep the configured distributor order regardless of completion order
+    return {key: results[key] for key in scrapers}
+
+
+def put_until_stopped(buffer: queue.Queue, item, stop: threading.Event, poll: float = 0.1) -> bool:
+    """
+    Put an item on a bounded queue, giving up once stop is set
+
+    A producer blocked on a full queue would otherwise wait forever after its
+    consumer went away.
+
+    Returns:
+        True if the item was queued, False if stopped first
+    """
+    while not stop.is_set():
+        try:
+            buffer.put(item, timeout=poll)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def stream_scrapers(
+    scrapers: Dict,
+    max_workers: int = 1,
+    results: Optional[Dict[str, Dict]] = None,
+    queue_size: int = 1000
+) -> Iterator[Dict]:
+    """
+    Yield products from all scrapers as they are produced
+
+    Scrapers run on worker threads (up to max_workers at a time) and push products
+    into a bounded queue, so memory held here is limited to queue_size products no
+    matter how large the catalogs are. Products from different distributors may
+    interleave.
+
+    Args:
+        scrapers: Dictionary of scraper key -> scraper instance
+        max_workers: Maximum number of scrapers running at the same time
+        results: Optional dictionary filled with per-scraper run results
+                 (see run_scraper; 'products' holds the product count)
+        queue_size: Maximum number of scraped products buffered between stages
+
+    Yields:
+        Standardized product dictionaries
+    """
+    if results is None:
+        results = {}
+    if not scrapers:
+        return
+
+    buffer = queue.Queue(maxsize=queue_size)
+    done = object()
+    stop = threading.Event()
+
+    def produce(key, scraper):
+        start = time.perf_counter()
+        count = 0
+        error = None
+        try:
+            for product in scraper.stream():
+                if not put_until_stopped(buffer, product, stop):
+                    break
+                count += 1
+        except Exception as e:
+            error = e
+        results[key] = {'products': count, 'elapsed': time.perf_counter() - start, 'error': error}
+        _print_result(scraper, count, results[key])
+        put_until_stopped(buffer, done, stop)
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(scrapers))))
+    for key, scraper in scrapers.items():
+        executor.submit(produce, key, scraper)
+
+    try:
+        remaining = len(scrapers)
+        while remaining:
+            item = buffer.get()
+            if item is done:
+                remaining -= 1
+                continue
+            yield item
+    finally:
+        # Consumer stopped early: producers give up their pending put, and
+        # scrapers not started yet never start
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def print_timings(scrapers: Dict, results: Dict[str, Dict]):
+    """Print per-distributor wall time"""
+    print(f"\n⏱️  Per-distributor wall time:")
+    for key, result in results.items():
+        status = '❌' if result['error'] else '✅'
+        print(f"  {status} {scrapers[key].distributor_name}: {result['elapsed']:.1f}s")
+
+
+def _print_result(scraper, count: int, result: Dict):
+    """Print the outcome of a single scraper run"""
+    if result['error']:
+        print(f"  ❌ Error scraping {scraper.distributor_name}: {result['error']} ({result['elapsed']:.1f}s)")
+    else:
+        print(f"  ✅ {scraper.distributor_name}: {count} products in {result['elapsed']:.1f}s")
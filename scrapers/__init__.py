@@ -3,6 +3,7 @@ Scrapers Package
 Contains all distributor-specific scrapers
 """
 
+from .shopify_scraper import ShopifyScraper
 from .solar_cellz_scraper import SolarCellzScraper
 from .alte_scraper import AltEScraper
 from .ressupply_scraper import RessupplyScraper
@@ -13,6 +14,7 @@ from .essential_parts_scraper import EssentialPartsScraper
 from .soligent_scraper import SoligentScraper
 
 __all__ = [
+    'ShopifyScraper',
     'SolarCellzScraper',
     'AltEScraper',
     'RessupplyScraper',
@@ -8,14 +8,25 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from base_scraper import BaseScraper
-from bs4 import BeautifulSoup
-import time
+from html_parsing import class_contains, first, get_text, parse_html, xpath
 import re
 
 
 class EssentialPartsScraper(BaseScraper):
     """Scraper for Essential Parts"""
 
+    request_delay = 2.0
+
+    # Shopify theme structure (class names vary by theme, so match on substrings)
+    PRODUCT_ITEMS = xpath(f"//div[{class_contains('product')}]")
+    PRODUCT_LINKS = xpath("//a[contains(@href, '/products/')]")
+    PRODUCT_LINK = xpath(".//a[contains(@href, '/products/')]")
+    ITEM_TITLE = xpath(f".//*[self::h3 or self::h2 or self::h4][{class_contains('title')}]")
+    LINK_TITLE = xpath(f".//*[self::span or self::div][{class_contains('title')}]")
+    PRICE = xpath(f".//*[self::span or self::div][{class_contains('price')}]")
+    BRAND = xpath(f".//*[self::span or self::div][{class_contains('vendor', 'brand')}]")
+    IMG = xpath(".//img")
+
     def __init__(self):
         super().__init__("Essential Parts")
         self.base_url = "https://essentialparts.com"
@@ -42,100 +53,17 @@ class EssentialPartsScraper(BaseScraper):
                 if not response:
                     break
 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find product items (adjust selectors based on actual HTML structure)
-                product_items = soup.find_all('div', class_=lambda x: x and 'product' in x.lower() if x else False)
-                
-                if not product_items:
-                    # Try alternative selector
-                    product_items = soup.find_all('a', href=lambda x: x and '/products/' in x if x else False)
+                products_on_page = self.parse_collection_page(response.content, collection_name)
                 
-                if not product_items or len(product_items) == 0:
+                if products_on_page is None:
                     if page == 1:
                         print(f"    ⚠️ No products found on page 1 for {collection_name}")
                     print(f"    ✅ Completed {collection_name}: {len(products)} products")
                     break
 
-                for item in product_items:
-                    try:
-                        # Extract product information from HTML
-                        product_link = item.find('a', href=lambda x: x and '/products/' in x if x else False)
-                        if not product_link and item.name == 'a':
-                            product_link = item
-                        
-                        if not product_link:
-                            continue
-
-                        product_url = product_link.get('href', '')
-                        if not product_url.startswith('http'):
-                            product_url = f"{self.base_url}{product_url}"
-                        
-                        # Extract product title
-                        title_elem = item.find(['h3', 'h2', 'h4'], class_=lambda x: 'title' in x.lower() if x else False)
-                        if not title_elem:
-                            title_elem = product_link.find(['span', 'div'], class_=lambda x: 'title' in x.lower() if x else False)
-                        
-                        title = title_elem.get_text(strip=True) if title_elem else product_link.get('title', 'N/A')
-                        
-                        if title == 'N/A':
-                            continue
-                        
-                        # Extract price
-                        price_elem = item.find(['span', 'div'], class_=lambda x: x and 'price' in x.lower() if x else False)
-                        price_text = price_elem.get_text(strip=True) if price_elem else '$0'
-                        price_match = re.search(r'\$?([\d,]+\.?\d*)', price_text)
-                        price = float(price_match.group(1).replace(',', '')) if price_match else 0.0
-                        
-                        # Extract image
-                        img_elem = item.find('img')
-                        image_url = img_elem.get('src', 'N/A') if img_elem else 'N/A'
-                        if image_url and image_url.startswith('//'):
-                            image_url = f"https:{image_url}"
-                        
-                        # Extract brand/vendor if available
-                        brand_elem = item.find(['span', 'div'], class_=lambda x: x and ('vendor' in x.lower() or 'brand' in x.lower()) if x else False)
-                        brand = brand_elem.get_text(strip=True) if brand_elem else 'N/A'
-                        
-                        # Extract KVA for transformers
-                        kva = self.extract_kva(title, {'collection': collection_name})
-                        wattage = kva if kva != 'N/A' else self.extract_wattage(title)
-                        
-                        # Determine stock status
-                        stock_status = 'Unknown'
-                        if 'sold' in item.get_text().lower() or 'out of stock' in item.get_text().lower():
-                            stock_status = 'Out of Stock'
-                        elif 'in stock' in item.get_text().lower():
-                            stock_status = 'In Stock'
-                        
-                        standardized_product = self.get_standardized_product(
-                            product_id='N/A',
-                            sku='N/A',
-                            title=title,
-                            brand=brand,
-                            wattage=wattage,
-                            efficiency='N/A',
-                            price=price,
-                            compare_price=0,
-                            stock_status=stock_status,
-                            inventory_qty='N/A',
-                            shipping_cost='Varies',
-                            product_url=product_url,
-                            image_url=image_url,
-                            specs={
-                                'product_type': collection_name.rstrip('s').capitalize(),
-                                'collection': collection_name
-                            }
-                        )
-
-                        products.append(standardized_product)
-
-                    except Exception as e:
-                        print(f"      ⚠️ Error parsing product: {e}")
-                        continue
+                products.extend(products_on_page)
 
                 page += 1
-                time.sleep(2)  # Be respectful with scraping
 
             except Exception as e:
                 print(f"    ❌ Error on page {page}: {e}")
@@ -143,6 +71,110 @@ class EssentialPartsScraper(BaseScraper):
 
         return products
 
+    def parse_collection_page(self, content, collection_name):
+        """
+        Parse one collection page
+
+        Args:
+            content: Page HTML
+            collection_name: Collection the page belongs to
+
+        Returns:
+            List of standardized products, or None when the page lists no products
+        """
+        document = parse_html(content)
+
+        # Find product items (adjust selectors based on actual HTML structure)
+        product_items = self.PRODUCT_ITEMS(document)
+
+        if not product_items:
+            # Try alternative selector
+            product_items = self.PRODUCT_LINKS(document)
+
+        if not product_items:
+            return None
+
+        products = []
+        for item in product_items:
+            try:
+                # Extract product information from HTML
+                product_link = first(item, self.PRODUCT_LINK)
+                if product_link is None and item.tag == 'a':
+                    product_link = item
+                
+                if product_link is None:
+                    continue
+
+                product_url = product_link.get('href', '')
+                if not product_url.startswith('http'):
+                    product_url = f"{self.base_url}{product_url}"
+                
+                # Extract product title
+                title_elem = first(item, self.ITEM_TITLE)
+                if title_elem is None:
+                    title_elem = first(product_link, self.LINK_TITLE)
+                
+                title = get_text(title_elem, strip=True) if title_elem is not None else product_link.get('title', 'N/A')
+                
+                if title == 'N/A':
+                    continue
+                
+                # Extract price
+                price_elem = first(item, self.PRICE)
+                price_text = get_text(price_elem, strip=True) if price_elem is not None else '$0'
+                price_match = re.search(r'\$?([\d,]+\.?\d*)', price_text)
+                price = float(price_match.group(1).replace(',', '')) if price_match else 0.0
+                
+                # Extract image
+                img_elem = first(item, self.IMG)
+                image_url = img_elem.get('src', 'N/A') if img_elem is not None else 'N/A'
+                if image_url and image_url.startswith('//'):
+                    image_url = f"https:{image_url}"
+                
+                # Extract brand/vendor if available
+                brand_elem = first(item, self.BRAND)
+                brand = get_text(brand_elem, strip=True) if brand_elem is not None else 'N/A'
+                
+                # Extract KVA for transformers
+                kva = self.extract_kva(title, {'collection': collection_name})
+                wattage = kva if kva != 'N/A' else self.extract_wattage(title)
+                
+                # Determine stock status
+                item_text = get_text(item).lower()
+                stock_status = 'Unknown'
+                if 'sold' in item_text or 'out of stock' in item_text:
+                    stock_status = 'Out of Stock'
+                elif 'in stock' in item_text:
+                    stock_status = 'In Stock'
+                
+                standardized_product = self.get_standardized_product(
+                    product_id='N/A',
+                    sku='N/A',
+                    title=title,
+                    brand=brand,
+                    wattage=wattage,
+                    efficiency='N/A',
+                    price=price,
+                    compare_price=0,
+                    stock_status=stock_status,
+                    inventory_qty='N/A',
+                    shipping_cost='Varies',
+                    product_url=product_url,
+                    image_url=image_url,
+                    specs={
+                        'product_type': collection_name.rstrip('s').capitalize(),
+                        'collection': collection_name
+                    }
+                )
+
+                products.append(standardized_product)
+
+            except Exception as e:
+                print(f"      ⚠️ Error parsing product: {e}")
+                continue
+
+        return products
+
     def scrape_products(self):
         """Scrape products from all collections"""
         all_products = []
@@ -150,7 +182,6 @@ class EssentialPartsScraper(BaseScraper):
         for collection in self.collections:
             collection_products = self.scrape_collection(collection)
             all_products.extend(collection_products)
-            time.sleep(2)
 
         return all_products
 
@@ -8,19 +8,59 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from base_scraper import BaseScraper
-from bs4 import BeautifulSoup
-import time
+from html_parsing import first, get_text, has_class, parse_html, parse_html_section, xpath
+import hashlib
 import re
+import time
 
 
 class GigaEnergyScraper(BaseScraper):
     """Scraper for Giga Energy transformers"""
 
+    request_delay = 1.5
+
+    # Re-fetch detail pages only for products whose listing card changed, and at
+    # least every details_max_age_days (in case a change does not show on the card)
+    incremental_details = os.environ.get('GIGA_INCREMENTAL_DETAILS', 'true').lower() == 'true'
+    details_max_age_days = float(os.environ.get('GIGA_DETAILS_MAX_AGE_DAYS', '7'))
+    DETAILS_STATE_FILE = 'giga_energy_details.json'
+
+    # Webflow shop page structure
+    PRODUCT_LINKS = xpath("//a[contains(@href, '/shop/')]")
+    CARD_LINKS = xpath(".//a[contains(@href, '/shop/')]")
+    CARD_PRICE = xpath(f".//span[{has_class('shop_price-number')}]")
+    # Levels a listing card may span above its link
+    max_card_depth = 6
+    TITLE = xpath("//title")
+    PRICE = xpath(f"//span[{has_class('shop_price-number')}]")
+    KVA_INPUT = xpath("//input[@name = 'kva_rating']")
+    PRODUCT_IMAGE = xpath("//img[contains(@src, 'cdn.prod.website-files.com')]")
+    # Bytes inside the price, KVA and image elements (the <title> precedes them)
+    PRODUCT_PAGE_MARKERS = (b'shop_price-number', b'kva_rating', b'cdn.prod.website-files.com')
+
     def __init__(self):
         super().__init__("Giga Energy")
         self.base_url = "https://www.gigaenergy.com"
         self.shop_url = f"{self.base_url}/shop"
 
+    def configure(self, settings):
+        """Apply performance settings, including incremental detail scraping"""
+        super().configure(settings)
+        if settings.get('incremental_details') is not None:
+            self.incremental_details = bool(settings['incremental_details'])
+        if settings.get('details_max_age_days') is not None:
+            self.details_max_age_days = float(settings['details_max_age_days'])
+
+    def listing_fingerprint(self, card_texts):
+        """
+        Fingerprint a product from its listing page card text (title, price, badges)
+        Returns an empty string when the listing shows no text for the product
+        """
+        text = ' '.join(' '.join(card_texts).split())
+        if not text:
+            return ''
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
     def parse_voltages_from_title(self, title):
         """
         Parse primary and secondary voltages from title.
@@ -59,69 +99,149 @@ class GigaEnergyScraper(BaseScraper):
             if not response:
                 return None
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extract title (full product description)
-            title_elem = soup.find('title')
-            title = title_elem.text.split('・')[0].strip() if title_elem else 'N/A'
-            
-            # Extract price from shop_price-number class
-            price_elem = soup.find('span', class_='shop_price-number')
-            price = 0.0
-            if price_elem:
-                price_text = price_elem.get_text(strip=True).replace(',', '')
-                try:
-                    price = float(price_text)
-                except ValueError:
-                    price = 0.0
-            
-            # Extract KVA rating from input field
-            kva_input = soup.find('input', {'name': 'kva_rating'})
-            kva = 'N/A'
-            if kva_input and kva_input.get('value'):
-                kva = f"{kva_input.get('value')} KVA"
-            else:
-                # Fallback: parse from title
-                kva_match = re.search(r'(\d+)\s*kVA', title, re.IGNORECASE)
-                if kva_match:
-                    kva = f"{kva_match.group(1)} KVA"
-            
-            # Parse voltages from title
-            primary_voltage, secondary_voltage = self.parse_voltages_from_title(title)
-            
-            # Extract image
-            img_elem = soup.find('img', src=lambda x: x and 'cdn.prod.website-files.com' in x if x else False)
-            image_url = 'N/A'
-            if img_elem:
-                image_url = img_elem.get('src', 'N/A')
-                if image_url and not image_url.startswith('http'):
-                    if image_url.startswith('//'):
-                        image_url = f"https:{image_url}"
-                    else:
-                        image_url = f"{self.base_url}{image_url}"
-            
-            # Create description from title
-            description = title
-            
-            return {
-                'title': title,
-                'price': price,
-                'kva': kva,
-                'primary_voltage': primary_voltage,
-                'secondary_voltage': secondary_voltage,
-                'description': description,
-                'image_url': image_url
-            }
+            return self.parse_product_page(response.content)
             
         except Exception as e:
             print(f"      ⚠️ Error scraping product details: {e}")
             return None
 
+    def parse_product_page(self, content):
+        """
+        Parse a product page
+
+        Args:
+            content: Page HTML
+
+        Returns:
+            Dict with title, price, KVA, voltages, description and image URL
+        """
+        title_text, price_text, kva_value, image_url = self.read_product_page(content)
+        
+        # Extract title (full product description)
+        title = title_text.split('・')[0].strip() if title_text is not None else 'N/A'
+        
+        # Extract price from shop_price-number class
+        price = 0.0
+        if price_text is not None:
+            try:
+                price = float(price_text.replace(',', ''))
+            except ValueError:
+                price = 0.0
+        
+        # Extract KVA rating from input field
+        kva = 'N/A'
+        if kva_value:
+            kva = f"{kva_value} KVA"
+        else:
+            # Fallback: parse from title
+            kva_match = re.search(r'(\d+)\s*kVA', title, re.IGNORECASE)
+            if kva_match:
+                kva = f"{kva_match.group(1)} KVA"
+        
+        # Parse voltages from title
+        primary_voltage, secondary_voltage = self.parse_voltages_from_title(title)
+        
+        # Extract image
+        if image_url is None:
+            image_url = 'N/A'
+        elif image_url and not image_url.startswith('http'):
+            if image_url.startswith('//'):
+                image_url = f"https:{image_url}"
+            else:
+                image_url = f"{self.base_url}{image_url}"
+        
+        # Create description from title
+        description = title
+        
+        return {
+            'title': title,
+            'price': price,
+            'kva': kva,
+            'primary_voltage': primary_voltage,
+            'secondary_voltage': secondary_voltage,
+            'description': description,
+            'image_url': image_url
+        }
+
+    def read_product_page(self, content):
+        """
+        Read the raw values a product page provides
+
+        Returns:
+            (<title> text, price text, kva_rating input value, product image src);
+            None for each element the page does not have
+        """
+        if self.partial_html_parsing:
+            # Partial parse: stop shortly after the price, KVA input and product image
+            document, whole_page = parse_html_section(content, until=self.PRODUCT_PAGE_MARKERS)
+            values = self.read_product_values(document)
+            if whole_page or None not in values:
+                return values
+            # A marker also appears outside its element: fall back to the whole page
+
+        return self.read_product_values(parse_html(content))
+
+    def read_product_values(self, document):
+        """Raw (title, price, KVA, image) values of a parsed product page, as read_product_page returns them"""
+        title_elem = first(document, self.TITLE)
+        price_elem = first(document, self.PRICE)
+        kva_input = first(document, self.KVA_INPUT)
+        img_elem = first(document, self.PRODUCT_IMAGE)
+        return (
+            get_text(title_elem) if title_elem is not None else None,
+            get_text(price_elem, strip=True) if price_elem is not None else None,
+            kva_input.get('value') if kva_input is not None else None,
+            img_elem.get('src', 'N/A') if img_elem is not None else None,
+        )
+
+    def parse_listing_page(self, content):
+        """
+        Parse a shop listing page
+
+        Args:
+            content: Page HTML
+
+        Returns:
+            List of (product link href, product card text) in page order, one per card
+        """
+        items = []
+        cards = set()
+        for link in self.PRODUCT_LINKS(parse_html(content)):
+            card = self.listing_card(link)
+            if card in cards:
+                continue
+            cards.add(card)
+            items.append((link.get('href', ''), get_text(card, ' ', strip=True)))
+        return items
+
+    def listing_card(self, link):
+        """
+        Product card element holding a listing link
+
+        The card is the nearest ancestor holding the price (shop_price-number), so
+        it includes anything else the listing shows next to the link. Failing that,
+        it is the outermost ancestor, at most max_card_depth levels up, whose shop
+        links all point to the same product: a page listing a single product must
+        not make the whole page its card.
+        """
+        href = link.get('href')
+        card = link
+        parent = card.getparent()
+        for _ in range(self.max_card_depth):
+            if self.CARD_PRICE(card) or parent is None:
+                break
+            if not all(a.get('href') == href for a in self.CARD_LINKS(parent)):
+                break
+            card = parent
+            parent = parent.getparent()
+        return card
+
     def scrape_products(self):
         """Scrape all transformer products from Giga Energy"""
         all_products = []
         page = 1
-        product_urls = set()
+        # Product URL -> listing card texts, in discovery order
+        product_urls = {}
         
         print(f"  📂 Scraping transformers from Giga Energy")
 
@@ -136,49 +256,67 @@ class GigaEnergyScraper(BaseScraper):
                 if not response:
                     break
 
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
                 # Find product links
-                product_items = soup.find_all('a', href=lambda x: x and '/shop/' in x if x else False)
+                product_items = self.parse_listing_page(response.content)
                 
                 if not product_items or len(product_items) == 0:
                     print(f"    ✅ Completed URL collection: {len(product_urls)} unique products")
                     break
 
                 found_new = False
-                for item in product_items:
-                    product_url = item.get('href', '')
+                for product_url, card_text in product_items:
                     if not product_url or product_url == '#':
                         continue
                         
                     if not product_url.startswith('http'):
                         product_url = f"{self.base_url}{product_url}"
                     
-                    # Only add unique URLs
-                    if product_url not in product_urls and '/shop/' in product_url:
-                        product_urls.add(product_url)
+                    if '/shop/' not in product_url:
+                        continue
+
+                    # Only add unique URLs (keep every card text for fingerprinting)
+                    if product_url not in product_urls:
+                        product_urls[product_url] = []
                         found_new = True
+                    product_urls[product_url].append(card_text)
 
                 if not found_new:
                     print(f"    ✅ Completed URL collection: {len(product_urls)} unique products")
                     break
 
                 page += 1
-                time.sleep(1)
 
             except Exception as e:
                 print(f"    ❌ Error on page {page}: {e}")
                 break
         
-        # Step 2: Scrape details from each product page
+        # Step 2: Scrape details from each new or changed product page
+        previous = self.load_state(self.DETAILS_STATE_FILE) if self.incremental_details else {}
+        state = {}
+        reused = 0
+        now = time.time()
+        max_age = self.details_max_age_days * 86400
+
         print(f"  📋 Scraping details for {len(product_urls)} products...")
-        for i, product_url in enumerate(product_urls, 1):
+        for i, (product_url, card_texts) in enumerate(product_urls.items(), 1):
             try:
                 print(f"    🔍 Product {i}/{len(product_urls)}...", end='\r')
-                
-                details = self.scrape_product_details(product_url)
+
+                fingerprint = self.listing_fingerprint(card_texts)
+                cached = previous.get(product_url)
+
+                if (fingerprint and cached and cached.get('fingerprint') == fingerprint
+                        and now - cached.get('fetched_at', 0) < max_age):
+                    details = cached['details']
+                    fetched_at = cached['fetched_at']
+                    reused += 1
+                else:
+                    details = self.scrape_product_details(product_url)
+                    fetched_at = now
                 if not details:
                     continue
+
+                state[product_url] = {'fingerprint': fingerprint, 'fetched_at': fetched_at, 'details': details}
                 
                 # Create standardized product
                 standardized_product = self.get_standardized_product(
@@ -205,13 +343,16 @@ class GigaEnergyScraper(BaseScraper):
                 )
 
                 all_products.append(standardized_product)
-                time.sleep(1.5)  # Be respectful with scraping
 
             except Exception as e:
                 print(f"\n      ⚠️ Error scraping {product_url}: {e}")
                 continue
         
-        print(f"\n    ✅ Successfully scraped {len(all_products)} products with full details")
+        if self.incremental_details:
+            self.save_state(self.DETAILS_STATE_FILE, state)
+
+        print(f"\n    ✅ Successfully scraped {len(all_products)} products with full details "
+              f"({reused} unchanged, reused from the last run)")
         return all_products
 
 
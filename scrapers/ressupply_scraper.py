@@ -9,14 +9,26 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from base_scraper import BaseScraper
-from bs4 import BeautifulSoup
-import time
+from html_parsing import get_text, has_class, parse_html, parse_html_section, xpath
+from manufacturer_matcher import default_matcher
 import re
 
 
 class RessupplyScraper(BaseScraper):
     """Scraper for RES Supply (ressupply.com)"""
 
+    # OpenCart category page structure
+    PRODUCT_CONTAINERS = xpath(f"//div[{has_class('product-layout')}]")
+    NEXT_PAGE_LINK = xpath("//a[count(*) = 0 and . = '>']")
+    # Product container parts: (tag, class) -> key, read in one pass per container
+    CONTAINER_PARTS = {
+        ('div', 'name'): 'name',
+        ('div', 'price-row'): 'price',
+        ('div', 'description'): 'description',
+        ('div', 'image'): 'image',
+        ('input', 'quantity'): 'quantity',
+    }
+
     def __init__(self):
         super().__init__("RES Supply")
         self.base_url = "https://ressupply.com"
@@ -33,7 +45,6 @@ class RessupplyScraper(BaseScraper):
             print(f"  📂 Scraping category: {category}")
             category_products = self.scrape_category(category)
             all_products.extend(category_products)
-            time.sleep(2)  # Be respectful to the server
 
         return all_products
 
@@ -55,71 +66,110 @@ class RessupplyScraper(BaseScraper):
             if not response:
                 break
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Find all product containers
-            product_containers = soup.find_all('div', class_='product-layout')
+            page_products, has_next_page = self.parse_category_page(response.content)
             
-            if not product_containers:
+            if page_products is None:
                 print(f"    ✅ No more products found. Processed {len(products)} products from this category.")
                 break
             
-            for container in product_containers:
-                try:
-                    product = self.extract_product_data(container)
-                    if product:
-                        products.append(product)
-                except Exception as e:
-                    print(f"    ⚠️ Error extracting product: {e}")
-                    continue
-            
-            # Check if there's a next page
-            next_page = soup.find('a', string='>')
-            if not next_page:
+            products.extend(page_products)
+            
+            if not has_next_page:
                 print(f"    ✅ Completed category. Total products: {len(products)}")
                 break
             
             page += 1
-            time.sleep(1)  # Rate limiting
         
         return products
 
+    def parse_category_page(self, content):
+        """
+        Parse one category page
+
+        Args:
+            content: Page HTML
+
+        Returns:
+            (products, has_next_page); products is None when the page lists no products
+        """
+        if self.partial_html_parsing:
+            # Partial parse: skip the head and menus before the first product container
+            document, _ = parse_html_section(content, start_at=b'product-layout')
+            if document is None:
+                return None, False
+        else:
+            document = parse_html(content)
+        
+        # Find all product containers
+        product_containers = self.PRODUCT_CONTAINERS(document)
+        if not product_containers:
+            return None, False
+        
+        products = []
+        for container in product_containers:
+            try:
+                product = self.extract_product_data(container)
+                if product:
+                    products.append(product)
+            except Exception as e:
+                print(f"    ⚠️ Error extracting product: {e}")
+                continue
+        
+        # Check if there's a next page
+        return products, bool(self.NEXT_PAGE_LINK(document))
+
+    def container_parts(self, container):
+        """
+        First element of each CONTAINER_PARTS kind inside a product container
+
+        One traversal of the container replaces a separate descendant search per part.
+        """
+        parts = {}
+        for element in container.iterdescendants('div', 'input'):
+            for class_name in element.get('class', '').split():
+                key = self.CONTAINER_PARTS.get((element.tag, class_name))
+                if key and key not in parts:
+                    parts[key] = element
+        return parts
+
     def extract_product_data(self, container):
         """Extract product data from a product container"""
         try:
+            parts = self.container_parts(container)
+
             # Extract product name and URL
-            name_element = container.find('div', class_='name')
-            if not name_element or not name_element.find('a'):
+            name_element = parts.get('name')
+            link = next(name_element.iterdescendants('a'), None) if name_element is not None else None
+            if link is None:
                 return None
             
-            link = name_element.find('a')
-            title = link.get_text(strip=True)
+            title = get_text(link, strip=True)
             product_url = link.get('href', '')
             
             # Extract price
-            price_container = container.find('div', class_='price-row')
+            price_container = parts.get('price')
             price = 0.0
-            if price_container:
-                price_text = price_container.get_text(strip=True)
+            if price_container is not None:
+                price_text = get_text(price_container, strip=True)
                 price_match = re.search(r'\$?([\d,]+\.?\d*)', price_text)
                 if price_match:
                     price = float(price_match.group(1).replace(',', ''))
             
             # Extract description (contains specs)
-            description_element = container.find('div', class_='description')
-            description = description_element.get_text(strip=True) if description_element else ''
+            description = get_text(parts.get('description'), strip=True)
             
             # Extract image URL
-            image_element = container.find('div', class_='image')
+            image_element = parts.get('image')
+            image_element = next(image_element.iterdescendants('img'), None) if image_element is not None else None
             image_url = 'N/A'
-            if image_element and image_element.find('img'):
-                image_url = image_element.find('img').get('src', 'N/A')
+            if image_element is not None:
+                image_url = image_element.get('src', 'N/A')
                 if image_url and not image_url.startswith('http'):
                     image_url = f"{self.base_url}/{image_url}"
             
             # Extract minimum quantity from data-min attribute
-            qty_input = container.find('input', class_='quantity')
-            min_qty = qty_input.get('data-min', '1') if qty_input else '1'
+            qty_input = parts.get('quantity')
+            min_qty = qty_input.get('data-min', '1') if qty_input is not None else '1'
             
             # Extract wattage from title or description
             wattage = self.extract_wattage(f"{title} {description}")
@@ -163,19 +213,16 @@ class RessupplyScraper(BaseScraper):
             return None
 
     def extract_brand(self, title):
-        """Extract brand name from product title"""
-        # Common solar panel brands
-        brands = [
-            'Jinko', 'JA Solar', 'REC', 'HT-SAAE', 'Canadian Solar', 
-            'Longi', 'Trina', 'SunPower', 'Q CELLS', 'Panasonic',
-            'Silfab', 'Aptos', 'Maxeon', 'Mission Solar'
-        ]
-        
-        title_upper = title.upper()
-        for brand in brands:
-            if brand.upper() in title_upper:
-                return brand
-        
+        """
+        Extract brand name from product title
+        Known manufacturers are returned under their canonical name (e.g. "Jinko" and
+        "JinkoSolar" -> "Jinko Solar", "Q CELLS" -> "Qcells"); otherwise the first word
+        """
+        # Known manufacturers and their aliases (e.g. "Q CELLS", "Hanwha Q.Cells")
+        brand, _ = default_matcher.find_in_text(title)
+        if brand:
+            return brand
+
         # If no known brand found, try to extract first word
         first_word = title.split()[0] if title.split() else 'N/A'
         return first_word
@@ -0,0 +1,214 @@
+"""
+Shopify Scraper
+Generic scraper for Shopify stores using the public products.json endpoints
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from base_scraper import BaseScraper
+from scraper_runner import put_until_stopped
+
+
+class ShopifyScraper(BaseScraper):
+    """
+    Scraper for any Shopify store
+
+    Collections are fetched concurrently and products are de-duplicated by
+    product and variant ID as they stream in, so a product listed in several
+    collections is emitted (and processed downstream) once, always under the
+    first of those collections in the configured order. With store_catalog
+    enabled, the store-wide /products.json is paged instead of the collections,
+    so overlapping collections are never fetched at all.
+    """
+
+    # Collections fetched at the same time (each one also pages in parallel windows)
+    collection_workers = int(os.environ.get('SHOPIFY_COLLECTION_WORKERS', '3'))
+
+    # Products per products.json page (Shopify's maximum); a shorter page is the last
+    page_size = 250
+
+    # Pages a collection fetched ahead of its turn may buffer before waiting
+    collection_pages_ahead = 2
+
+    # Collection name recorded in specs for products from the store-wide catalog
+    STORE_CATALOG = 'all'
+
+    def __init__(self, distributor_name: str, base_url: str, collections: Optional[List[str]] = None,
+                 max_pages: Optional[int] = None, store_catalog: bool = False):
+        """
+        Initialize Shopify scraper
+
+        Args:
+            distributor_name: Display name of the distributor
+            base_url: Store URL (e.g. https://shop.example.com)
+            collections: Collection handles to scrape
+            max_pages: Maximum pages fetched per collection (None = until empty)
+            store_catalog: Page the store-wide /products.json instead of collections
+        """
+        super().__init__(distributor_name)
+        self.base_url = base_url.rstrip('/')
+        self.collections = list(collections or [])
+        self.max_pages = max_pages
+        self.store_catalog = store_catalog
+
+    def _build_session(self) -> requests.Session:
+        """Build the session with enough pooled connections for concurrent collections"""
+        session = super()._build_session()
+        pool_size = self.max_connections_per_host * max(self.collection_workers, 1)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def configure(self, settings: Dict):
+        """Apply performance settings plus Shopify options (collections, max_pages, store_catalog, collection_workers)"""
+        if settings.get('collections'):
+            self.collections = list(settings['collections'])
+        if settings.get('max_pages') is not None:
+            self.max_pages = int(settings['max_pages']) or None
+        if settings.get('store_catalog') is not None:
+            self.store_catalog = bool(settings['store_catalog'])
+        if settings.get('shipping_cost'):
+            self.shopify_shipping_cost = settings['shipping_cost']
+
+        workers = settings.get('collection_workers')
+        super().configure(settings)
+
+        if workers and int(workers) != self.collection_workers:
+            self.collection_workers = int(workers)
+            self.session = self._build_session()
+
+    def iter_collection_pages(self, collection_name: str) -> Iterator[List[Dict]]:
+        """Yield raw products.json pages of a collection (or of the whole store for STORE_CATALOG)"""
+        if collection_name == self.STORE_CATALOG:
+            path = "/products.json"
+        else:
+            path = f"/collections/{collection_name}/products.json"
+
+        print(f"  📂 Scraping collection: {collection_name}")
+
+        pages = self.iter_paginated_json(
+            lambda page: f"{self.base_url}{path}?limit={self.page_size}&page={page}",
+            'products',
+            max_pages=self.max_pages,
+            page_size=self.page_size
+        )
+
+        count = 0
+        for page, collection_products in pages:
+            print(f"    📄 {collection_name} page {page}...")
+            count += len(collection_products)
+            yield collection_products
+
+        print(f"    ✅ Completed {collection_name}: {count} products")
+
+    def iter_collection(self, collection_name: str) -> Iterator[Dict]:
+        """Yield standardized products from a single collection, page by page"""
+        for collection_products in self.iter_collection_pages(collection_name):
+            for product in collection_products:
+                try:
+                    yield from self.parse_shopify_product(product, collection_name)
+                except Exception as e:
+                    print(f"    ⚠️ Error parsing product {product.get('id')}: {e}")
+
+    def scrape_collection(self, collection_name: str) -> List[Dict]:
+        """Scrape products from a specific collection"""
+        return list(self.iter_collection(collection_name))
+
+    def iter_raw_products(self) -> Iterator[tuple]:
+        """
+        Yield (collection, raw product) from all collections, fetched concurrently
+
+        Products come out in collection order whatever the fetch timing: each
+        collection has its own small page queue, read in the configured order, so
+        a product listed in several collections is always seen first under the
+        earliest one and its category is the same on every run. A collection
+        fetched ahead of its turn waits once its queue holds
+        collection_pages_ahead pages, which bounds memory.
+        """
+        collections = [self.STORE_CATALOG] if self.store_catalog else self.collections
+        if not collections:
+            return
+
+        pages = [queue.Queue(maxsize=max(self.collection_pages_ahead, 1)) for _ in collections]
+        done = object()
+        stop = threading.Event()
+
+        def fetch(index):
+            try:
+                for collection_products in self.iter_collection_pages(collections[index]):
+                    if not put_until_stopped(pages[index], collection_products, stop):
+                        return
+            except Exception as e:
+                print(f"    ⚠️ Error scraping collection {collections[index]}: {e}")
+            put_until_stopped(pages[index], done, stop)
+
+        # Collections start in order, so the one being read is always running
+        executor = ThreadPoolExecutor(max_workers=max(1, min(self.collection_workers, len(collections))))
+        for index in range(len(collections)):
+            executor.submit(fetch, index)
+
+        try:
+            for index, collection_name in enumerate(collections):
+                while True:
+                    collection_products = pages[index].get()
+                    if collection_products is done:
+                        break
+                    for product in collection_products:
+                        yield collection_name, product
+        finally:
+            # Consumer stopped early: fetchers give up their pending put, and
+            # collections not started yet never start
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_products(self) -> Iterator[Dict]:
+        """Yield standardized products, each product/variant only once across collections"""
+        seen_products = set()
+        seen_variants = set()
+        duplicates = 0
+
+        for collection_name, product in self.iter_raw_products():
+            product_id = product.get('id')
+            variants = product.get('variants', [])
+
+            # The same product from another collection: skip variants already emitted
+            if product_id in seen_products:
+                new_variants = [v for v in variants if v.get('id') not in seen_variants]
+                duplicates += len(variants) - len(new_variants)
+                if not new_variants:
+                    continue
+                product = dict(product, variants=new_variants)
+                variants = new_variants
+
+            seen_products.add(product_id)
+            seen_variants.update(v.get('id') for v in variants)
+
+            try:
+                yield from self.parse_shopify_product(product, collection_name)
+            except Exception as e:
+                print(f"    ⚠️ Error parsing product {product_id}: {e}")
+
+        if duplicates:
+            print(f"  🔁 Skipped {duplicates} duplicate variants listed in several collections")
+
+    def scrape_products(self) -> List[Dict]:
+        """Scrape products from all collections"""
+        return list(self.iter_products())
+
+
+if __name__ == "__main__":
+    url = sys.argv[1] if len(sys.argv) > 1 else "https://shop.solarcellzusa.com"
+    scraper = ShopifyScraper("Shopify Store", url, store_catalog=True, max_pages=2)
+    products = scraper.run()
+    print(f"\nScraped {len(products)} products")
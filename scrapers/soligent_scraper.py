@@ -4,10 +4,12 @@ Uses NetSuite SuiteCommerce REST API (no authentication required for public data
 """
 
 import os
-import time
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
 try:
@@ -24,6 +26,25 @@ class SoligentScraper(BaseScraper):
     CACHEABLE_API_URL = f"{BASE_URL}/api/cacheable/items"
     COMPANY_ID = "3510556"  # Found in page source
 
+    # Politeness rate for connect.soligent.net (roughly the old 0.5s/2s warehouse pacing)
+    request_delay = 0.6
+
+    # Warehouse inventory enrichment: parallel workers, request pacing (None = request_delay),
+    # whether to skip SKUs whose stock status did not change since the last run, and how
+    # old a stored breakdown may get before it is re-fetched anyway
+    inventory_workers = int(os.environ.get('SOLIGENT_INVENTORY_WORKERS', '4'))
+    inventory_request_delay = (
+        float(os.environ['SOLIGENT_INVENTORY_DELAY']) if os.environ.get('SOLIGENT_INVENTORY_DELAY') else None
+    )
+    refresh_changed_only = os.environ.get('SOLIGENT_REFRESH_CHANGED_ONLY', 'false').lower() == 'true'
+    inventory_max_age_days = float(os.environ.get('SOLIGENT_INVENTORY_MAX_AGE_DAYS', '1'))
+
+    INVENTORY_STATE_FILE = 'soligent_warehouse_inventory.json'
+
+    # Catalog paging: safety limit and retry rounds for individual failed offsets
+    MAX_PAGES = 100
+    page_retries = 3
+
     # Mapping of location internal IDs to warehouse names
     LOCATION_MAP = {
         "123": "Fontana, CA",
@@ -37,7 +58,17 @@ class SoligentScraper(BaseScraper):
 
     def __init__(self):
         super().__init__("Soligent")
-        self.session = requests.Session()
+
+    def _build_session(self) -> requests.Session:
+        """
+        Build the API session, with enough pooled keep-alive connections for the
+        warehouse inventory workers
+        """
+        session = requests.Session()
+        pool_size = max(self.max_connections_per_host, self.inventory_workers)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
 
         # Get credentials from environment
         username = os.environ.get('SOLIGENT_USERNAME', '')
@@ -45,14 +76,31 @@ class SoligentScraper(BaseScraper):
 
         # Set up basic auth if credentials are available
         if username and password:
-            self.session.auth = (username, password)
+            session.auth = (username, password)
 
-        self.session.headers.update({
+        session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Accept': 'application/json',
             'Referer': self.BASE_URL
         })
-        
+        return session
+
+    def configure(self, settings: Dict):
+        """Apply performance settings, including warehouse inventory enrichment options"""
+        workers = settings.get('inventory_workers')
+        if settings.get('inventory_request_delay') is not None:
+            self.inventory_request_delay = float(settings['inventory_request_delay'])
+        if settings.get('refresh_changed_only') is not None:
+            self.refresh_changed_only = bool(settings['refresh_changed_only'])
+        if settings.get('inventory_max_age_days') is not None:
+            self.inventory_max_age_days = float(settings['inventory_max_age_days'])
+
+        super().configure(settings)
+
+        if workers and int(workers) != self.inventory_workers:
+            self.inventory_workers = int(workers)
+            self.session = self._build_session()
+
     def _fetch_products_page(self, page: int = 1, page_size: int = 48, category_filter: str = "") -> Dict:
         """
         Fetch products from API
@@ -78,13 +126,53 @@ class SoligentScraper(BaseScraper):
             params['filter'] = category_filter
 
         try:
-            response = self.session.get(self.API_URL, params=params, timeout=15)
+            response = self.http_get(self.API_URL, params=params, timeout=15)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"  ❌ Error fetching page {page}: {e}")
             return {}
     
+    def _fetch_remaining_pages(self, total_pages: int, page_size: int) -> Dict[int, Dict]:
+        """
+        Fetch catalog pages 2..N with a bounded fan-out once the total is known
+        Failed offsets are retried individually instead of ending the whole crawl
+        Args:
+            total_pages: Total number of pages reported by the first response
+            page_size: Number of items per page
+        Returns:
+            Dictionary mapping page number to API response
+        """
+        last_page = min(total_pages, self.MAX_PAGES)
+        if total_pages > self.MAX_PAGES:
+            print(f"  ⚠️  Reached page limit ({self.MAX_PAGES}), skipping remaining pages")
+
+        pending = list(range(2, last_page + 1))
+        results = {}
+
+        for attempt in range(1, self.page_retries + 1):
+            if not pending:
+                break
+
+            print(f"\n📄 Fetching {len(pending)} pages with {self.max_connections_per_host} workers"
+                  f"{f' (retry {attempt - 1})' if attempt > 1 else ''}...")
+
+            with ThreadPoolExecutor(max_workers=max(self.max_connections_per_host, 1)) as executor:
+                responses = executor.map(
+                    lambda page_num: self._fetch_products_page(page=page_num, page_size=page_size),
+                    pending
+                )
+                for page_num, page_data in zip(pending, responses):
+                    if page_data and 'items' in page_data:
+                        results[page_num] = page_data
+
+            pending = [page_num for page_num in pending if page_num not in results]
+
+        if pending:
+            print(f"  ⚠️  No data returned for pages {pending} after {self.page_retries} attempts")
+
+        return results
+
     def _fetch_product_details(self, item_id: str) -> Optional[Dict]:
         """
         Fetch detailed product information
@@ -100,20 +188,20 @@ class SoligentScraper(BaseScraper):
         }
         
         try:
-            response = self.session.get(url, params=params, timeout=10)
+            response = self.http_get(url, params=params, timeout=10)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"    ⚠️  Error fetching details for item {item_id}: {e}")
             return None
     
-    def _fetch_warehouse_inventory(self, product_url_component: str) -> Dict[str, int]:
+    def _fetch_warehouse_inventory(self, product_url_component: str) -> Optional[Dict[str, int]]:
         """
         Fetch warehouse-specific inventory using the cacheable items API
         Args:
             product_url_component: URL component/slug for the product
         Returns:
-            Dictionary mapping warehouse locations to quantities
+            Dictionary mapping warehouse locations to quantities (None if the request failed)
         """
         try:
             params = {
@@ -129,7 +217,8 @@ class SoligentScraper(BaseScraper):
                 'use_pcv': 'T'
             }
 
-            response = self.session.get(self.CACHEABLE_API_URL, params=params, timeout=15)
+            response = self.http_get(self.CACHEABLE_API_URL, params=params, timeout=15,
+                                     delay=self.inventory_request_delay)
             response.raise_for_status()
             data = response.json()
 
@@ -155,7 +244,78 @@ class SoligentScraper(BaseScraper):
 
         except Exception as e:
             # Don't print errors for every product to avoid log spam
-            return {}
+            return None
+
+    def _apply_warehouse_inventory(self, product: Dict, warehouse_inv: Dict[str, int]):
+        """Copy warehouse inventory onto a parsed product (inventory qty and location fields)"""
+        if not warehouse_inv:
+            return
+
+        product['specs']['warehouse_inventory'] = warehouse_inv
+
+        # Calculate total inventory from warehouses
+        total_qty = sum(warehouse_inv.values())
+        product['inventory_qty'] = str(total_qty)
+
+        # Format for location field (show all warehouses)
+        location_str = "; ".join([f"{loc}: {qty}" for loc, qty in warehouse_inv.items()])
+        product['specs']['location'] = location_str
+
+    def _enrich_warehouse_inventory(self, products: List[Dict]):
+        """
+        Fetch warehouse inventory for all products with a bounded worker pool
+
+        In refresh_changed_only mode, products whose stock status matches the last
+        run reuse the stored warehouse breakdown and skip the API call entirely,
+        until it is inventory_max_age_days old.
+        """
+        previous = self.load_state(self.INVENTORY_STATE_FILE)
+        state = {}
+        to_fetch = []
+        now = time.time()
+        max_age = self.inventory_max_age_days * 86400
+
+        for product in products:
+            url_component = product.get('url_component', '')
+            if not url_component:
+                continue
+
+            cached = previous.get(url_component)
+            if (self.refresh_changed_only and cached
+                    and cached.get('stock_status') == product['stock_status']
+                    and now - cached.get('fetched_at', 0) < max_age):
+                self._apply_warehouse_inventory(product, cached.get('warehouse_inventory', {}))
+                state[url_component] = cached
+            else:
+                to_fetch.append(product)
+
+        reused = len(state)
+        if reused:
+            print(f"  ♻️  Reusing stored inventory for {reused} products with unchanged stock status")
+        print(f"  📍 Fetching {len(to_fetch)} products with {self.inventory_workers} workers...")
+
+        with ThreadPoolExecutor(max_workers=max(self.inventory_workers, 1)) as executor:
+            futures = {
+                executor.submit(self._fetch_warehouse_inventory, product['url_component']): product
+                for product in to_fetch
+            }
+
+            for idx, future in enumerate(as_completed(futures), 1):
+                product = futures[future]
+                warehouse_inv = future.result()
+
+                if warehouse_inv is not None:
+                    self._apply_warehouse_inventory(product, warehouse_inv)
+                    state[product['url_component']] = {
+                        'stock_status': product['stock_status'],
+                        'fetched_at': now,
+                        'warehouse_inventory': warehouse_inv
+                    }
+
+                if idx % 50 == 0 or idx == len(futures):
+                    print(f"  📍 Progress: {idx}/{len(futures)} products...")
+
+        self.save_state(self.INVENTORY_STATE_FILE, state)
     
     def _parse_product(self, item: Dict) -> Optional[Dict]:
         """
@@ -325,32 +485,18 @@ class SoligentScraper(BaseScraper):
             
             print(f"  ✅ Extracted {len(all_products)} products from page 1")
             
-            # Fetch remaining pages
-            for page_num in range(2, total_pages + 1):
-                print(f"\n📄 Processing page {page_num}/{total_pages}...")
-                
-                page_data = self._fetch_products_page(page=page_num, page_size=page_size)
-                
-                if not page_data or 'items' not in page_data:
-                    print(f"  ⚠️  No data returned for page {page_num}, stopping")
-                    break
-                
+            # Fetch remaining pages concurrently, then merge them in offset order
+            remaining_pages = self._fetch_remaining_pages(total_pages, page_size)
+
+            for page_num in sorted(remaining_pages):
                 page_products_count = 0
-                for item in page_data.get('items', []):
+                for item in remaining_pages[page_num].get('items', []):
                     product = self._parse_product(item)
                     if product:
                         all_products.append(product)
                         page_products_count += 1
                 
                 print(f"  ✅ Extracted {page_products_count} products from page {page_num}")
-                
-                # Respectful delay between requests
-                time.sleep(1)
-                
-                # Safety limit to avoid infinite loops
-                if page_num >= 100:
-                    print(f"  ⚠️  Reached page limit (100), stopping")
-                    break
             
             print(f"\n✅ Scraped {len(all_products)} total products from {self.distributor_name}")
             
@@ -366,29 +512,7 @@ class SoligentScraper(BaseScraper):
                 # TODO: Implement login authentication here
                 # self._login(soligent_username, soligent_password)
                 
-                for idx, product in enumerate(all_products, 1):
-                    if idx % 50 == 0 or idx == 1:
-                        print(f"  📍 Progress: {idx}/{len(all_products)} products...")
-
-                    url_component = product.get('url_component', '')
-                    if url_component:
-                        warehouse_inv = self._fetch_warehouse_inventory(url_component)
-                        if warehouse_inv:
-                            product['specs']['warehouse_inventory'] = warehouse_inv
-
-                            # Calculate total inventory from warehouses
-                            total_qty = sum(warehouse_inv.values())
-                            product['inventory_qty'] = str(total_qty)
-
-                            # Format for location field (show all warehouses)
-                            location_str = "; ".join([f"{loc}: {qty}" for loc, qty in warehouse_inv.items()])
-                            product['specs']['location'] = location_str
-
-                        # Be respectful with rate limiting
-                        if idx % 10 == 0:
-                            time.sleep(2)
-                        else:
-                            time.sleep(0.5)
+                self._enrich_warehouse_inventory(all_products)
                 
                 print(f"  ✅ Completed warehouse inventory fetch")
             else:
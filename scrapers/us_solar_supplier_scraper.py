@@ -7,97 +7,36 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from base_scraper import BaseScraper
-import time
+from scrapers.shopify_scraper import ShopifyScraper
 
 
-class USSolarSupplierScraper(BaseScraper):
+class USSolarSupplierScraper(ShopifyScraper):
     """Scraper for US Solar Supplier (Inverters)"""
 
     def __init__(self):
-        super().__init__("US Solar Supplier")
-        self.base_url = "https://ussolarsupplier.com"
-        # Product categories to scrape
-        self.collections = [
-            'inverters',
-            'solar-panels',
-            'racking-mounting'
-        ]
-
-    def scrape_collection(self, collection_name):
-        """Scrape products from a specific collection"""
-        products = []
-        page = 1
-
-        print(f"  📂 Scraping collection: {collection_name}")
-
-        while True:
-            try:
-                url = f"{self.base_url}/collections/{collection_name}/products.json?limit=250&page={page}"
-                
-                print(f"    📄 Page {page}...")
-                response = self.make_request(url)
-
-                if not response:
-                    break
-
-                data = response.json()
-                collection_products = data.get('products', [])
-
-                if not collection_products:
-                    print(f"    ✅ Completed {collection_name}: {len(products)} products")
-                    break
-
-                for product in collection_products:
-                    for variant in product.get('variants', []):
-                        brand = product.get('vendor', 'N/A')
-                        wattage = self.extract_wattage(product['title'])
-                        efficiency = self.extract_efficiency(product['title'], {})
-
-                        standardized_product = self.get_standardized_product(
-                            product_id=str(product['id']),
-                            sku=variant.get('sku', 'N/A'),
-                            title=product['title'],
-                            brand=brand,
-                            wattage=wattage,
-                            efficiency=efficiency,
-                            price=float(variant.get('price', 0)),
-                            compare_price=float(variant.get('compare_at_price', 0)) if variant.get('compare_at_price') else 0,
-                            stock_status='In Stock' if variant.get('available') else 'Out of Stock',
-                            inventory_qty=variant.get('inventory_quantity', 'N/A'),
-                            shipping_cost='Calculated at Checkout',
-                            product_url=f"{self.base_url}/products/{product['handle']}",
-                            image_url=product.get('images', [{}])[0].get('src', 'N/A') if product.get('images') else 'N/A',
-                            specs={
-                                'product_type': product.get('product_type', 'N/A'),
-                                'collection': collection_name,
-                                'tags': ', '.join(product.get('tags', [])),
-                                'weight': variant.get('weight', 'N/A'),
-                                'weight_unit': variant.get('weight_unit', 'N/A')
-                            }
-                        )
-
-                        products.append(standardized_product)
-
-                page += 1
-                time.sleep(1)
-
-            except Exception as e:
-                print(f"    ⚠️ Error on page {page}: {e}")
-                break
-
-        return products
-
-    def scrape_products(self):
-        """Scrape products from all collections"""
-        all_products = []
-        
-        for collection in self.collections:
-            collection_products = self.scrape_collection(collection)
-            all_products.extend(collection_products)
-            time.sleep(1)
-
-        return all_products
+        super().__init__(
+            "US Solar Supplier",
+            "https://ussolarsupplier.com",
+            # Product categories to scrape
+            collections=[
+                'inverters',
+                'solar-panels',
+                'racking-mounting'
+            ]
+        )
+
+    def shopify_product_specs(self, product, collection_name):
+        """Include product tags"""
+        specs = super().shopify_product_specs(product, collection_name)
+        specs['tags'] = ', '.join(product.get('tags', []))
+        return specs
+
+    def shopify_variant_specs(self, variant):
+        """Include shipping weight of each variant"""
+        return {
+            'weight': variant.get('weight', 'N/A'),
+            'weight_unit': variant.get('weight_unit', 'N/A')
+        }
 
 
 if __name__ == "__main__":
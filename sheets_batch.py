@@ -0,0 +1,381 @@
+"""
+Sheets Batch
+Collects the values and formatting of several worksheet tabs and sends them to the
+Google Sheets API in as few calls as possible
+"""
+
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from gspread.exceptions import APIError
+from gspread.utils import a1_range_to_grid_range, absolute_range_name, rowcol_to_a1
+
+from rate_limiter import TokenBucket
+from sheets_sync import SheetsSnapshot
+
+
+# Google Sheets allows 60 write requests per minute per user
+SHEETS_WRITE_QUOTA = int(os.environ.get('SHEETS_WRITE_QUOTA_PER_MINUTE', '60'))
+
+
+def quota_bucket(quota: int, window: float = 60.0) -> TokenBucket:
+    """
+    Token bucket keeping every window at or under a request quota
+
+    A burst of a tenth of the quota is allowed; the refill rate leaves room for it.
+    """
+    burst = max(1, quota // 10)
+    return TokenBucket(max(quota - burst, 1) / window, capacity=burst)
+
+
+# Process-wide write budget shared by every batch and thread
+sheets_write_bucket = quota_bucket(SHEETS_WRITE_QUOTA)
+
+# Responses worth retrying: quota exceeded and transient server errors
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def call_with_backoff(request: Callable, *args, bucket: Optional[TokenBucket] = None,
+                      max_retries: int = 5, base_delay: float = 1.0):
+    """
+    Call a Sheets API method, retrying quota and server errors with exponential backoff
+
+    Args:
+        request: gspread method to call
+        *args: Arguments of the method
+        bucket: Token bucket to acquire from before each attempt (None = unlimited)
+        max_retries: Retries after the first attempt
+        base_delay: Delay before the first retry in seconds, doubled on each retry
+                    (a Retry-After header takes precedence)
+
+    Returns:
+        The method's result
+    """
+    for attempt in range(max_retries + 1):
+        if bucket is not None:
+            bucket.acquire()
+        try:
+            return request(*args)
+        except APIError as e:
+            status = getattr(e.response, 'status_code', None) or e.code
+            if status not in RETRYABLE_STATUS or attempt == max_retries:
+                raise
+            retry_after = e.response.headers.get('Retry-After', '') if e.response is not None else ''
+            delay = float(retry_after) if retry_after.isdigit() else base_delay * 2 ** attempt
+            delay += random.uniform(0, base_delay)
+            print(f"  ⏳ Sheets API returned {status}, retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+class SheetsBatch:
+    """
+    Batched writer for worksheet tabs
+
+    Worksheet metadata (IDs and grid sizes) is fetched once when the batch is
+    created. flush() then sends every queued tab with:
+
+    - one spreadsheets.batchUpdate adding the tabs that do not exist yet (only when needed)
+    - one spreadsheets.values.batchUpdate with the rows of all tabs
+    - one spreadsheets.batchUpdate clearing stale cells and applying formatting,
+      frozen rows and column auto-resize for all tabs
+
+    Instead of clearing a tab before rewriting it, rows are padded to the tab
+    width and only the cells beyond the written block are cleared afterwards, so
+    the clear travels in the formatting call.
+
+    With diff sync, tabs are planned against a SheetsSnapshot: only the rows
+    that were inserted, updated or moved since the last write are sent, as
+    contiguous ranges (see SheetsSnapshot.plan). Without it, the snapshots of the
+    rewritten tabs are dropped, so a later diff-synced run does not plan
+    against a layout the sheet no longer has.
+
+    Values above max_cells_per_call are split by tab into several values calls,
+    sent in parallel. Every write call acquires from a shared token bucket sized
+    to the per-minute quota and is retried with exponential backoff on 429.
+    """
+
+    # Cells sent per values batchUpdate (larger runs are split between parallel calls)
+    max_cells_per_call = int(os.environ.get('SHEETS_MAX_CELLS_PER_CALL', '100000'))
+
+    # Values calls in flight at the same time
+    write_workers = int(os.environ.get('SHEETS_WRITE_WORKERS', '4'))
+
+    def __init__(self, spreadsheet, snapshot: Optional[SheetsSnapshot] = None,
+                 bucket: Optional[TokenBucket] = None, diff_sync: bool = True):
+        """
+        Initialize the batch
+
+        Args:
+            spreadsheet: gspread Spreadsheet to write to
+            snapshot: Snapshot of the last written tabs (None = rewrite whole tabs)
+            bucket: Write quota bucket (defaults to the process-wide sheets_write_bucket)
+            diff_sync: Send only changed rows; False rewrites whole tabs and drops
+                       their snapshots
+        """
+        self.spreadsheet = spreadsheet
+        self.snapshot = snapshot
+        self.diff_sync = diff_sync and snapshot is not None
+        self.bucket = bucket if bucket is not None else sheets_write_bucket
+        self.sheets = self.load_sheets()
+        self.api_calls = 1
+        self.tabs = []
+        self.new_sheets = {}
+
+    def load_sheets(self) -> Dict[str, Dict]:
+        """Fetch the properties of every worksheet, keyed by title (one API call)"""
+        metadata = call_with_backoff(self.spreadsheet.fetch_sheet_metadata, {'fields': 'sheets.properties'})
+        return {
+            sheet['properties']['title']: sheet['properties']
+            for sheet in metadata.get('sheets', [])
+        }
+
+    def write_tab(self, title: str, rows: List[List], formats: Optional[Dict[str, Dict]] = None,
+                  frozen_rows: int = 0, auto_resize: bool = False,
+                  min_rows: int = 1000, min_cols: int = 20,
+                  keys: Optional[List[str]] = None, volatile_columns: Sequence[int] = ()):
+        """
+        Queue the new content of a tab
+
+        Args:
+            title: Worksheet title (created on flush if missing)
+            rows: Cell values, starting at A1
+            formats: Cell formats by A1 range (as for gspread's Worksheet.format)
+            frozen_rows: Number of header rows to freeze
+            auto_resize: Auto-resize the written columns to fit their content
+            min_rows: Rows of a newly created worksheet
+            min_cols: Columns of a newly created worksheet
+            keys: Key of each row for diff sync, e.g. product IDs (defaults to row numbers)
+            volatile_columns: Columns whose changes alone do not resend a row (e.g. timestamps)
+        """
+        width = max((len(row) for row in rows), default=0)
+        values = [list(row) + [''] * (width - len(row)) for row in rows]
+
+        if title not in self.sheets and title not in self.new_sheets:
+            self.new_sheets[title] = {
+                'rowCount': max(min_rows, len(values)),
+                'columnCount': max(min_cols, width),
+            }
+
+        self.tabs.append({
+            'title': title,
+            'values': values,
+            'keys': unique_keys(keys) if keys is not None else [str(row) for row in range(len(values))],
+            'volatile_columns': tuple(volatile_columns),
+            'width': width,
+            'formats': formats or {},
+            'frozen_rows': frozen_rows,
+            'auto_resize': auto_resize,
+        })
+
+    def flush(self) -> int:
+        """
+        Send all queued tabs
+
+        Returns:
+            Number of Sheets API calls made by this batch (including the metadata fetch)
+        """
+        if not self.tabs:
+            return self.api_calls
+
+        if self.new_sheets:
+            self.add_sheets()
+
+        data = []
+        for tab in self.tabs:
+            data.extend(self.tab_value_ranges(tab))
+
+        # Until the write succeeds (for good without diff sync) the sheet may no longer match the snapshot
+        if self.snapshot is not None:
+            self.snapshot.forget(tab['title'] for tab in self.tabs)
+            self.snapshot.save()
+
+        if data:
+            self.send_values(data)
+
+        requests = []
+        for tab in self.tabs:
+            requests.extend(self.tab_requests(tab))
+        if requests:
+            self.write(self.spreadsheet.batch_update, {'requests': requests})
+
+        if self.diff_sync:
+            for tab in self.tabs:
+                properties = self.sheets[tab['title']]
+                self.snapshot.record(tab['title'], properties['sheetId'], tab['values'], tab['keys'],
+                                     tab['volatile_columns'])
+            self.snapshot.save()
+
+        print(f"  📤 Wrote {len(self.tabs)} tab(s) in {self.api_calls} Sheets API call(s)")
+        self.tabs = []
+        return self.api_calls
+
+    def write(self, request: Callable, body: Dict):
+        """Make one write call under the quota bucket, with backoff"""
+        self.api_calls += 1
+        return call_with_backoff(request, body, bucket=self.bucket)
+
+    def send_values(self, data: List[Dict]):
+        """Send value ranges in calls of at most max_cells_per_call cells, in parallel"""
+        chunks = [[]]
+        cells = 0
+        for value_range in data:
+            size = sum(len(row) for row in value_range['values'])
+            if chunks[-1] and cells + size > self.max_cells_per_call:
+                chunks.append([])
+                cells = 0
+            chunks[-1].append(value_range)
+            cells += size
+
+        bodies = [{'valueInputOption': 'USER_ENTERED', 'data': chunk} for chunk in chunks]
+        if len(bodies) == 1:
+            self.write(self.spreadsheet.values_batch_update, bodies[0])
+            return
+
+        self.api_calls += len(bodies)
+        workers = max(1, min(self.write_workers, len(bodies)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # list() re-raises the first failed call
+            list(executor.map(
+                lambda body: call_with_backoff(self.spreadsheet.values_batch_update, body, bucket=self.bucket),
+                bodies
+            ))
+
+    def add_sheets(self):
+        """Create all missing tabs in one batchUpdate and record their properties"""
+        requests = []
+        for title, grid in self.new_sheets.items():
+            print(f"  📄 Creating new worksheet: {title}")
+            requests.append({'addSheet': {'properties': {'title': title, 'gridProperties': grid}}})
+
+        response = self.write(self.spreadsheet.batch_update, {'requests': requests})
+
+        for reply in response.get('replies', []):
+            properties = reply['addSheet']['properties']
+            # New tabs hold no old content to clear
+            properties['gridProperties'] = {}
+            self.sheets[properties['title']] = properties
+        self.new_sheets = {}
+
+    def tab_value_ranges(self, tab: Dict) -> List[Dict]:
+        """
+        Value ranges to send for a tab: the whole tab, or only its changed rows
+
+        With diff sync, tab['values'] and tab['keys'] are reordered to the sheet layout.
+        """
+        title = tab['title']
+        plan = None
+        if self.diff_sync and tab['values']:
+            plan = self.snapshot.plan(title, self.sheets[title]['sheetId'], tab['values'], tab['keys'],
+                                      tab['volatile_columns'])
+
+        if plan is None:
+            return self.row_ranges(tab, 0, len(tab['values']) - 1)
+
+        layout, changed = plan
+        tab['values'] = [tab['values'][index] for index in layout]
+        tab['keys'] = [tab['keys'][index] for index in layout]
+
+        # One range per run of consecutive changed rows
+        ranges = []
+        for start, end in row_runs(sorted(changed)):
+            ranges.extend(self.row_ranges(tab, start, end))
+
+        print(f"  🔄 {title}: {len(changed)} of {len(layout)} rows changed ({len(ranges)} range(s))")
+        return ranges
+
+    def row_ranges(self, tab: Dict, start: int, end: int) -> List[Dict]:
+        """Value ranges for rows start..end of a tab, sliced to fit max_cells_per_call"""
+        width = max(tab['width'], 1)
+        step = max(1, self.max_cells_per_call // width)
+        ranges = []
+        for first in range(start, end + 1, step):
+            last = min(first + step - 1, end)
+            cells = f"{rowcol_to_a1(first + 1, 1)}:{rowcol_to_a1(last + 1, width)}"
+            ranges.append({
+                'range': absolute_range_name(tab['title'], cells),
+                'values': tab['values'][first:last + 1],
+            })
+        return ranges
+
+    def tab_requests(self, tab: Dict) -> List[Dict]:
+        """batchUpdate requests that finish a tab after its values were written"""
+        properties = self.sheets[tab['title']]
+        sheet_id = properties['sheetId']
+        grid = properties.get('gridProperties', {})
+        row_count = len(tab['values'])
+        requests = []
+
+        # Clear what the previous content left below and right of the new block
+        if grid.get('rowCount', 0) > row_count:
+            requests.append(self.clear_request({'sheetId': sheet_id, 'startRowIndex': row_count}))
+        if row_count and grid.get('columnCount', 0) > tab['width']:
+            requests.append(self.clear_request({
+                'sheetId': sheet_id,
+                'startRowIndex': 0,
+                'endRowIndex': row_count,
+                'startColumnIndex': tab['width'],
+            }))
+
+        for a1_range, cell_format in tab['formats'].items():
+            requests.append({
+                'repeatCell': {
+                    'range': a1_range_to_grid_range(a1_range, sheet_id),
+                    'cell': {'userEnteredFormat': cell_format},
+                    'fields': f"userEnteredFormat({','.join(cell_format)})",
+                }
+            })
+
+        if tab['frozen_rows']:
+            requests.append({
+                'updateSheetProperties': {
+                    'properties': {'sheetId': sheet_id, 'gridProperties': {'frozenRowCount': tab['frozen_rows']}},
+                    'fields': 'gridProperties.frozenRowCount',
+                }
+            })
+
+        if tab['auto_resize'] and tab['width']:
+            requests.append({
+                'autoResizeDimensions': {
+                    'dimensions': {
+                        'sheetId': sheet_id,
+                        'dimension': 'COLUMNS',
+                        'startIndex': 0,
+                        'endIndex': tab['width'],
+                    }
+                }
+            })
+
+        return requests
+
+    @staticmethod
+    def clear_request(grid_range: Dict) -> Dict:
+        """batchUpdate request clearing the values (not the formatting) of a range"""
+        return {'updateCells': {'range': grid_range, 'fields': 'userEnteredValue'}}
+
+
+def unique_keys(keys: List[str]) -> List[str]:
+    """Row keys made unique by numbering repeats (variants sharing a product ID, ...)"""
+    seen = {}
+    unique = []
+    for key in keys:
+        count = seen.get(key, 0)
+        seen[key] = count + 1
+        unique.append(f"{key}#{count}" if count else str(key))
+    return unique
+
+
+def row_runs(rows: List[int]) -> Iterator[Tuple[int, int]]:
+    """(first, last) of each run of consecutive numbers in a sorted list"""
+    start = previous = None
+    for row in rows:
+        if previous is not None and row == previous + 1:
+            previous = row
+            continue
+        if start is not None:
+            yield start, previous
+        start = previous = row
+    if start is not None:
+        yield start, previous
@@ -9,18 +9,120 @@ from google.oauth2.credentials import Credentials
 import json
 import os
 import requests
-from typing import List, Dict
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional
+from datetime import datetime, timezone
+
+from product_identity import ProductIdentityIndex
+from sheets_batch import SheetsBatch
+from sheets_sync import SheetsSnapshot
+
+
+def parse_expiry(value) -> Optional[datetime]:
+    """Token expiry (ISO 8601 string) as the naive UTC datetime google-auth expects"""
+    if not value:
+        return None
+    try:
+        expiry = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if expiry.tzinfo is not None:
+        expiry = expiry.astimezone(timezone.utc).replace(tzinfo=None)
+    return expiry
+
+
+class SheetsClientPool:
+    """
+    Authorized gspread client and spreadsheet IDs kept across runs of a long-lived process
+
+    A warm run reuses the client as long as its credentials are valid (refreshable
+    and service account credentials renew themselves; a bare access token is reused
+    until its expiry, or credentials_ttl when the expiry is unknown), and opens
+    spreadsheets by their remembered ID instead of searching Drive by name.
+    """
+
+    # Reuse limit for access tokens without a known expiry
+    credentials_ttl = float(os.environ.get('SHEETS_CREDENTIALS_TTL_MINUTES', '50')) * 60
+
+    def __init__(self):
+        self.client = None
+        self.credentials = None
+        self.authorized_at = 0.0
+        self.spreadsheet_ids: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def get_client(self, get_credentials: Callable):
+        """
+        Get the cached client, authorizing a new one if there is none or its credentials expired
+
+        Args:
+            get_credentials: Called to obtain fresh credentials when needed
+        """
+        with self.lock:
+            if self.client is not None and self.credentials_valid():
+                print("  ♻️ Reusing Google Sheets client")
+                return self.client
+
+            credentials = get_credentials()
+            self.client = gspread.authorize(credentials)
+            self.credentials = credentials
+            self.authorized_at = time.monotonic()
+            return self.client
+
+    def credentials_valid(self) -> bool:
+        """Whether the cached credentials can still be used"""
+        credentials = self.credentials
+        if isinstance(credentials, ServiceAccountCredentials):
+            return True
+        if all(getattr(credentials, name, None) for name in ('refresh_token', 'client_id', 'client_secret')):
+            return True
+        if getattr(credentials, 'expiry', None) is not None:
+            return not credentials.expired
+        return time.monotonic() - self.authorized_at < self.credentials_ttl
+
+    def reset(self):
+        """Drop the cached client and IDs (e.g. after an authorization failure)"""
+        with self.lock:
+            self.client = None
+            self.credentials = None
+            self.spreadsheet_ids.clear()
 
 
 class SheetsManager:
     """Manages Google Sheets with multiple tabs for different distributors"""
 
-    def __init__(self, sheet_name: str):
+    def __init__(self, sheet_name: str, diff_sync: bool = False,
+                 client_pool: Optional[SheetsClientPool] = None):
+        """
+        Initialize the manager and connect to the spreadsheet
+
+        Args:
+            sheet_name: Name of the Google Sheet
+            diff_sync: Send only the rows changed since the last write (see SheetsSnapshot)
+            client_pool: Client pool of a long-lived process (None = authorize and look up anew)
+        """
         self.sheet_name = sheet_name
+        self.client_pool = client_pool
         self.client = None
         self.spreadsheet = None
+        self.diff_sync = diff_sync
+        self._batch = None
         self.connect()
+        # Loaded even without diff sync, so full rewrites invalidate the tabs they replace
+        self.snapshot = SheetsSnapshot(self.spreadsheet.id)
+
+    @property
+    def timestamp_header(self) -> str:
+        """
+        Header of the per-row timestamp column
+
+        With diff sync a row is only rewritten when its other values change, so its
+        timestamp is when the product last changed; the time of the run itself is
+        on the Summary tab.
+        """
+        return 'Last Changed' if self.diff_sync else 'Last Updated'
 
     def get_replit_credentials(self):
         """Get OAuth credentials from Replit's Google Sheets connector"""
@@ -52,6 +154,8 @@ class SheetsManager:
                     oauth_data = settings.get('oauth', {})
                     credentials_data = oauth_data.get('credentials', {})
                     
+                    expiry = parse_expiry(settings.get('expires_at'))
+
                     if credentials_data:
                         return Credentials(
                             token=credentials_data.get('access_token'),
@@ -59,53 +163,62 @@ class SheetsManager:
                             token_uri='https://oauth2.googleapis.com/token',
                             client_id=credentials_data.get('client_id'),
                             client_secret=credentials_data.get('client_secret'),
-                            scopes=credentials_data.get('scopes')
+                            scopes=credentials_data.get('scopes'),
+                            expiry=expiry
                         )
                     
                     access_token = settings.get('access_token')
                     if access_token:
-                        return Credentials(token=access_token)
+                        return Credentials(token=access_token, expiry=expiry)
                         
         except Exception as e:
             print(f"  ⚠️ Could not get Replit connector credentials: {e}")
         
         return None
 
+    def get_credentials(self):
+        """Get credentials: Replit's Google Sheets integration first, then a service account"""
+        creds = self.get_replit_credentials()
+
+        if creds:
+            print("  🔗 Using Replit Google Sheets integration...")
+            return creds
+
+        # Fallback to traditional service account credentials
+        print("  🔗 Using service account credentials...")
+        scope = [
+            'https://spreadsheets.google.com/feeds',
+            'https://www.googleapis.com/auth/drive'
+        ]
+
+        creds_json = os.environ.get('GOOGLE_CREDENTIALS')
+        if creds_json:
+            creds_dict = json.loads(creds_json)
+            return ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+        return ServiceAccountCredentials.from_json_keyfile_name('credentials.json', scope)
+
     def connect(self):
         """Connect to Google Sheets using credentials"""
         try:
-            # Try Replit's Google Sheets integration first
-            creds = self.get_replit_credentials()
-            
-            if creds:
-                print("  🔗 Using Replit Google Sheets integration...")
-                self.client = gspread.authorize(creds)
+            if self.client_pool is not None:
+                self.client = self.client_pool.get_client(self.get_credentials)
+                self.spreadsheet = self.open_cached_spreadsheet()
             else:
-                # Fallback to traditional service account credentials
-                print("  🔗 Using service account credentials...")
-                scope = [
-                    'https://spreadsheets.google.com/feeds',
-                    'https://www.googleapis.com/auth/drive'
-                ]
-
-                creds_json = os.environ.get('GOOGLE_CREDENTIALS')
-                if creds_json:
-                    creds_dict = json.loads(creds_json)
-                    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
-                else:
-                    creds = ServiceAccountCredentials.from_json_keyfile_name('credentials.json', scope)
+                self.client = gspread.authorize(self.get_credentials())
 
-                self.client = gspread.authorize(creds)
-            
             # Try to open the spreadsheet or create it
-            try:
-                self.spreadsheet = self.client.open(self.sheet_name)
-                print(f"✅ Connected to existing Google Sheet: {self.sheet_name}")
-            except gspread.exceptions.SpreadsheetNotFound:
-                print(f"  📄 Spreadsheet '{self.sheet_name}' not found. Creating new spreadsheet...")
-                self.spreadsheet = self.client.create(self.sheet_name)
-                print(f"✅ Created and connected to new Google Sheet: {self.sheet_name}")
-                print(f"  🔗 Share this sheet with others or view it at: https://docs.google.com/spreadsheets/d/{self.spreadsheet.id}")
+            if self.spreadsheet is None:
+                try:
+                    self.spreadsheet = self.client.open(self.sheet_name)
+                    print(f"✅ Connected to existing Google Sheet: {self.sheet_name}")
+                except gspread.exceptions.SpreadsheetNotFound:
+                    print(f"  📄 Spreadsheet '{self.sheet_name}' not found. Creating new spreadsheet...")
+                    self.spreadsheet = self.client.create(self.sheet_name)
+                    print(f"✅ Created and connected to new Google Sheet: {self.sheet_name}")
+                    print(f"  🔗 Share this sheet with others or view it at: https://docs.google.com/spreadsheets/d/{self.spreadsheet.id}")
+
+            if self.client_pool is not None:
+                self.client_pool.spreadsheet_ids[self.sheet_name] = self.spreadsheet.id
 
         except gspread.exceptions.SpreadsheetNotFound as e:
             print(f"❌ Error: Spreadsheet '{self.sheet_name}' not found.")
@@ -113,179 +226,227 @@ class SheetsManager:
             raise
         except Exception as e:
             print(f"❌ Error connecting to Google Sheet: {e}")
+            if self.client_pool is not None:
+                self.client_pool.reset()
             raise
 
-    def get_or_create_worksheet(self, worksheet_name: str, rows: int = 1000, cols: int = 20):
-        """Get existing worksheet or create new one"""
+    def open_cached_spreadsheet(self):
+        """Open the spreadsheet by the ID remembered in the client pool (None if unknown or gone)"""
+        spreadsheet_id = self.client_pool.spreadsheet_ids.get(self.sheet_name)
+        if not spreadsheet_id:
+            return None
+        try:
+            spreadsheet = self.client.open_by_key(spreadsheet_id)
+            print(f"✅ Connected to existing Google Sheet: {self.sheet_name} (cached ID)")
+            return spreadsheet
+        except (gspread.exceptions.SpreadsheetNotFound, gspread.exceptions.APIError) as e:
+            print(f"  ⚠️ Cached spreadsheet ID no longer usable ({e}), looking it up by name...")
+            self.client_pool.spreadsheet_ids.pop(self.sheet_name, None)
+            return None
+
+    @contextmanager
+    def batch(self):
+        """
+        Queue every tab written inside the block and send them together on exit
+
+        Worksheet metadata is fetched once for the whole block, and all tabs go out
+        in one values batchUpdate plus one formatting batchUpdate (see SheetsBatch).
+        """
+        self._batch = SheetsBatch(self.spreadsheet, self.snapshot, diff_sync=self.diff_sync)
         try:
-            worksheet = self.spreadsheet.worksheet(worksheet_name)
-            print(f"  📄 Using existing worksheet: {worksheet_name}")
-            return worksheet
-        except gspread.exceptions.WorksheetNotFound:
-            print(f"  📄 Creating new worksheet: {worksheet_name}")
-            worksheet = self.spreadsheet.add_worksheet(title=worksheet_name, rows=rows, cols=cols)
-            return worksheet
+            yield self._batch
+            self._batch.flush()
+        finally:
+            self._batch = None
+
+    def write_tab(self, title: str, rows: List[List], **layout) -> bool:
+        """
+        Write a tab now, or queue it when inside batch()
+
+        Args:
+            title: Worksheet title
+            rows: Cell values, starting at A1
+            **layout: Formatting options of SheetsBatch.write_tab
+
+        Returns:
+            True if the tab was written, False if it was queued
+        """
+        if self._batch is not None:
+            self._batch.write_tab(title, rows, **layout)
+            print(f"  📝 Queued {title} tab")
+            return False
+
+        batch = SheetsBatch(self.spreadsheet, self.snapshot, diff_sync=self.diff_sync)
+        batch.write_tab(title, rows, **layout)
+        batch.flush()
+        return True
+
+    def distributor_headers(self) -> List[str]:
+        """Headers of a distributor tab (24 columns: A to X)"""
+        return [
+            'Distributor',
+            'Category',
+            'Product Title',
+            'Brand',
+            'SKU',
+            'Wattage/KVA',
+            'Primary Voltage',
+            'Secondary Voltage',
+            'Efficiency',
+            'Quantity',
+            'Total Price',
+            'Price Per Unit',
+            'Compare Price',
+            'Discount %',
+            'Stock Status',
+            'Inventory Qty',
+            'Location/Warehouse',
+            'Dimensions',
+            'Domestic Content',
+            'Shipping Cost',
+            'Product URL',
+            'Image URL',
+            'Product ID',
+            self.timestamp_header
+        ]
+
+    @staticmethod
+    def distributor_row(product: Dict) -> List:
+        """Distributor tab row of a product"""
+        # Calculate discount
+        discount = 0
+        if product.get('compare_price', 0) > 0:
+            discount = round(
+                ((product['compare_price'] - product['price']) / product['compare_price']) * 100,
+                2
+            )
+
+        # Get quantity and calculate per-unit price
+        quantity = product.get('quantity', 1)
+        total_price = product.get('price', 0)
+        price_per_unit = product.get('price_per_unit', total_price)
+
+        # Get voltage specs from product specs
+        primary_voltage = product.get('specs', {}).get('primary_voltage', 'N/A')
+        secondary_voltage = product.get('specs', {}).get('secondary_voltage', 'N/A')
+
+        # Get new fields: location, dimensions, and domestic content
+        location = product.get('specs', {}).get('location', 'N/A')
+        dimensions = product.get('specs', {}).get('dimensions', 'N/A')
+        domestic_content = product.get('specs', {}).get('domestic_content', 'N/A')
+
+        return [
+            product.get('distributor', 'N/A'),
+            product.get('category', 'N/A'),
+            product.get('title', 'N/A'),
+            product.get('brand', 'N/A'),
+            product.get('sku', 'N/A'),
+            product.get('wattage', 'N/A'),
+            primary_voltage,
+            secondary_voltage,
+            product.get('efficiency', 'N/A'),
+            quantity if quantity > 1 else '',
+            f"${total_price:.2f}",
+            f"${price_per_unit:.2f}" if quantity > 1 else '',
+            f"${product.get('compare_price', 0):.2f}" if product.get('compare_price', 0) > 0 else '',
+            f"{discount}%" if discount > 0 else '',
+            product.get('stock_status', 'Unknown'),
+            product.get('inventory_qty', 'N/A'),
+            location,
+            dimensions,
+            domestic_content,
+            product.get('shipping_cost', 'N/A'),
+            product.get('product_url', 'N/A'),
+            product.get('image_url', 'N/A'),
+            product.get('product_id', 'N/A'),
+            product.get('last_updated', '')
+        ]
+
+    @staticmethod
+    def distributor_row_key(product: Dict) -> str:
+        """Diff sync key of a product's row (listings without product ID and SKU, e.g. Giga Energy, are keyed by URL)"""
+        return ProductIdentityIndex.listing_key(product)
 
     def update_distributor_tab(self, distributor_name: str, products: List[Dict]):
         """Update a distributor's tab with product data"""
-        print(f"\n📊 Updating {distributor_name} tab with {len(products)} products...")
-
-        if not products:
+        self.write_distributor_tab(
+            distributor_name,
+            [self.distributor_row(product) for product in products],
+            [self.distributor_row_key(product) for product in products]
+        )
+
+    def write_distributor_tab(self, distributor_name: str, rows: List[List], keys: List[str]):
+        """
+        Write a distributor's tab from prepared rows
+
+        Args:
+            distributor_name: Tab title
+            rows: distributor_row() of each product
+            keys: distributor_row_key() of each product
+        """
+        print(f"\n📊 Updating {distributor_name} tab with {len(rows)} products...")
+
+        if not rows:
             print(f"  ⚠️ No products to update for {distributor_name}")
             return
 
         try:
-            worksheet = self.get_or_create_worksheet(distributor_name)
-            worksheet.clear()
-
-            # Define headers with new columns (24 total)
-            headers = [
-                'Distributor',
-                'Category',
-                'Product Title',
-                'Brand',
-                'SKU',
-                'Wattage/KVA',
-                'Primary Voltage',
-                'Secondary Voltage',
-                'Efficiency',
-                'Quantity',
-                'Total Price',
-                'Price Per Unit',
-                'Compare Price',
-                'Discount %',
-                'Stock Status',
-                'Inventory Qty',
-                'Location/Warehouse',
-                'Dimensions',
-                'Domestic Content',
-                'Shipping Cost',
-                'Product URL',
-                'Image URL',
-                'Product ID',
-                'Last Updated'
-            ]
-
-            rows = [headers]
-
-            for product in products:
-                # Calculate discount
-                discount = 0
-                if product.get('compare_price', 0) > 0:
-                    discount = round(
-                        ((product['compare_price'] - product['price']) / product['compare_price']) * 100,
-                        2
-                    )
-
-                # Get quantity and calculate per-unit price
-                quantity = product.get('quantity', 1)
-                total_price = product.get('price', 0)
-                price_per_unit = product.get('price_per_unit', total_price)
-
-                # Get voltage specs from product specs
-                primary_voltage = product.get('specs', {}).get('primary_voltage', 'N/A')
-                secondary_voltage = product.get('specs', {}).get('secondary_voltage', 'N/A')
-                
-                # Get new fields: location, dimensions, and domestic content
-                location = product.get('specs', {}).get('location', 'N/A')
-                dimensions = product.get('specs', {}).get('dimensions', 'N/A')
-                domestic_content = product.get('specs', {}).get('domestic_content', 'N/A')
-                
-                row = [
-                    product.get('distributor', 'N/A'),
-                    product.get('category', 'N/A'),
-                    product.get('title', 'N/A'),
-                    product.get('brand', 'N/A'),
-                    product.get('sku', 'N/A'),
-                    product.get('wattage', 'N/A'),
-                    primary_voltage,
-                    secondary_voltage,
-                    product.get('efficiency', 'N/A'),
-                    quantity if quantity > 1 else '',
-                    f"${total_price:.2f}",
-                    f"${price_per_unit:.2f}" if quantity > 1 else '',
-                    f"${product.get('compare_price', 0):.2f}" if product.get('compare_price', 0) > 0 else '',
-                    f"{discount}%" if discount > 0 else '',
-                    product.get('stock_status', 'Unknown'),
-                    product.get('inventory_qty', 'N/A'),
-                    location,
-                    dimensions,
-                    domestic_content,
-                    product.get('shipping_cost', 'N/A'),
-                    product.get('product_url', 'N/A'),
-                    product.get('image_url', 'N/A'),
-                    product.get('product_id', 'N/A'),
-                    product.get('last_updated', '')
-                ]
-                rows.append(row)
-
-            # Update sheet with all data
-            worksheet.update('A1', rows, value_input_option='USER_ENTERED')
-
-            # Format headers (now 24 columns: A to X)
-            worksheet.format('A1:X1', {
-                "textFormat": {"bold": True},
-                "backgroundColor": {"red": 0.2, "green": 0.5, "blue": 0.8},
-                "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}}
-            })
-
-            # Freeze header row
-            worksheet.freeze(rows=1)
-            
-            # Auto-resize columns for better readability
-            worksheet.columns_auto_resize(0, len(headers) - 1)
+            headers = self.distributor_headers()
+
+            # Write all data with the header format (24 columns: A to X), frozen
+            # header row and auto-resized columns for better readability
+            written = self.write_tab(
+                distributor_name,
+                [headers] + rows,
+                formats={
+                    'A1:X1': {
+                        "textFormat": {"bold": True},
+                        "backgroundColor": {"red": 0.2, "green": 0.5, "blue": 0.8},
+                        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}}
+                    }
+                },
+                frozen_rows=1,
+                auto_resize=True,
+                # Rows are matched by product across runs; a new timestamp alone is not resent
+                keys=['header'] + list(keys),
+                volatile_columns=[headers.index(self.timestamp_header)]
+            )
 
-            print(f"  ✅ Successfully updated {distributor_name} tab with enhanced data")
+            if written:
+                print(f"  ✅ Successfully updated {distributor_name} tab with enhanced data")
 
         except Exception as e:
             print(f"  ❌ Error updating {distributor_name} tab: {e}")
 
-    def create_comparison_tab(self, all_products: List[Dict]):
+    def group_best_deals(self, all_products: Iterable[Dict],
+                         identity_index: Optional[ProductIdentityIndex] = None) -> List[Dict]:
+        """
+        Find the best-priced product of each product group in a single pass
+        Only the running best deal and in-stock price range are kept per group,
+        so the product stream is never materialized
+
+        Args:
+            all_products: Products from all distributors
+            identity_index: Product identity index (the persistent default is
+                            loaded and saved when not given)
+        """
+        groups = BestDealGroups(identity_index)
+        for product in all_products:
+            groups.add(product)
+        return groups.best_deals()
+
+    def create_comparison_tab(self, all_products: Iterable[Dict]):
         """Create master comparison tab showing best prices"""
         print(f"\n📊 Creating Master Comparison tab...")
+        self.write_comparison_tab(self.group_best_deals(all_products))
 
-        if not all_products:
+    def write_comparison_tab(self, best_deals: List[Dict]):
+        """Write the master comparison tab from the best deal of each product group"""
+        if not best_deals:
             print(f"  ⚠️ No products to compare")
             return
 
         try:
-            worksheet = self.get_or_create_worksheet("🏆 Best Prices", rows=2000, cols=20)
-            worksheet.clear()
-
-            # Group products by similar titles (fuzzy matching would be better)
-            product_groups = {}
-
-            for product in all_products:
-                # Create a simplified key based on wattage and brand
-                key = f"{product.get('brand', 'unknown')}_{product.get('wattage', 'unknown')}"
-
-                if key not in product_groups:
-                    product_groups[key] = []
-
-                product_groups[key].append(product)
-
-            # Find best prices for each product group
-            best_deals = []
-
-            for key, products in product_groups.items():
-                if not products:
-                    continue
-
-                # Sort by price (lowest first)
-                sorted_products = sorted(
-                    [p for p in products if p.get('price', 0) > 0],
-                    key=lambda x: x.get('price', float('inf'))
-                )
-
-                if sorted_products:
-                    best_deal = sorted_products[0]
-                    all_prices = [p for p in sorted_products if p.get('stock_status') == 'In Stock']
-
-                    best_deal['competitors_count'] = len(all_prices)
-                    best_deal['price_range'] = f"${min(p['price'] for p in all_prices):.2f} - ${max(p['price'] for p in all_prices):.2f}" if len(all_prices) > 1 else f"${best_deal['price']:.2f}"
-
-                    best_deals.append(best_deal)
-
             # Sort by price (best deals first)
             best_deals.sort(key=lambda x: x.get('price', float('inf')))
 
@@ -304,7 +465,7 @@ class SheetsManager:
                 'Price Range',
                 'Competitors',
                 'Product URL',
-                'Last Updated'
+                self.timestamp_header
             ]
 
             rows = [headers]
@@ -332,25 +493,27 @@ class SheetsManager:
                 ]
                 rows.append(row)
 
-            # Update sheet
-            worksheet.update('A1', rows, value_input_option='USER_ENTERED')
-
             # Format headers (now 14 columns: A to N)
-            worksheet.format('A1:N1', {
-                "textFormat": {"bold": True, "fontSize": 11},
-                "backgroundColor": {"red": 0.85, "green": 0.65, "blue": 0.13},
-                "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}}
-            })
+            formats = {
+                'A1:N1': {
+                    "textFormat": {"bold": True, "fontSize": 11},
+                    "backgroundColor": {"red": 0.85, "green": 0.65, "blue": 0.13},
+                    "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}}
+                }
+            }
 
             # Highlight top 10 deals
             if len(best_deals) >= 10:
-                worksheet.format('A2:N11', {
+                formats['A2:N11'] = {
                     "backgroundColor": {"red": 0.95, "green": 0.95, "blue": 0.7}
-                })
+                }
 
-            worksheet.freeze(rows=1)
+            written = self.write_tab("🏆 Best Prices", rows, formats=formats, frozen_rows=1,
+                                     min_rows=2000, min_cols=20,
+                                     volatile_columns=[headers.index(self.timestamp_header)])
 
-            print(f"  ✅ Created comparison tab with {len(best_deals)} product groups")
+            if written:
+                print(f"  ✅ Created comparison tab with {len(best_deals)} product groups")
 
         except Exception as e:
             print(f"  ❌ Error creating comparison tab: {e}")
@@ -360,9 +523,6 @@ class SheetsManager:
         print(f"\n📊 Creating Summary Statistics tab...")
 
         try:
-            worksheet = self.get_or_create_worksheet("📈 Summary", rows=100, cols=10)
-            worksheet.clear()
-
             rows = [
                 ['📊 Solar Inventory Summary Dashboard'],
                 ['Last Updated:', datetime.now().strftime('%Y-%m-%d %H:%M:%S')],
@@ -382,22 +542,89 @@ class SheetsManager:
                 ]
                 rows.append(row)
 
-            worksheet.update('A1', rows, value_input_option='USER_ENTERED')
-
-            # Format title
-            worksheet.format('A1', {
-                "textFormat": {"bold": True, "fontSize": 14},
-                "backgroundColor": {"red": 0.2, "green": 0.4, "blue": 0.7},
-                "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}}
-            })
-
-            # Format headers
-            worksheet.format('A4:G4', {
-                "textFormat": {"bold": True},
-                "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}
-            })
+            written = self.write_tab(
+                "📈 Summary",
+                rows,
+                formats={
+                    # Format title
+                    'A1': {
+                        "textFormat": {"bold": True, "fontSize": 14},
+                        "backgroundColor": {"red": 0.2, "green": 0.4, "blue": 0.7},
+                        "textFormat": {"foregroundColor": {"red": 1, "green": 1, "blue": 1}}
+                    },
+                    # Format headers
+                    'A4:G4': {
+                        "textFormat": {"bold": True},
+                        "backgroundColor": {"red": 0.9, "green": 0.9, "blue": 0.9}
+                    }
+                },
+                min_rows=100,
+                min_cols=10
+            )
 
-            print(f"  ✅ Created summary tab")
+            if written:
+                print(f"  ✅ Created summary tab")
 
         except Exception as e:
             print(f"  ❌ Error creating summary tab: {e}")
+
+
+class BestDealGroups:
+    """
+    Running best deal of each product group, fed one product at a time
+
+    Products are grouped across distributors by their identity (part number, see
+    ProductIdentityIndex); only the best-priced product and the in-stock price
+    range are kept per group.
+    """
+
+    def __init__(self, identity_index: Optional[ProductIdentityIndex] = None):
+        """
+        Args:
+            identity_index: Product identity index (the persistent default is
+                            loaded, then pruned and saved by best_deals())
+        """
+        self.own_index = identity_index is None
+        self.index = identity_index if identity_index is not None else ProductIdentityIndex()
+        self.groups: Dict[str, Dict] = {}
+
+    def add(self, product: Dict):
+        """Account for one product"""
+        price = product.get('price', 0)
+        if not price > 0:
+            return
+
+        key = self.index.identify(product)
+
+        group = self.groups.get(key)
+        if group is None:
+            group = {'best': product, 'in_stock': 0, 'min': None, 'max': None}
+            self.groups[key] = group
+        elif price < group['best'].get('price', float('inf')):
+            group['best'] = product
+
+        if product.get('stock_status') == 'In Stock':
+            group['in_stock'] += 1
+            group['min'] = price if group['min'] is None else min(group['min'], price)
+            group['max'] = price if group['max'] is None else max(group['max'], price)
+
+    def best_deals(self) -> List[Dict]:
+        """Best deal of each group, with its competitor count and price range"""
+        best_deals = []
+
+        for group in self.groups.values():
+            best_deal = group['best']
+
+            best_deal['competitors_count'] = group['in_stock']
+            best_deal['price_range'] = f"${group['min']:.2f} - ${group['max']:.2f}" if group['in_stock'] > 1 else f"${best_deal['price']:.2f}"
+
+            best_deals.append(best_deal)
+
+        if self.own_index:
+            self.index.prune()
+            self.index.save()
+        stats = self.index.stats()
+        print(f"  🔗 Product identities: {stats['reused']} reused, {stats['derived']} derived "
+              f"({len(self.groups)} groups)")
+
+        return best_deals
@@ -0,0 +1,163 @@
+"""
+Sheets Sync
+Local snapshot of the worksheet tabs last written, used to send only the rows that
+changed since the previous run
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+class SheetsSnapshot:
+    """
+    Persistent record of the rows last written to each tab of a spreadsheet
+
+    For every tab the row keys (e.g. product IDs) and a hash of each row are kept
+    in sheet order. plan() compares a new tab content against that record and
+    lays it out so that unchanged rows keep their place:
+
+    - rows whose key is still present stay where they are and are rewritten only
+      if their values changed
+    - inserted rows take the places of deleted rows, then go to the end
+    - when more rows were deleted than inserted, the last rows move into the
+      remaining holes, so the table stays contiguous
+
+    The sheet is assumed to hold exactly what was last written; a tab edited by
+    hand is only resynchronized by a full rewrite (delete the snapshot file or
+    disable diff sync for a run).
+    """
+
+    VERSION = 1
+
+    def __init__(self, spreadsheet_id: str, path: Optional[str] = None):
+        """
+        Initialize snapshot
+
+        Args:
+            spreadsheet_id: ID of the spreadsheet the tabs belong to
+            path: JSON file holding the snapshots (defaults to sheets_snapshot.json
+                  in the scraper state directory)
+        """
+        self.spreadsheet_id = spreadsheet_id
+        self.path = path or os.path.join(
+            os.environ.get('SCRAPER_STATE_DIR', '.scraper_state'), 'sheets_snapshot.json'
+        )
+        self.spreadsheets: Dict[str, Dict] = {}
+        self.load()
+
+    @property
+    def tabs(self) -> Dict[str, Dict]:
+        """Snapshots of this spreadsheet's tabs, keyed by title"""
+        return self.spreadsheets.setdefault(self.spreadsheet_id, {})
+
+    def load(self):
+        """Load the snapshots from disk (starting empty if missing or unreadable)"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Error loading sheets snapshot: {e}")
+            return
+        if data.get('version') != self.VERSION:
+            return
+        self.spreadsheets = data.get('spreadsheets', {})
+
+    def save(self):
+        """Write the snapshots to disk atomically"""
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({'version': self.VERSION, 'spreadsheets': self.spreadsheets}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Error saving sheets snapshot: {e}")
+
+    @staticmethod
+    def row_hash(row: Sequence, volatile_columns: Iterable[int] = ()) -> str:
+        """Hash of a row's values, leaving out the columns whose changes alone are not synced"""
+        if volatile_columns:
+            skipped = set(volatile_columns)
+            row = [value for column, value in enumerate(row) if column not in skipped]
+        payload = json.dumps(row, default=str, ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+    def plan(self, title: str, sheet_id: int, rows: List[List], keys: List[str],
+             volatile_columns: Iterable[int] = ()) -> Optional[Tuple[List[int], Set[int]]]:
+        """
+        Lay out a new tab content against the last written one
+
+        Args:
+            title: Worksheet title
+            sheet_id: Worksheet ID (a recreated tab has a new one)
+            rows: New cell values, all rows of equal width
+            keys: Unique key of each row
+            volatile_columns: Columns whose changes alone do not make a row changed
+
+        Returns:
+            (layout, changed): the index in rows of each sheet row, and the sheet
+            rows that must be written; None when the tab must be fully rewritten
+            (no usable snapshot, or most rows changed)
+        """
+        previous = self.tabs.get(title)
+        width = len(rows[0]) if rows else 0
+        if not previous or previous.get('sheet_id') != sheet_id or previous.get('width') != width:
+            return None
+
+        hashes = [self.row_hash(row, volatile_columns) for row in rows]
+        positions = {key: index for index, key in enumerate(keys)}
+
+        layout: List[Optional[int]] = []
+        changed: Set[int] = set()
+        holes = []
+        for position, (key, old_hash) in enumerate(zip(previous['keys'], previous['hashes'])):
+            index = positions.pop(key, None)
+            layout.append(index)
+            if index is None:
+                holes.append(position)
+            elif hashes[index] != old_hash:
+                changed.add(position)
+
+        # Inserted rows (still in positions) fill the holes first, then go to the end
+        holes.reverse()
+        for index in sorted(positions.values()):
+            if holes:
+                position = holes.pop()
+                layout[position] = index
+            else:
+                position = len(layout)
+                layout.append(index)
+            changed.add(position)
+
+        # Close the remaining holes with the last rows
+        while holes:
+            while layout and layout[-1] is None:
+                layout.pop()
+            position = holes.pop()
+            if position < len(layout):
+                layout[position] = layout.pop()
+                changed.add(position)
+
+        changed = {position for position in changed if position < len(layout)}
+        if len(changed) * 2 > len(layout):
+            return None
+        return layout, changed
+
+    def record(self, title: str, sheet_id: int, rows: List[List], keys: List[str],
+               volatile_columns: Iterable[int] = ()):
+        """Remember the content written to a tab, in sheet order"""
+        self.tabs[title] = {
+            'sheet_id': sheet_id,
+            'width': len(rows[0]) if rows else 0,
+            'keys': list(keys),
+            'hashes': [self.row_hash(row, volatile_columns) for row in rows],
+        }
+
+    def forget(self, titles: Iterable[str]):
+        """Drop the snapshots of tabs about to be rewritten (until their write succeeds)"""
+        for title in titles:
+            self.tabs.pop(title, None)
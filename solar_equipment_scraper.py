@@ -5,13 +5,15 @@ Main orchestrator for solar equipment scraping with AVL matching and Excel expor
 
 import os
 import yaml
+from functools import partial
 import pandas as pd
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import Dict, Optional
 from tqdm import tqdm
 
 # Import scrapers
 from scrapers import (
+    ShopifyScraper,
     SolarCellzScraper,
     AltEScraper,
     RessupplyScraper,
@@ -26,6 +28,13 @@ from scrapers import (
 from avl_handler import AVLHandler
 from spec_sheet_downloader import SpecSheetDownloader
 from excel_exporter import ExcelExporter
+from scraper_runner import stream_scrapers, print_timings
+from product_pipeline import (
+    ProductPipeline,
+    AVLMatchingStage,
+    SpecSheetStage,
+    DataFrameCollector
+)
 
 
 class SolarEquipmentScraper:
@@ -91,6 +100,10 @@ class SolarEquipmentScraper:
                 'solar_store': {'enabled': True},
                 'essential_parts': {'enabled': False}
             },
+            'performance': {
+                'max_concurrent_scrapers': 4,
+                'batch_size': 500
+            },
             'avl': {
                 'enabled': True,
                 'thrive_file': 'THRIVE_AVL.xlsx',
@@ -134,12 +147,20 @@ class SolarEquipmentScraper:
         enabled_scrapers = {}
 
         distributors_config = self.config.get('distributors', {})
+        performance_config = self.config.get('performance', {})
+
+        # Shopify stores configured only in YAML use the generic engine
+        for key, dist_config in distributors_config.items():
+            if key not in scraper_map and dist_config.get('type') == 'shopify':
+                scraper_map[key] = partial(ShopifyScraper, dist_config.get('name', key), dist_config.get('url', ''))
 
         for key, scraper_class in scraper_map.items():
             dist_config = distributors_config.get(key, {})
             if dist_config.get('enabled', False):
                 try:
                     scraper = scraper_class()
+                    # Per-distributor keys override the global performance settings
+                    scraper.configure({**performance_config, **dist_config})
                     enabled_scrapers[key] = scraper
                 except Exception as e:
                     print(f"⚠️  Failed to initialize {key}: {e}")
@@ -179,84 +200,66 @@ class SolarEquipmentScraper:
         output_dir = spec_config.get('output_directory', 'spec_sheets')
         return SpecSheetDownloader(output_dir=output_dir)
 
-    def run_scraping(self) -> List[Dict]:
+    def stream_products(self):
         """
-        Run all enabled scrapers
+        Run all enabled scrapers, yielding products as they are scraped
 
-        Returns:
-            List of all scraped products
+        Yields:
+            Standardized product dictionaries
         """
         print("\n" + "="*60)
         print("🔍 SCRAPING PRODUCTS")
         print("="*60)
-        print(f"Scraping from {len(self.scrapers)} distributor(s)")
+
+        max_workers = self.config.get('performance', {}).get('max_concurrent_scrapers', 1)
+
+        print(f"Streaming from {len(self.scrapers)} distributor(s) ({max_workers} at a time)")
         print("="*60 + "\n")
 
-        all_products = []
+        results = {}
+        total = 0
+        for product in stream_scrapers(self.scrapers, max_workers=max_workers, results=results):
+            total += 1
+            yield product
 
-        for key, scraper in self.scrapers.items():
-            try:
-                products = scraper.run()
-                all_products.extend(products)
-                print(f"  ✅ {scraper.distributor_name}: {len(products)} products")
-            except Exception as e:
-                print(f"  ❌ Error scraping {scraper.distributor_name}: {e}")
+        print_timings(self.scrapers, results)
 
         print(f"\n{'='*60}")
-        print(f"✅ Total products scraped: {len(all_products)}")
+        print(f"✅ Total products scraped: {total}")
         print("="*60 + "\n")
 
-        return all_products
-
-    def add_avl_matching(self, products_df: pd.DataFrame) -> pd.DataFrame:
+    def process_products(self) -> pd.DataFrame:
         """
-        Add AVL matching columns to products
+        Stream scraped products through AVL matching and spec sheet download
 
-        Args:
-            products_df: Products dataframe
+        Products are processed in batches of performance.batch_size, so the only
+        full-catalog structure is the export DataFrame assembled at the end.
 
         Returns:
-            DataFrame with AVL columns added
-        """
-        if self.avl_handler is None:
-            print("⚠️  AVL handler not initialized, skipping AVL matching")
-            return products_df
-
-        print("\n" + "="*60)
-        print("📋 AVL MATCHING")
-        print("="*60)
-
-        products_df = self.avl_handler.add_avl_columns(products_df)
-
-        print("="*60 + "\n")
-
-        return products_df
-
-    def download_spec_sheets(self, products: List[Dict]):
+            DataFrame with all scraped and processed products
         """
-        Download specification sheets for products
+        stages = []
 
-        Args:
-            products: List of product dictionaries
-        """
-        if self.spec_downloader is None:
-            return
+        if self.avl_handler is not None:
+            stages.append(AVLMatchingStage(self.avl_handler))
+        else:
+            print("⚠️  AVL handler not initialized, skipping AVL matching")
 
-        print("\n" + "="*60)
-        print("📥 DOWNLOADING SPEC SHEETS")
-        print("="*60)
+        if self.spec_downloader is not None:
+            spec_config = self.config.get('spec_sheets', {})
+            stages.append(SpecSheetStage(
+                self.spec_downloader,
+                max_pdfs_per_product=spec_config.get('max_pdfs_per_product', 3),
+                delay=spec_config.get('delay_between_downloads', 1.0)
+            ))
 
-        spec_config = self.config.get('spec_sheets', {})
-        max_pdfs = spec_config.get('max_pdfs_per_product', 3)
-        delay = spec_config.get('delay_between_downloads', 1.0)
+        collector = DataFrameCollector()
+        stages.append(collector)
 
-        self.spec_downloader.download_for_products_batch(
-            products,
-            max_pdfs_per_product=max_pdfs,
-            delay=delay
-        )
+        batch_size = self.config.get('performance', {}).get('batch_size', 500)
+        ProductPipeline(stages, batch_size=batch_size).run(self.stream_products())
 
-        print("="*60 + "\n")
+        return collector.dataframe()
 
     def export_to_excel(self, products_df: pd.DataFrame):
         """
@@ -366,23 +369,14 @@ class SolarEquipmentScraper:
         """
         start_time = datetime.now()
 
-        # Step 1: Scrape all distributors
-        all_products = self.run_scraping()
+        # Steps 1-4: Stream all distributors through AVL matching and
+        # spec sheet download (if enabled), batch by batch
+        products_df = self.process_products()
 
-        if not all_products:
+        if products_df.empty:
             print("❌ No products scraped. Exiting.")
             return pd.DataFrame()
 
-        # Step 2: Convert to DataFrame
-        products_df = pd.DataFrame(all_products)
-
-        # Step 3: Add AVL matching
-        products_df = self.add_avl_matching(products_df)
-
-        # Step 4: Download spec sheets (if enabled)
-        if self.spec_downloader:
-            self.download_spec_sheets(all_products)
-
         # Step 5: Export to Excel
         output_file = self.export_to_excel(products_df)
 
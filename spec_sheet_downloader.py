@@ -5,16 +5,24 @@ Supports multiple methods to find and download PDFs
 
 import os
 import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 from typing import List, Optional, Dict
 import time
 import re
 
+from html_parsing import parse_html
+
 
 class SpecSheetDownloader:
     """Downloads specification sheets from product pages"""
 
+    # Link text/title words that mark a spec sheet link
+    SPEC_KEYWORDS = [
+        'spec', 'specification', 'datasheet', 'data sheet',
+        'manual', 'technical', 'documentation', 'pdf', 'download'
+    ]
+    DOWNLOAD_CLASS = re.compile(r'download|spec|pdf', re.I)
+
     def __init__(self, output_dir: str = 'spec_sheets', timeout: int = 30):
         """
         Initialize spec sheet downloader
@@ -57,58 +65,50 @@ class SpecSheetDownloader:
                 response.raise_for_status()
                 html_content = response.content
 
-            soup = BeautifulSoup(html_content, 'html.parser')
-
-            # Method 1: Find direct PDF links (href ends with .pdf)
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                if href.lower().endswith('.pdf'):
-                    full_url = urljoin(product_url, href)
-                    if full_url not in pdf_links:
-                        pdf_links.append(full_url)
-
-            # Method 2: Find links with spec/datasheet/manual keywords
-            spec_keywords = [
-                'spec', 'specification', 'datasheet', 'data sheet',
-                'manual', 'technical', 'documentation', 'pdf', 'download'
-            ]
-
-            for link in soup.find_all('a', href=True):
-                # Check link text
-                link_text = link.get_text().lower()
-                if any(keyword in link_text for keyword in spec_keywords):
-                    href = link['href']
-                    # If it's a PDF link
-                    if '.pdf' in href.lower():
-                        full_url = urljoin(product_url, href)
-                        if full_url not in pdf_links:
-                            pdf_links.append(full_url)
-
-                # Check title attribute
-                title = link.get('title', '').lower()
-                if title and any(keyword in title for keyword in spec_keywords):
-                    href = link['href']
-                    if '.pdf' in href.lower():
-                        full_url = urljoin(product_url, href)
-                        if full_url not in pdf_links:
-                            pdf_links.append(full_url)
-
-            # Method 3: Find embedded PDF viewers or iframes
-            for iframe in soup.find_all('iframe'):
-                src = iframe.get('src', '')
-                if '.pdf' in src.lower():
-                    full_url = urljoin(product_url, src)
-                    if full_url not in pdf_links:
-                        pdf_links.append(full_url)
-
-            # Method 4: Look for download buttons/links
-            for element in soup.find_all(['button', 'a'], class_=re.compile(r'download|spec|pdf', re.I)):
-                # Check if there's an associated data attribute or link
-                href = element.get('href') or element.get('data-url') or element.get('data-href')
-                if href and '.pdf' in href.lower():
-                    full_url = urljoin(product_url, href)
-                    if full_url not in pdf_links:
-                        pdf_links.append(full_url)
+            document = parse_html(html_content)
+
+            # One pass over the candidate elements; results are grouped by method so
+            # they keep their priority order: direct PDF links, spec keyword links,
+            # embedded viewers, download buttons
+            direct_links, keyword_links, embedded, buttons = [], [], [], []
+
+            for element in document.iter('a', 'iframe', 'button'):
+                tag = element.tag
+                href = element.get('href')
+
+                if tag == 'a' and href is not None:
+                    href_lower = href.lower()
+
+                    # Method 1: Find direct PDF links (href ends with .pdf)
+                    if href_lower.endswith('.pdf'):
+                        direct_links.append(href)
+
+                    # Method 2: Find PDF links whose text or title has spec/datasheet/manual keywords
+                    if '.pdf' in href_lower:
+                        link_text = element.text_content().lower()
+                        title = element.get('title', '').lower()
+                        if any(keyword in link_text for keyword in self.SPEC_KEYWORDS):
+                            keyword_links.append(href)
+                        if title and any(keyword in title for keyword in self.SPEC_KEYWORDS):
+                            keyword_links.append(href)
+
+                # Method 3: Find embedded PDF viewers or iframes
+                elif tag == 'iframe':
+                    src = element.get('src', '')
+                    if '.pdf' in src.lower():
+                        embedded.append(src)
+
+                # Method 4: Look for download buttons/links
+                if tag in ('a', 'button') and self.DOWNLOAD_CLASS.search(element.get('class', '')):
+                    # Check if there's an associated data attribute or link
+                    target = href or element.get('data-url') or element.get('data-href')
+                    if target and '.pdf' in target.lower():
+                        buttons.append(target)
+
+            for href in direct_links + keyword_links + embedded + buttons:
+                full_url = urljoin(product_url, href)
+                if full_url not in pdf_links:
+                    pdf_links.append(full_url)
 
         except Exception as e:
             print(f"    ⚠️  Error finding PDFs on {product_url}: {e}")
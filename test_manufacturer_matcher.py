@@ -0,0 +1,53 @@
+"""
+Tests for manufacturer name matching (ManufacturerMatcher)
+
+Run with: python -m pytest test_manufacturer_matcher.py
+"""
+
+from manufacturer_matcher import ManufacturerMatcher, manufacturer_key
+
+
+def matcher(*names):
+    return ManufacturerMatcher(names or ['Canadian Solar', 'Jinko Solar', 'Qcells', 'REC',
+                                         'LG Energy Solution', 'Mission Solar'])
+
+
+def test_keys_ignore_punctuation_suffixes_and_generic_words():
+    assert manufacturer_key('Canadian Solar Inc.') == manufacturer_key('CANADIAN SOLAR')
+    assert manufacturer_key('Q CELLS') == manufacturer_key('Qcells')
+
+
+def test_exact_and_alias_matches():
+    m = matcher()
+    assert m.match('Canadian Solar, Inc.') == ('Canadian Solar', 1.0)
+    assert m.match('JinkoSolar') == ('Jinko Solar', ManufacturerMatcher.ALIAS_CONFIDENCE)
+    assert m.match('Hanwha Q CELLS') == ('Qcells', ManufacturerMatcher.ALIAS_CONFIDENCE)
+
+
+def test_alias_spellings_are_compared_whole():
+    # "LG Energy" is an alias, which must not make a bare "LG" one
+    assert matcher().match('LG') == (None, 0.0)
+
+
+def test_fuzzy_match_above_threshold():
+    name, confidence = matcher().match('Canadiaan Solar')
+    assert name == 'Canadian Solar'
+    assert 0.9 <= confidence < 1.0
+
+
+def test_fuzzy_match_below_threshold_is_rejected():
+    assert matcher().match('Canary Solar') == (None, 0.0)
+
+
+def test_short_and_generic_names_are_never_fuzzy_matched():
+    m = matcher('Solar Power Inc', 'Aptos')
+    assert m.match('Solar Inc') == (None, 0.0)
+    assert m.match('Apto') == (None, 0.0)
+
+
+def test_find_in_text_needs_whole_spellings():
+    m = matcher()
+    assert m.find_in_text('Hanwha Q CELLS Q.PEAK DUO 400W')[0] == 'Qcells'
+    assert m.find_in_text('REC Alpha Pure 405W')[0] == 'REC'
+    assert m.find_in_text('PRECISION rail kit') == (None, 0.0)
+    assert m.find_in_text('Mission critical backup panel') == (None, 0.0)
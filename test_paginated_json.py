@@ -0,0 +1,87 @@
+"""
+Tests for sliding-window JSON paging (BaseScraper.iter_paginated_json)
+
+Run with: python -m pytest test_paginated_json.py
+"""
+
+import threading
+
+from base_scraper import BaseScraper
+
+
+class FakeResponse:
+    def __init__(self, items):
+        self.items = items
+
+    def json(self):
+        return {'products': self.items}
+
+
+class PagedScraper(BaseScraper):
+    """Scraper whose requests hit an in-memory catalog of page_size items per page"""
+
+    http_cache_enabled = False
+    max_connections_per_host = 4
+
+    def __init__(self, total_items, page_size=10, failing_pages=()):
+        super().__init__("Paged")
+        self.total_items = total_items
+        self.page_size = page_size
+        self.failing_pages = set(failing_pages)
+        self.requested = []
+        self.lock = threading.Lock()
+
+    def scrape_products(self):
+        return []
+
+    def make_request(self, url, timeout=10, retries=3):
+        page = int(url.rsplit('=', 1)[1])
+        with self.lock:
+            self.requested.append(page)
+        if page in self.failing_pages:
+            return None
+        start = (page - 1) * self.page_size
+        return FakeResponse(list(range(start, min(start + self.page_size, self.total_items))))
+
+    def pages(self, **kwargs):
+        return list(self.iter_paginated_json(lambda page: f"https://store.test/products.json?page={page}",
+                                             'products', **kwargs))
+
+
+def test_pages_come_back_in_order_and_complete():
+    scraper = PagedScraper(total_items=95)
+    pages = scraper.pages(page_size=10)
+
+    assert [page for page, _ in pages] == list(range(1, 11))
+    assert sum(len(items) for _, items in pages) == 95
+
+
+def test_stops_requesting_after_a_short_page():
+    scraper = PagedScraper(total_items=95)
+    scraper.pages(page_size=10)
+
+    # The window never runs more than max_connections_per_host - 1 pages past the last one
+    assert max(scraper.requested) <= 10 + scraper.max_connections_per_host - 1
+
+
+def test_stops_at_the_first_empty_page_without_page_size():
+    scraper = PagedScraper(total_items=30)
+    pages = scraper.pages()
+
+    assert [page for page, _ in pages] == [1, 2, 3]
+    assert max(scraper.requested) <= 4 + scraper.max_connections_per_host - 1
+
+
+def test_stops_at_a_failed_page():
+    scraper = PagedScraper(total_items=100, failing_pages={3})
+    pages = scraper.pages(page_size=10)
+
+    assert [page for page, _ in pages] == [1, 2]
+
+
+def test_max_pages_caps_requests():
+    scraper = PagedScraper(total_items=1000)
+    pages = scraper.pages(page_size=10, max_pages=5)
+
+    assert [page for page, _ in pages] == [1, 2, 3, 4, 5]
+    assert sorted(scraper.requested) == [1, 2, 3, 4, 5]
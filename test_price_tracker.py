@@ -0,0 +1,97 @@
+"""
+Tests for the SQLite price tracker and its migration from the JSON history
+
+Run with: python -m pytest test_price_tracker.py
+"""
+
+import json
+
+from price_tracker import SQLitePriceTracker, create_price_tracker, is_migrated, migrate_json_to_sqlite
+
+
+LEGACY_HISTORY = {
+    'A_CS6R_1': {
+        'price': 100.0, 'stock_status': 'In Stock', 'title': 'Panel', 'distributor': 'A',
+        'last_updated': '2026-01-02',
+        'price_history': [{'date': '2026-01-01', 'price': 120.0}, {'date': '2026-01-02', 'price': 100.0}]
+    }
+}
+
+
+def product(price, stock_status='In Stock', last_updated='2026-01-03'):
+    return {'distributor': 'A', 'sku': 'CS6R', 'product_id': '1', 'title': 'Panel',
+            'price': price, 'stock_status': stock_status, 'last_updated': last_updated}
+
+
+def write_json(path, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def count(tracker, table):
+    return tracker.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def test_backend_follows_the_file_extension(tmp_path):
+    with create_price_tracker(str(tmp_path / 'history.db')) as tracker:
+        assert isinstance(tracker, SQLitePriceTracker)
+    with create_price_tracker(str(tmp_path / 'history.json')) as tracker:
+        assert not isinstance(tracker, SQLitePriceTracker)
+
+
+def test_legacy_json_is_migrated_once(tmp_path):
+    write_json(tmp_path / 'history.json', LEGACY_HISTORY)
+
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        assert is_migrated(tracker.conn)
+        assert count(tracker, 'products') == 1
+        assert count(tracker, 'price_observations') == 2
+
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        assert count(tracker, 'price_observations') == 2
+
+
+def test_failed_migration_is_retried(tmp_path):
+    (tmp_path / 'history.json').write_text('{not json')
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        assert not is_migrated(tracker.conn)
+        assert count(tracker, 'products') == 0
+
+    write_json(tmp_path / 'history.json', LEGACY_HISTORY)
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        assert is_migrated(tracker.conn)
+        assert count(tracker, 'products') == 1
+
+
+def test_existing_database_is_not_overwritten_by_stale_json(tmp_path):
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        tracker.track_products([product(90.0)])
+
+    write_json(tmp_path / 'history.json', LEGACY_HISTORY)
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        assert is_migrated(tracker.conn)
+        assert tracker.conn.execute("SELECT price FROM products").fetchone()[0] == 90.0
+
+
+def test_cli_migration_marks_the_database(tmp_path):
+    write_json(tmp_path / 'legacy.json', LEGACY_HISTORY)
+    assert migrate_json_to_sqlite(str(tmp_path / 'legacy.json'), str(tmp_path / 'history.db')) == 1
+
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        assert is_migrated(tracker.conn)
+
+
+def test_every_run_adds_a_price_point_and_detects_changes(tmp_path):
+    write_json(tmp_path / 'history.json', LEGACY_HISTORY)
+
+    with SQLitePriceTracker(str(tmp_path / 'history.db')) as tracker:
+        unchanged = tracker.track_products([product(100.0)])
+        dropped = tracker.track_products([product(80.0, 'Out of Stock', last_updated='2026-01-04')])
+
+        assert not any(unchanged.values())
+        assert dropped['price_drops'][0]['old_price'] == 100.0
+        assert dropped['stock_changes'][0]['new_stock'] == 'Out of Stock'
+        assert count(tracker, 'price_observations') == 4
+
+        trend, = tracker.get_price_trends()
+        assert (trend['first_price'], trend['current_price'], trend['data_points']) == (120.0, 80.0, 4)
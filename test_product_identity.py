@@ -0,0 +1,98 @@
+"""
+Tests for cross-distributor product identities (ProductIdentityIndex)
+
+Run with: python -m pytest test_product_identity.py
+"""
+
+from product_identity import MPN_SCOPE, ProductIdentityIndex, normalize_part_number, title_model_tokens
+
+
+def product(distributor, product_id, sku, title, brand='Canadian Solar', **fields):
+    return dict({'distributor': distributor, 'product_id': product_id, 'sku': sku,
+                 'title': title, 'brand': brand}, **fields)
+
+
+def index_at(tmp_path):
+    return ProductIdentityIndex(path=str(tmp_path / 'identity.json'))
+
+
+def test_normalize_part_number_rejects_ratings_and_missing_values():
+    assert normalize_part_number('CS6R-410MS') == 'CS6R410MS'
+    assert normalize_part_number('N/A') is None
+    assert normalize_part_number('400W') is None
+    assert normalize_part_number('12345') is None
+
+
+def test_title_tokens_skip_chemistries_and_standards():
+    assert title_model_tokens('EG4 LiFePO4 48V UL1741SA Battery LL-S48') == ['LLS48']
+
+
+def test_title_model_number_links_to_mpn(tmp_path):
+    index = index_at(tmp_path)
+    with_mpn = index.identify(product('A', '1', 'CS6R-410MS', 'Canadian Solar 410W Panel'))
+    title_only = index.identify(product('B', '2', 'N/A', 'Canadian Solar CS6R-410MS 410W'))
+
+    assert with_mpn == 'pn:CS6R410MS'
+    assert title_only == with_mpn
+
+
+def test_title_tokens_link_only_within_a_brand(tmp_path):
+    index = index_at(tmp_path)
+    canadian = index.identify(product('A', '1', 'N/A', 'Panel HX500-B 500W', brand='Canadian Solar'))
+    rec = index.identify(product('B', '2', 'N/A', 'Panel HX500-B 500W', brand='REC'))
+    same_brand = index.identify(product('C', '3', 'N/A', 'HX500-B module', brand='Canadian Solar'))
+
+    assert canadian == 'pn:CANADIAN|HX500B'
+    assert rec != canadian
+    assert same_brand == canadian
+
+
+def test_unknown_brand_title_tokens_fall_back_to_groups(tmp_path):
+    index = index_at(tmp_path)
+    first = index.identify(product('A', '1', 'N/A', 'Panel HX500-B', brand='', wattage='500',
+                                   category='Solar Panels'))
+
+    assert first.startswith('group:')
+    assert 'HX500B' not in index.part_numbers
+
+
+def test_listings_without_ids_are_keyed_by_url():
+    first = product('Giga', 'N/A', 'N/A', 'Transformer', product_url='https://x/shop/a')
+    second = product('Giga', 'N/A', 'N/A', 'Transformer', product_url='https://x/shop/b')
+
+    assert ProductIdentityIndex.listing_key(first) != ProductIdentityIndex.listing_key(second)
+
+
+def test_unchanged_listings_reuse_their_identity_across_runs(tmp_path):
+    index = index_at(tmp_path)
+    listing = product('A', '1', 'CS6R-410MS', 'Canadian Solar 410W Panel')
+    index.identify(listing)
+    index.save()
+
+    reloaded = index_at(tmp_path)
+    assert reloaded.identify(listing) == 'pn:CS6R410MS'
+    assert reloaded.stats()['reused'] == 1
+
+
+def test_prune_drops_unseen_listings_and_their_part_numbers(tmp_path):
+    index = index_at(tmp_path)
+    index.identify(product('A', '1', 'CS6R-410MS', 'Canadian Solar 410W Panel'))
+    index.identify(product('A', '2', 'HX500-B', 'Other panel', brand='REC'))
+    index.save()
+
+    next_run = index_at(tmp_path)
+    next_run.identify(product('A', '1', 'CS6R-410MS', 'Canadian Solar 410W Panel'))
+    next_run.prune()
+
+    assert list(next_run.listings) == ['A|1|CS6R-410MS']
+    assert next_run.part_numbers == {'CS6R410MS': {MPN_SCOPE: 'pn:CS6R410MS'}}
+
+
+def test_prune_without_a_run_keeps_everything(tmp_path):
+    index = index_at(tmp_path)
+    index.identify(product('A', '1', 'CS6R-410MS', 'Canadian Solar 410W Panel'))
+    index.save()
+
+    untouched = index_at(tmp_path)
+    untouched.prune()
+    assert len(untouched.listings) == 1
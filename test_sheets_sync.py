@@ -0,0 +1,148 @@
+"""
+Tests for the Sheets diff planner (SheetsSnapshot) and its use by SheetsBatch
+
+Run with: python -m pytest test_sheets_sync.py
+"""
+
+from sheets_batch import SheetsBatch
+from sheets_sync import SheetsSnapshot
+from rate_limiter import TokenBucket
+
+
+HEADER = ['Key', 'Price', 'Updated']
+
+
+def rows_for(products):
+    """Header plus one [key, price, timestamp] row per (key, price)"""
+    return [HEADER] + [[key, price, '2026-01-01'] for key, price in products]
+
+
+def keys_for(rows):
+    return ['header'] + [row[0] for row in rows[1:]]
+
+
+def snapshot_with(tmp_path, products):
+    """Snapshot recording the given products as the last write of tab 'T' (sheet 7)"""
+    snapshot = SheetsSnapshot('sheet', path=str(tmp_path / 'snapshot.json'))
+    rows = rows_for(products)
+    snapshot.record('T', 7, rows, keys_for(rows), volatile_columns=[2])
+    return snapshot
+
+
+def test_plan_without_snapshot_rewrites_tab(tmp_path):
+    snapshot = SheetsSnapshot('sheet', path=str(tmp_path / 'snapshot.json'))
+    rows = rows_for([('a', 1)])
+    assert snapshot.plan('T', 7, rows, keys_for(rows)) is None
+
+
+def test_plan_sends_only_changed_rows(tmp_path):
+    products = [(key, 1) for key in 'abcdefgh']
+    snapshot = snapshot_with(tmp_path, products)
+
+    products[2] = ('c', 2)
+    rows = rows_for(products)
+    layout, changed = snapshot.plan('T', 7, rows, keys_for(rows), volatile_columns=[2])
+
+    assert layout == list(range(len(rows)))
+    assert changed == {3}
+
+
+def test_plan_ignores_volatile_columns(tmp_path):
+    snapshot = snapshot_with(tmp_path, [('a', 1), ('b', 1), ('c', 1)])
+    rows = rows_for([('a', 1), ('b', 1), ('c', 1)])
+    rows[1][2] = '2026-02-02'
+
+    assert snapshot.plan('T', 7, rows, keys_for(rows), volatile_columns=[2])[1] == set()
+
+
+def test_plan_keeps_rows_in_place_and_fills_holes(tmp_path):
+    snapshot = snapshot_with(tmp_path, [(key, 1) for key in 'abcdefgh'])
+
+    # 'c' removed, 'x' inserted in the middle of the new content
+    products = [(key, 1) for key in 'abxdefgh']
+    rows = rows_for(products)
+    layout, changed = snapshot.plan('T', 7, rows, keys_for(rows), volatile_columns=[2])
+
+    sheet_keys = [keys_for(rows)[index] for index in layout]
+    assert sheet_keys == ['header', 'a', 'b', 'x', 'd', 'e', 'f', 'g', 'h']
+    assert changed == {3}
+
+
+def test_plan_closes_holes_with_last_rows(tmp_path):
+    snapshot = snapshot_with(tmp_path, [(key, 1) for key in 'abcdefgh'])
+
+    rows = rows_for([(key, 1) for key in 'abdefgh'])
+    layout, changed = snapshot.plan('T', 7, rows, keys_for(rows), volatile_columns=[2])
+
+    sheet_keys = [keys_for(rows)[index] for index in layout]
+    assert sheet_keys == ['header', 'a', 'b', 'h', 'd', 'e', 'f', 'g']
+    assert changed == {3}
+
+
+def test_plan_rewrites_when_most_rows_change(tmp_path):
+    snapshot = snapshot_with(tmp_path, [(key, 1) for key in 'abcd'])
+    rows = rows_for([(key, 2) for key in 'abcd'])
+    assert snapshot.plan('T', 7, rows, keys_for(rows), volatile_columns=[2]) is None
+
+
+def test_plan_rewrites_recreated_or_resized_tab(tmp_path):
+    snapshot = snapshot_with(tmp_path, [('a', 1), ('b', 1), ('c', 1)])
+    rows = rows_for([('a', 1), ('b', 1), ('c', 1)])
+
+    assert snapshot.plan('T', 8, rows, keys_for(rows)) is None
+    wider = [row + [''] for row in rows]
+    assert snapshot.plan('T', 7, wider, keys_for(wider)) is None
+
+
+def test_snapshot_round_trips_through_disk(tmp_path):
+    snapshot = snapshot_with(tmp_path, [('a', 1), ('b', 1), ('c', 1)])
+    snapshot.save()
+
+    reloaded = SheetsSnapshot('sheet', path=snapshot.path)
+    rows = rows_for([('a', 1), ('b', 5), ('c', 1)])
+    assert reloaded.plan('T', 7, rows, keys_for(rows), volatile_columns=[2])[1] == {2}
+
+
+class FakeSpreadsheet:
+    """Records the calls SheetsBatch makes"""
+
+    def __init__(self):
+        self.values = []
+
+    def fetch_sheet_metadata(self, params=None):
+        return {'sheets': [{'properties': {
+            'sheetId': 7, 'title': 'T', 'gridProperties': {'rowCount': 10, 'columnCount': 3}
+        }}]}
+
+    def values_batch_update(self, body):
+        self.values.extend(body['data'])
+        return {}
+
+    def batch_update(self, body):
+        return {'replies': []}
+
+
+def test_full_rewrite_drops_the_snapshot(tmp_path):
+    snapshot = snapshot_with(tmp_path, [(key, 1) for key in 'abcd'])
+    spreadsheet = FakeSpreadsheet()
+
+    batch = SheetsBatch(spreadsheet, snapshot, bucket=TokenBucket(0), diff_sync=False)
+    batch.write_tab('T', rows_for([(key, 1) for key in 'dcba']))
+    batch.flush()
+
+    assert spreadsheet.values[0]['range'] == "'T'!A1:C5"
+    assert 'T' not in SheetsSnapshot('sheet', path=snapshot.path).tabs
+
+
+def test_diff_sync_writes_changed_rows_and_records_them(tmp_path):
+    snapshot = snapshot_with(tmp_path, [(key, 1) for key in 'abcd'])
+    spreadsheet = FakeSpreadsheet()
+
+    rows = rows_for([('a', 1), ('b', 1), ('c', 9), ('d', 1)])
+    batch = SheetsBatch(spreadsheet, snapshot, bucket=TokenBucket(0))
+    batch.write_tab('T', rows, keys=keys_for(rows), volatile_columns=[2])
+    batch.flush()
+
+    assert [value_range['range'] for value_range in spreadsheet.values] == ["'T'!A4:C4"]
+    recorded = SheetsSnapshot('sheet', path=snapshot.path)
+    assert recorded.plan('T', 7, rows, keys_for(rows), volatile_columns=[2])[1] == set()